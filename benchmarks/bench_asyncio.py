@@ -0,0 +1,82 @@
+"""
+Compare thread-per-job scheduling with the asyncio engine on many concurrent sleeping jobs.
+
+Run from the repository root:
+    python -m benchmarks.bench_asyncio --jobs 10000
+"""
+import argparse
+import asyncio
+import resource
+import subprocess
+import sys
+import threading
+import time
+from models.job import Job
+from scheduler.async_manager import AsyncConsumer, AsyncJobQueue
+from scheduler.consumer import Consumer
+from scheduler.queue import JobQueue
+from utils.logger import set_log_level
+
+
+def run_threads(num_jobs: int, sleep: float) -> float:
+    queue = JobQueue()
+    consumer = Consumer(queue, num_workers=num_jobs, completed_jobs=set(), completed_jobs_lock=threading.Lock())
+
+    start = time.perf_counter()
+    threading.Thread(target=consumer.start, daemon=True).start()
+    for i in range(num_jobs):
+        queue.put(Job(i, sleep))
+    queue.queue.join()
+    elapsed = time.perf_counter() - start
+    consumer.shutdown()
+    return elapsed
+
+
+def run_asyncio(num_jobs: int, sleep: float) -> float:
+    async def run() -> float:
+        queue = AsyncJobQueue()
+        consumer = AsyncConsumer(queue, num_workers=num_jobs, completed_jobs=set(), completed_jobs_lock=threading.Lock())
+
+        start = time.perf_counter()
+        consumer_task = asyncio.create_task(consumer.start())
+        for i in range(num_jobs):
+            await queue.put(Job(i, sleep))
+        await queue.join()
+        elapsed = time.perf_counter() - start
+
+        consumer_task.cancel()
+        await consumer.shutdown()
+        return elapsed
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=10_000)
+    parser.add_argument("--sleep", type=float, default=1.0, help="Seconds each job sleeps")
+    parser.add_argument("--mode", choices=["threads", "asyncio"],
+                        help="Run a single mode in this process (used internally so peak memory is isolated)")
+    args = parser.parse_args()
+
+    if args.mode:
+        set_log_level("CRITICAL")
+        elapsed = (run_threads if args.mode == "threads" else run_asyncio)(args.jobs, args.sleep)
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f"{elapsed} {peak_kb}")
+        return
+
+    print(f"{args.jobs} concurrent jobs sleeping {args.sleep}s each")
+    print(f"{'engine':<10}{'makespan (s)':>14}{'jobs/s':>10}{'peak RSS (MB)':>15}")
+    for mode in ("threads", "asyncio"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_asyncio", "--mode", mode,
+             "--jobs", str(args.jobs), "--sleep", str(args.sleep)],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        elapsed, peak_kb = float(output[0]), int(output[1])
+        print(f"{mode:<10}{elapsed:>14.3f}{args.jobs / elapsed:>10.0f}{peak_kb / 1024:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare fixed and autoscaled consumer pools under bursty load: latency and idle worker-seconds.
+
+Run from the repository root:
+    python -m benchmarks.bench_autoscaling --bursts 6
+"""
+import argparse
+import threading
+import time
+from models.job import Job
+from scheduler.autoscaler import Autoscaler
+from scheduler.consumer import Consumer
+from scheduler.queue import JobQueue
+from utils.logger import set_log_level
+
+
+def run(workers: int, max_workers: int | None, args: argparse.Namespace) -> dict:
+    """
+    Submit bursts of sleeping jobs separated by quiet periods.
+
+    Args:
+        - workers: Initial (or fixed) number of workers.
+        - max_workers: Upper bound when autoscaling, or None for a fixed pool.
+
+    Returns:
+        - The pool's job stats snapshot, plus the autoscaler metrics if any.
+    """
+    queue = JobQueue(maxsize=args.queue_size)
+    consumer = Consumer(queue, num_workers=workers, completed_jobs=set(), completed_jobs_lock=threading.Lock(),
+                        max_workers=max_workers)
+    autoscaler = None
+    if max_workers:
+        autoscaler = Autoscaler(consumer, min_workers=workers, max_workers=max_workers, interval=args.interval)
+        autoscaler.start()
+    threading.Thread(target=consumer.start, daemon=True).start()
+
+    for burst in range(args.bursts):
+        for i in range(args.burst_size):
+            queue.put(Job(f"{burst}-{i}", args.job_time))
+        time.sleep(args.quiet)
+    queue.queue.join()
+
+    if autoscaler:
+        autoscaler.stop()
+    consumer.shutdown()
+    stats = consumer.stats.snapshot()
+    if autoscaler:
+        stats["autoscaler"] = autoscaler.metrics()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bursts", type=int, default=6)
+    parser.add_argument("--burst-size", type=int, default=400, help="Jobs submitted at once per burst")
+    parser.add_argument("--quiet", type=float, default=1.5, help="Seconds between two bursts")
+    parser.add_argument("--job-time", type=float, default=0.01, help="Seconds each job sleeps")
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--min-workers", type=int, default=2)
+    parser.add_argument("--max-workers", type=int, default=32)
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between two autoscaling decisions")
+    args = parser.parse_args()
+
+    set_log_level("CRITICAL")
+
+    pools = [
+        (f"fixed {args.min_workers}", args.min_workers, None),
+        (f"fixed {args.max_workers}", args.max_workers, None),
+        (f"auto {args.min_workers}-{args.max_workers}", args.min_workers, args.max_workers),
+    ]
+    print(f"{args.bursts} bursts of {args.burst_size} x {args.job_time}s jobs every {args.quiet}s")
+    print(f"{'pool':<12}{'p50 ms':>9}{'p95 ms':>9}{'mean ms':>9}{'worker-s':>10}{'idle worker-s':>15}{'scale up/down':>15}")
+    for name, workers, max_workers in pools:
+        stats = run(workers, max_workers, args)
+        turnaround = stats["latency"]["turnaround"]
+        scaling = "-"
+        if "autoscaler" in stats:
+            scaling = f"{stats['autoscaler']['scale_ups']}/{stats['autoscaler']['scale_downs']}"
+        print(f"{name:<12}{turnaround['p50'] * 1000:>9.0f}{turnaround['p95'] * 1000:>9.0f}{turnaround['mean'] * 1000:>9.0f}"
+              f"{stats['worker_seconds']:>10.1f}{stats['worker_idle_seconds']:>15.1f}{scaling:>15}")
+
+
+if __name__ == "__main__":
+    main()
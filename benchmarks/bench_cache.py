@@ -0,0 +1,107 @@
+"""
+Measure the time saved by the result cache on repeated runs of a deterministic DAG.
+
+Run from the repository root:
+    python -m benchmarks.bench_cache --jobs 400
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from models.job import Job
+from scheduler.cache import ResultCache
+from scheduler.consumer import Consumer
+from scheduler.queue import JobQueue
+from utils.logger import set_log_level
+
+
+def step(seed: int, iterations: int, results: dict) -> int:
+    """
+    Deterministic CPU-bound work combining a seed with the results of the dependencies.
+    """
+    total = seed + sum(results.values())
+    for i in range(iterations):
+        total = (total * 31 + i) % 1_000_003
+    return total
+
+
+def generate_dag(num_jobs: int, iterations: int, rng: random.Random, changed: float = 0.0) -> list[Job]:
+    """
+    Generate a DAG of deterministic jobs in topological order.
+
+    Args:
+        - num_jobs: Number of jobs.
+        - iterations: Loop iterations per job.
+        - rng: Seeded random generator, so that every call builds the same DAG.
+        - changed: Fraction of jobs whose seed differs from the first run, invalidating them and their dependents.
+    """
+    jobs = []
+    for i in range(num_jobs):
+        candidates = range(max(0, i - 20), i)
+        dependencies = rng.sample(candidates, rng.randint(0, min(3, len(candidates))))
+        seed = i + 1_000_000 if rng.random() < changed else i
+        jobs.append(Job(i, 0, dependencies=dependencies, func=step, args=(seed, iterations), pass_results=True))
+    return jobs
+
+
+def run(jobs: list[Job], workers: int, cache: ResultCache | None) -> tuple[float, dict | None]:
+    """
+    Run the DAG on a thread pool.
+
+    Returns:
+        - Makespan in seconds, and the hits, misses and seconds saved by the cache during the run.
+    """
+    queue = JobQueue()
+    completed_jobs = set()
+    consumer = Consumer(queue, num_workers=workers, completed_jobs=completed_jobs,
+                        completed_jobs_lock=threading.Lock(), cache=cache)
+    before = cache.metrics() if cache else None
+    start = time.perf_counter()
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.put_many(jobs)
+    queue.queue.join()
+    makespan = time.perf_counter() - start
+    consumer.shutdown()
+
+    assert len(completed_jobs) == len(jobs)
+    if cache is None:
+        return makespan, None
+    after = cache.metrics()
+    return makespan, {name: after[name] - before[name] for name in ("hits", "misses", "saved_seconds")}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--iterations", type=int, default=20_000, help="Loop iterations per job")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--changed", type=float, default=0.05, help="Fraction of jobs changed for the incremental run")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    set_log_level("CRITICAL")
+
+    def dag(changed: float = 0.0) -> list[Job]:
+        return generate_dag(args.jobs, args.iterations, random.Random(args.seed), changed)
+
+    with tempfile.TemporaryDirectory() as path:
+        cache = ResultCache(path=path)
+        runs = [
+            ("no cache", *run(dag(), args.workers, None)),
+            ("cold", *run(dag(), args.workers, cache)),
+            ("warm memory", *run(dag(), args.workers, cache)),
+            ("warm disk", *run(dag(), args.workers, ResultCache(max_bytes=0, path=path))),
+            (f"{args.changed:.0%} changed", *run(dag(args.changed), args.workers, cache)),
+        ]
+
+    print(f"{args.jobs} jobs, {args.iterations} iterations per job, {args.workers} workers")
+    print(f"{'run':<14}{'makespan s':>12}{'hits':>8}{'misses':>8}{'saved s':>10}")
+    for name, makespan, counts in runs:
+        if counts is None:
+            print(f"{name:<14}{makespan:>12.3f}{'-':>8}{'-':>8}{'-':>10}")
+        else:
+            print(f"{name:<14}{makespan:>12.3f}{counts['hits']:>8}{counts['misses']:>8}{counts['saved_seconds']:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compare FIFO and critical-path makespan on generated DAGs.
+
+Run from the repository root:
+    python -m benchmarks.bench_critical_path
+"""
+import argparse
+import random
+import threading
+import time
+from models.job import Job
+from scheduler.consumer import Consumer
+from scheduler.queue import JobQueue
+from utils.logger import set_log_level
+
+
+def generate_dag(num_jobs: int, max_dependencies: int, window: int, time_unit: float, rng: random.Random) -> list[Job]:
+    """
+    Generate a random DAG in topological order.
+
+    Most jobs are short; a few long ones make the critical path matter.
+
+    Args:
+        - num_jobs: Number of jobs.
+        - max_dependencies: Maximum number of dependencies per job.
+        - window: Dependencies are picked among the previous `window` jobs.
+        - time_unit: Duration of the shortest job in seconds.
+        - rng: Seeded random generator.
+    """
+    jobs = []
+    for i in range(num_jobs):
+        candidates = range(max(0, i - window), i)
+        k = rng.randint(0, min(max_dependencies, len(candidates)))
+        dependencies = rng.sample(candidates, k)
+        execution_time = time_unit * (10 if rng.random() < 0.1 else 1)
+        jobs.append(Job(i, execution_time, dependencies=dependencies))
+    return jobs
+
+
+def run(policy: str, jobs: list[Job], workers: int) -> float:
+    """
+    Submit every job, then run them on a consumer pool with the given policy.
+
+    Returns:
+        - Makespan in seconds.
+    """
+    queue = JobQueue(policy=policy)
+    completed_jobs = set()
+    consumer = Consumer(queue, num_workers=workers, completed_jobs=completed_jobs,
+                        completed_jobs_lock=threading.Lock())
+    for job in jobs:
+        queue.put(Job(job.job_id, job.execution_time, list(job.dependencies)))
+
+    start = time.perf_counter()
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.queue.join()
+    makespan = time.perf_counter() - start
+    consumer.shutdown()
+
+    assert len(completed_jobs) == len(jobs)
+    return makespan
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dags", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=300)
+    parser.add_argument("--max-dependencies", type=int, default=2)
+    parser.add_argument("--window", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--time-unit", type=float, default=0.002)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    set_log_level("CRITICAL")
+    rng = random.Random(args.seed)
+
+    print(f"{'dag':<6}{'fifo (s)':>12}{'critical-path (s)':>20}{'speedup':>10}")
+    for dag in range(args.dags):
+        jobs = generate_dag(args.jobs, args.max_dependencies, args.window, args.time_unit, rng)
+        fifo = run("fifo", jobs, args.workers)
+        critical_path = run("critical-path", jobs, args.workers)
+        print(f"{dag:<6}{fifo:>12.3f}{critical_path:>20.3f}{fifo / critical_path:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
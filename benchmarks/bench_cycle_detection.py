@@ -0,0 +1,73 @@
+"""
+Measure the per-edge cost of online cycle detection as the dependency graph grows.
+
+Run from the repository root:
+    python -m benchmarks.bench_cycle_detection --edges 2000000
+"""
+import argparse
+import random
+import time
+from models.job import Job
+from scheduler.deadlock import DeadlockHandler, IncrementalCycleDetector
+from utils.logger import set_log_level
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--max-dependencies", type=int, default=3)
+    parser.add_argument("--window", type=int, default=1000, help="Dependencies are picked among the previous N jobs")
+    parser.add_argument("--forward-chance", type=float, default=0.01,
+                        help="Chance that a dependency refers to a job that has not been submitted yet")
+    parser.add_argument("--checkpoints", type=int, default=10)
+    parser.add_argument("--full-pass", action="store_true",
+                        help="Also time a full Kahn pass (DeadlockHandler.detect_deadlock) at every checkpoint")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    set_log_level("CRITICAL")
+    rng = random.Random(args.seed)
+    detector = IncrementalCycleDetector()
+    jobs = []
+
+    step = args.edges // args.checkpoints
+    next_checkpoint = step
+    edges = rejected = job_id = 0
+    bucket_edges = 0
+    bucket_time = 0.0
+
+    header = f"{'edges':>12}{'jobs':>12}{'us/edge':>10}{'rejected':>10}"
+    print(header + (f"{'full pass (s)':>15}" if args.full_pass else ""))
+    while edges < args.edges:
+        dependencies = []
+        for _ in range(rng.randint(0, args.max_dependencies)):
+            if rng.random() < args.forward_chance:
+                dependencies.append(job_id + rng.randint(1, args.window))
+            elif job_id:
+                dependencies.append(rng.randint(max(0, job_id - args.window), job_id - 1))
+
+        start = time.perf_counter()
+        cyclic = detector.add_job(job_id, dependencies)
+        bucket_time += time.perf_counter() - start
+
+        rejected += len(cyclic)
+        edges += len(dependencies)
+        bucket_edges += len(dependencies)
+        if args.full_pass:
+            jobs.append(Job(job_id, 0, [dep for dep in dependencies if dep not in cyclic]))
+        job_id += 1
+
+        if edges >= next_checkpoint:
+            line = f"{edges:>12}{job_id:>12}{bucket_time / max(bucket_edges, 1) * 1e6:>10.2f}{rejected:>10}"
+            if args.full_pass:
+                start = time.perf_counter()
+                DeadlockHandler.detect_deadlock(jobs)
+                line += f"{time.perf_counter() - start:>15.3f}"
+            print(line)
+            bucket_edges = 0
+            bucket_time = 0.0
+            next_checkpoint += step
+
+
+if __name__ == "__main__":
+    main()
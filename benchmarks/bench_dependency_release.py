@@ -0,0 +1,132 @@
+"""
+Compare event-driven dependency release against the old re-queue loop.
+
+Run from the repository root:
+    python -m benchmarks.bench_dependency_release
+"""
+import argparse
+import random
+import threading
+import time
+from models.job import Job
+from scheduler.consumer import Consumer
+from scheduler.queue import JobQueue
+from utils.logger import set_log_level
+
+
+class CountingJobQueue(JobQueue):
+    """
+    JobQueue that counts put/get operations.
+    """
+
+    def __init__(self, maxsize: int = 0) -> None:
+        super().__init__(maxsize)
+        self.operations = 0
+
+    def put(self, job: Job) -> None:
+        self.operations += 1
+        super().put(job)
+
+    def get(self) -> Job:
+        self.operations += 1
+        return super().get()
+
+
+class RequeueConsumer(Consumer):
+    """
+    The previous consumer behaviour: blocked jobs are put back on the queue until they can run.
+    """
+
+    def process_job(self, job: Job) -> None:
+        try:
+            if not job.can_execute(self.completed_jobs):
+                self.queue.put(job)
+                return
+
+            job.execute()
+
+            with self.completed_jobs_lock:
+                self.completed_jobs.add(job.job_id)
+        finally:
+            self.queue.task_done()
+
+    def start(self) -> None:
+        while True:
+            job = self.queue.get()
+            self.executor.submit(self.process_job, job)
+
+
+def deep_chain(length: int, execution_time: float) -> list[Job]:
+    """
+    A single chain where every job depends on the previous one.
+    """
+    return [
+        Job(i, execution_time, dependencies=[i - 1] if i else None)
+        for i in range(length)
+    ]
+
+
+def wide_fan_in(groups: int, width: int, execution_time: float) -> list[Job]:
+    """
+    Groups of `width` independent leaves, each followed by one sink depending on all of them.
+    """
+    jobs = []
+    for g in range(groups):
+        leaves = [f"{g}-leaf-{i}" for i in range(width)]
+        jobs.extend(Job(leaf, execution_time) for leaf in leaves)
+        jobs.append(Job(f"{g}-sink", execution_time, dependencies=leaves))
+    return jobs
+
+
+def run(consumer_cls: type, jobs: list[Job], workers: int) -> tuple[float, int]:
+    """
+    Push every job through a consumer pool and wait until all of them completed.
+
+    Returns:
+        - Makespan in seconds and the number of queue operations.
+    """
+    queue = CountingJobQueue()
+    completed_jobs = set()
+    consumer = consumer_cls(queue, num_workers=workers, completed_jobs=completed_jobs,
+                            completed_jobs_lock=threading.Lock())
+
+    start = time.perf_counter()
+    threading.Thread(target=consumer.start, daemon=True).start()
+    for job in jobs:
+        queue.put(job)
+    queue.queue.join()
+    makespan = time.perf_counter() - start
+    consumer.shutdown()
+
+    assert len(completed_jobs) == len(jobs)
+    return makespan, queue.operations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chain-length", type=int, default=300)
+    parser.add_argument("--groups", type=int, default=10)
+    parser.add_argument("--width", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--execution-time", type=float, default=0.001)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    set_log_level("CRITICAL")
+
+    workloads = {
+        "deep chain": deep_chain(args.chain_length, args.execution_time),
+        "wide fan-in": wide_fan_in(args.groups, args.width, args.execution_time),
+    }
+
+    print(f"{'workload':<14}{'consumer':<12}{'makespan (s)':>14}{'queue ops':>12}")
+    for name, jobs in workloads.items():
+        # Submit in a shuffled order so dependents often arrive before their dependencies
+        random.Random(args.seed).shuffle(jobs)
+        for label, consumer_cls in (("re-queue", RequeueConsumer), ("tracker", Consumer)):
+            makespan, operations = run(consumer_cls, [Job(j.job_id, j.execution_time, list(j.dependencies)) for j in jobs], args.workers)
+            print(f"{name:<14}{label:<12}{makespan:>14.3f}{operations:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Measure how the throughput of distributed workers scales with their number.
+
+Run from the repository root:
+    python -m benchmarks.bench_distributed --jobs 2000 --workers 1 2 4 8 --chunk-size 8
+"""
+import argparse
+import threading
+import time
+from models.job import Job
+from scheduler.distributed import DistributedConsumer
+from scheduler.queue import JobQueue
+from utils.logger import set_log_level
+
+
+def spin(iterations: int) -> int:
+    """
+    Burn CPU for a CPU-bound job.
+    """
+    total = 0
+    for i in range(iterations):
+        total += i * i
+    return total
+
+
+def run(args: argparse.Namespace, num_workers: int) -> float:
+    """
+    Run every job on `num_workers` local worker processes.
+
+    Returns:
+        - Throughput, in jobs per second.
+    """
+    queue = JobQueue(maxsize=0)
+    if args.cpu:
+        jobs = [Job(i, 0, func=spin, args=(args.cpu,)) for i in range(args.jobs)]
+    else:
+        jobs = [Job(i, args.job_time) for i in range(args.jobs)]
+    consumer = DistributedConsumer(queue, num_workers=num_workers, completed_jobs=set(),
+                                   completed_jobs_lock=threading.Lock(), chunk_size=args.chunk_size,
+                                   in_flight_per_worker=args.in_flight_per_worker)
+    threading.Thread(target=consumer.start, daemon=True).start()
+    # Let the workers connect before timing
+    while len(consumer.metrics()["workers"]) < num_workers:
+        time.sleep(0.01)
+
+    start = time.perf_counter()
+    queue.put_many(jobs)
+    queue.queue.join()
+    elapsed = time.perf_counter() - start
+    consumer.shutdown()
+    assert len(consumer.completed_jobs) == args.jobs
+    return args.jobs / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--job-time", type=float, default=0.005, help="Seconds each job sleeps")
+    parser.add_argument("--cpu", type=int, default=0,
+                        help="Run CPU-bound jobs of this many loop iterations instead of sleeping")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--chunk-size", type=int, default=8, help="Jobs per lease")
+    parser.add_argument("--in-flight-per-worker", type=int, default=2, help="Credits per worker, in leases")
+    args = parser.parse_args()
+
+    set_log_level("CRITICAL")
+
+    work = f"{args.cpu} iterations" if args.cpu else f"{args.job_time * 1000:.0f}ms sleep"
+    print(f"{args.jobs} independent jobs ({work}), {args.chunk_size} jobs per lease")
+    print(f"{'workers':>8}{'jobs/s':>10}{'speedup':>9}{'efficiency':>12}")
+    baseline = None
+    for num_workers in args.workers:
+        throughput = run(args, num_workers)
+        baseline = baseline or throughput / num_workers
+        speedup = throughput / baseline
+        print(f"{num_workers:>8}{throughput:>10.0f}{speedup:>9.2f}{speedup / num_workers:>12.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare thread, process and hybrid backends on CPU-bound jobs.
+
+Run from the repository root:
+    python -m benchmarks.bench_executors --workers 8
+"""
+import argparse
+import os
+import threading
+import time
+from models.job import Job
+from scheduler.consumer import Consumer
+from scheduler.queue import JobQueue
+from utils.logger import set_log_level
+
+
+def burn(iterations: int) -> int:
+    """
+    CPU-bound work that holds the GIL.
+    """
+    total = 0
+    for i in range(iterations):
+        total += i * i
+    return total
+
+
+def run(backend: str, chunk_size: int, num_jobs: int, iterations: int, workers: int) -> float:
+    """
+    Run independent CPU-bound jobs on the given backend.
+
+    Returns:
+        - Throughput in jobs per second.
+    """
+    queue = JobQueue()
+    completed_jobs = set()
+    consumer = Consumer(queue, num_workers=workers, completed_jobs=completed_jobs,
+                        completed_jobs_lock=threading.Lock(), backend=backend, chunk_size=chunk_size)
+
+    start = time.perf_counter()
+    threading.Thread(target=consumer.start, daemon=True).start()
+    for i in range(num_jobs):
+        queue.put(Job(i, 0, func=burn, args=(iterations,)))
+    queue.queue.join()
+    elapsed = time.perf_counter() - start
+    consumer.shutdown()
+
+    assert len(completed_jobs) == num_jobs
+    return num_jobs / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--iterations", type=int, default=50_000, help="Loop iterations per job")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[1, 16])
+    args = parser.parse_args()
+
+    set_log_level("CRITICAL")
+
+    print(f"{args.workers} workers, {os.cpu_count()} CPUs")
+    print(f"{'backend':<12}{'chunk':>7}{'jobs/s':>12}")
+    print(f"{'threads':<12}{'-':>7}{run('threads', 1, args.jobs, args.iterations, args.workers):>12.1f}")
+    for backend in ("processes", "hybrid"):
+        for chunk_size in args.chunk_sizes:
+            throughput = run(backend, chunk_size, args.jobs, args.iterations, args.workers)
+            print(f"{backend:<12}{chunk_size:>7}{throughput:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
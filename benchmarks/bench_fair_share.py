@@ -0,0 +1,75 @@
+"""
+Measure the latency of a small tenant while a noisy neighbor floods the queue, with and without fair share.
+
+Run from the repository root:
+    python -m benchmarks.bench_fair_share --noisy-jobs 4000 --workers 4
+"""
+import argparse
+import statistics
+import threading
+import time
+from models.job import Job
+from scheduler.consumer import Consumer
+from scheduler.queue import JobQueue
+from utils.logger import set_log_level
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run(args: argparse.Namespace, fair_share: bool, noisy_cap: int | None = None) -> list[float]:
+    """
+    Flood the queue with the noisy tenant's jobs, then submit the quiet tenant's jobs at a steady rate.
+
+    Returns:
+        - Latencies of the quiet tenant's jobs, from submission to completion, in seconds.
+    """
+    queue = JobQueue(maxsize=0, fair_share=fair_share,
+                     tenant_max_in_flight={"noisy": noisy_cap} if noisy_cap else None)
+    completed_jobs = set()
+    consumer = Consumer(queue, num_workers=args.workers, completed_jobs=completed_jobs,
+                        completed_jobs_lock=threading.Lock())
+    threading.Thread(target=consumer.start, daemon=True).start()
+
+    queue.put_many([Job(f"noisy-{i}", args.job_time, tenant="noisy") for i in range(args.noisy_jobs)])
+    quiet = []
+    for i in range(args.quiet_jobs):
+        job = Job(f"quiet-{i}", args.job_time, tenant="quiet")
+        queue.put(job)
+        quiet.append(job)
+        time.sleep(args.quiet_interval)
+    queue.queue.join()
+    consumer.shutdown()
+
+    assert len(completed_jobs) == args.noisy_jobs + args.quiet_jobs
+    return [job.finished_at - job.submitted_at for job in quiet]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--noisy-jobs", type=int, default=4000)
+    parser.add_argument("--quiet-jobs", type=int, default=50)
+    parser.add_argument("--quiet-interval", type=float, default=0.01, help="Seconds between two quiet jobs")
+    parser.add_argument("--job-time", type=float, default=0.002, help="Seconds each job sleeps")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    set_log_level("CRITICAL")
+
+    print(f"{args.noisy_jobs} noisy jobs submitted at once, {args.quiet_jobs} quiet jobs every "
+          f"{args.quiet_interval * 1000:.0f}ms, {args.workers} workers")
+    print(f"{'queue':<28}{'quiet p50 ms':>13}{'quiet p99 ms':>13}")
+    modes = (
+        ("fifo", False, None),
+        ("fair share", True, None),
+        ("fair share, noisy cap 2", True, 2),
+    )
+    for name, fair_share, noisy_cap in modes:
+        latencies = run(args, fair_share, noisy_cap)
+        print(f"{name:<28}{statistics.median(latencies) * 1000:>13.1f}{percentile(latencies, 0.99) * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
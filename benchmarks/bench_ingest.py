@@ -0,0 +1,113 @@
+"""
+Measure how many manifest lines per second StreamProducer ingests into a bounded JobQueue.
+
+Writes a JSON-lines manifest with dependencies (including forward references) to a
+temporary file, streams it into the queue while a consumer thread drains it, and reports
+lines/sec for plain JSON parsing, single and batched submission, and submission with the
+online cycle check that JobManager uses for streamed jobs. Peak traced memory of the
+batched run shows what grows with the manifest: only the set of job IDs.
+
+Run from the repository root:
+    python -m benchmarks.bench_ingest
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from scheduler.ingest import StreamProducer
+from scheduler.queue import JobQueue
+from utils.logger import set_log_level
+
+
+def write_manifest(path: str, lines: int, seed: int) -> None:
+    """
+    Write a manifest whose jobs depend on up to three recent jobs, one in ten on a later job.
+    """
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        for i in range(lines):
+            dependencies = [f"job-{i - rng.randint(1, 50)}" for _ in range(rng.randint(0, 3)) if i > 50]
+            if rng.random() < 0.1 and i + 10 < lines:
+                dependencies.append(f"job-{i + rng.randint(1, 10)}")
+            f.write(json.dumps({"id": f"job-{i}", "duration": 0, "dependencies": dependencies}) + "\n")
+
+
+def parse_only(path: str) -> float:
+    start = time.perf_counter()
+    with open(path) as f:
+        lines = sum(1 for line in f if json.loads(line))
+    return lines / (time.perf_counter() - start)
+
+
+def ingest(path: str, batch_size: int, queue_size: int, cycle_check: str) -> tuple[float, int]:
+    """
+    Stream the manifest into a queue drained by one consumer thread.
+
+    Returns:
+        - Lines ingested per second and the number of jobs submitted.
+    """
+    queue = JobQueue(maxsize=queue_size, cycle_check=cycle_check)
+    producer = StreamProducer(queue, path, batch_size=batch_size)
+    done = threading.Event()
+
+    def drain() -> None:
+        while not (done.is_set() and queue.qsize() == 0):
+            jobs = queue.get_batch(256, timeout=0.05)
+            if jobs:
+                queue.task_done(len(jobs))
+                for job in jobs:
+                    queue.retire(job.job_id)
+
+    consumer = threading.Thread(target=drain)
+    start = time.perf_counter()
+    consumer.start()
+    producer.start()
+    producer.join()
+    queue.queue.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    consumer.join()
+    return producer.line_count / elapsed, producer.job_count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    set_log_level("CRITICAL")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "manifest.jsonl")
+        write_manifest(path, args.lines, args.seed)
+        size = os.path.getsize(path)
+        print(f"Manifest: {args.lines} lines, {size / 2**20:.1f} MB")
+
+        print(f"{'mode':<32}{'lines/s':>12}")
+        print(f"{'json.loads only':<32}{parse_only(path):>12.0f}")
+        for label, batch_size, cycle_check in [
+            ("put, one job at a time", 1, "off"),
+            (f"put_many, batches of {args.batch_size}", args.batch_size, "off"),
+            ("put_many + cycle check (drop)", args.batch_size, "drop"),
+        ]:
+            rate, jobs = ingest(path, batch_size, args.queue_size, cycle_check)
+            assert jobs == args.lines
+            print(f"{label:<32}{rate:>12.0f}")
+
+        tracemalloc.start()
+        ingest(path, args.batch_size, args.queue_size, "off")
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Peak traced memory while streaming: {peak / 2**20:.1f} MB "
+              f"(manifest {size / 2**20:.1f} MB; only the job ID set grows with it)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare memory use and creation throughput of job representations at 1M jobs.
+
+Run from the repository root:
+    python -m benchmarks.bench_job_model --jobs 1000000
+"""
+import argparse
+import gc
+import random
+import threading
+import time
+import tracemalloc
+from models.job import Job
+from models.job_table import JobTable
+
+
+class LegacyJob:
+    """
+    The previous job layout: a `__dict__`, a lock per job and a list of string dependency IDs.
+    """
+
+    def __init__(self, job_id, execution_time, dependencies=None) -> None:
+        self.job_id = job_id
+        self.execution_time = execution_time
+        self.dependencies = dependencies if dependencies else []
+        self.is_completed = False
+        self.lock = threading.Lock()
+
+
+def build_objects(cls: type, plan: list[tuple]) -> list:
+    created, jobs = [], []
+    for i, dep_indexes in enumerate(plan):
+        job_id = f"Producer-0-Job-{i}"
+        jobs.append(cls(job_id, 1, [created[j] for j in dep_indexes]))
+        created.append(job_id)
+    return jobs
+
+
+def build_table(plan: list[tuple]) -> JobTable:
+    table = JobTable()
+    created = []
+    for i, dep_indexes in enumerate(plan):
+        job_id = f"Producer-0-Job-{i}"
+        table.add(job_id, 1, [created[j] for j in dep_indexes])
+        created.append(job_id)
+    return table
+
+
+def build_table_int_ids(plan: list[tuple]) -> JobTable:
+    table = JobTable()
+    for i, dep_indexes in enumerate(plan):
+        table.add(i, 1, dep_indexes)
+    return table
+
+
+def measure(build, plan: list[tuple]) -> tuple[float, float]:
+    """
+    Returns:
+        - Jobs created per second and bytes allocated per job.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = build(plan)
+    elapsed = time.perf_counter() - start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = build(plan)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return len(plan) / elapsed, size / len(plan)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--max-dependencies", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    plan = [
+        tuple(rng.sample(range(max(0, i - 100), i), k=rng.randint(0, min(i, args.max_dependencies))))
+        for i in range(args.jobs)
+    ]
+
+    print(f"{args.jobs} jobs")
+    print(f"{'model':<22}{'jobs/s':>12}{'bytes/job':>12}{'total (MB)':>12}")
+    for name, build in (
+        ("legacy Job", lambda p: build_objects(LegacyJob, p)),
+        ("Job (__slots__)", lambda p: build_objects(Job, p)),
+        ("JobTable", build_table),
+        ("JobTable (int IDs)", build_table_int_ids),
+    ):
+        rate, per_job = measure(build, plan)
+        print(f"{name:<22}{rate:>12.0f}{per_job:>12.1f}{per_job * args.jobs / 2**20:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
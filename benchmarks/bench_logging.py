@@ -0,0 +1,80 @@
+"""
+Compare job throughput at INFO level with synchronous, asynchronous and rate-limited logging.
+
+Run from the repository root:
+    python -m benchmarks.bench_logging
+"""
+import argparse
+import os
+import random
+import threading
+import time
+from models.job import Job
+from scheduler.consumer import Consumer
+from scheduler.queue import JobQueue
+from utils.logger import configure_logging, set_log_level, shutdown_logging
+
+
+def run(num_jobs: int, workers: int, dependency_chance: float, seed: int) -> float:
+    """
+    Push zero-duration jobs through the scheduler.
+
+    Returns:
+        - Jobs per second.
+    """
+    rng = random.Random(seed)
+    jobs = [
+        Job(i, 0, dependencies=[rng.randrange(i)] if i and rng.random() < dependency_chance else None)
+        for i in range(num_jobs)
+    ]
+    # Submit in reverse so dependents wait on their dependencies and log about it
+    jobs.reverse()
+
+    queue = JobQueue()
+    consumer = Consumer(queue, num_workers=workers, completed_jobs=set(), completed_jobs_lock=threading.Lock())
+
+    start = time.perf_counter()
+    threading.Thread(target=consumer.start, daemon=True).start()
+    for job in jobs:
+        queue.put(job)
+    queue.queue.join()
+    elapsed = time.perf_counter() - start
+    consumer.shutdown()
+    return num_jobs / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--dependency-chance", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    modes = [
+        ("sync text", dict(mode="sync", fmt="text")),
+        ("async text", dict(mode="async", fmt="text")),
+        ("async json", dict(mode="async", fmt="json")),
+        ("async text, rate-limited", dict(mode="async", fmt="text", rate_limit=10)),
+    ]
+
+    results = []
+    with open(os.devnull, "w") as devnull:
+        for name, options in modes:
+            configure_logging(stream=devnull, **options)
+            set_log_level("INFO")
+            throughput = run(args.jobs, args.workers, args.dependency_chance, args.seed)
+            # Time spent draining the background thread is part of the cost
+            drain = time.perf_counter()
+            shutdown_logging()
+            drain = time.perf_counter() - drain
+            results.append((name, throughput, drain))
+    configure_logging()
+
+    print(f"{'logging':<28}{'jobs/s':>10}{'drain (s)':>12}")
+    for name, throughput, drain in results:
+        print(f"{name:<28}{throughput:>10.0f}{drain:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
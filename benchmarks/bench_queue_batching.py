@@ -0,0 +1,90 @@
+"""
+Measure JobQueue operations per second with single and batched put/get as producer and consumer counts grow.
+
+Run from the repository root:
+    python -m benchmarks.bench_queue_batching
+"""
+import argparse
+import logging
+import threading
+import time
+from models.job import Job
+from scheduler.queue import JobQueue
+from utils.logger import set_log_level
+
+
+def run(num_producers: int, num_consumers: int, jobs_per_producer: int, batch_size: int, queue_size: int) -> float:
+    """
+    Push jobs through the queue with producer and consumer threads.
+
+    Returns:
+        - Jobs moved through the queue per second (put, get and task_done each).
+    """
+    queue = JobQueue(maxsize=queue_size)
+    total = num_producers * jobs_per_producer
+    jobs = [Job(i, 0) for i in range(total)]
+    remaining = [total]
+    remaining_lock = threading.Lock()
+
+    def produce(offset: int) -> None:
+        mine = jobs[offset:offset + jobs_per_producer]
+        if batch_size == 1:
+            for job in mine:
+                queue.put(job)
+        else:
+            for i in range(0, len(mine), batch_size):
+                queue.put_many(mine[i:i + batch_size])
+
+    def consume() -> None:
+        while True:
+            with remaining_lock:
+                if remaining[0] <= 0:
+                    return
+            if batch_size == 1:
+                taken = queue.get_batch(1, timeout=0.05)
+                for _ in taken:
+                    queue.task_done()
+            else:
+                taken = queue.get_batch(batch_size, timeout=0.05)
+                if taken:
+                    queue.task_done(len(taken))
+            with remaining_lock:
+                remaining[0] -= len(taken)
+
+    threads = [threading.Thread(target=produce, args=(p * jobs_per_producer,)) for p in range(num_producers)]
+    threads += [threading.Thread(target=consume) for _ in range(num_consumers)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    queue.queue.join()
+    elapsed = time.perf_counter() - start
+    for thread in threads:
+        thread.join()
+    return total / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs-per-producer", type=int, default=20_000)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Producer and consumer counts to sweep (same number of each)")
+    parser.add_argument("--log-level", default="INFO", help="Logging level during the run")
+    args = parser.parse_args()
+
+    # Log records are formatted and emitted at INFO; send them nowhere to keep the output readable
+    set_log_level(args.log_level)
+    for handler in logging.getLogger().handlers:
+        handler.setLevel(logging.CRITICAL)
+
+    print(f"{'producers':>10}{'consumers':>10}{'single ops/s':>15}{'batched ops/s':>15}{'speedup':>10}")
+    for count in args.threads:
+        single = run(count, count, args.jobs_per_producer, 1, args.queue_size)
+        batched = run(count, count, args.jobs_per_producer, args.batch_size, args.queue_size)
+        print(f"{count:>10}{count:>10}{single:>15.0f}{batched:>15.0f}{batched / single:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
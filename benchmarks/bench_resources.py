@@ -0,0 +1,77 @@
+"""
+Compare resource packing without and with backfilling on a mix of large and small jobs.
+
+Run from the repository root:
+    python -m benchmarks.bench_resources --jobs 200 --cpus 8
+"""
+import argparse
+import random
+import threading
+import time
+from models.job import Job
+from scheduler.consumer import Consumer
+from scheduler.queue import JobQueue
+from utils.logger import set_log_level
+
+
+def generate_jobs(num_jobs: int, cpus: int, rng: random.Random) -> list[Job]:
+    """
+    Generate independent jobs: one in ten needs every CPU for 0.1s, the others one or two CPUs
+    for 0.01s to 0.05s.
+    """
+    jobs = []
+    for i in range(num_jobs):
+        if rng.random() < 0.1:
+            jobs.append(Job(i, 0.1, resources={"cpu": cpus}))
+        else:
+            jobs.append(Job(i, rng.uniform(0.01, 0.05), resources={"cpu": rng.randint(1, 2)}))
+    return jobs
+
+
+def run(jobs: list[Job], cpus: int, backfill: bool) -> tuple[float, dict]:
+    """
+    Run the jobs on a pool with `cpus` CPU slots.
+
+    Returns:
+        - The makespan in seconds and the pool's resource metrics.
+    """
+    queue = JobQueue(maxsize=len(jobs))
+    completed_jobs = set()
+    consumer = Consumer(queue, num_workers=cpus, completed_jobs=completed_jobs, completed_jobs_lock=threading.Lock(),
+                        batch_size=16, resources={"cpu": cpus})
+    if not backfill:
+        # Strict order: a job that does not fit blocks every job behind it
+        consumer.pool.backfill_depth = 0
+    queue.put_many([Job(job.job_id, job.execution_time, resources=job.resources) for job in jobs])
+    start = time.perf_counter()
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.queue.join()
+    elapsed = time.perf_counter() - start
+    metrics = consumer.resource_metrics()
+    consumer.shutdown()
+
+    assert len(completed_jobs) == len(jobs)
+    return elapsed, metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--cpus", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    set_log_level("CRITICAL")
+
+    jobs = generate_jobs(args.jobs, args.cpus, random.Random(args.seed))
+    work = sum(job.execution_time * job.resources["cpu"] for job in jobs) / args.cpus
+    print(f"{args.jobs} jobs on {args.cpus} CPU slots, {work:.2f}s of work per slot")
+    print(f"{'mode':<14}{'makespan s':>11}{'cpu utilization':>17}{'backfilled':>12}")
+    for name, backfill in (("strict order", False), ("backfilling", True)):
+        elapsed, metrics = run(jobs, args.cpus, backfill)
+        utilization = metrics["resources"]["cpu"]["utilization"]
+        print(f"{name:<14}{elapsed:>11.2f}{utilization:>17.1%}{metrics['backfilled']:>12}")
+
+
+if __name__ == "__main__":
+    main()
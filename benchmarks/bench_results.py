@@ -0,0 +1,84 @@
+"""
+Compare pickled and shared-memory result passing between dependent jobs on the process backend.
+
+Run from the repository root:
+    python -m benchmarks.bench_results --size-mb 8 --dependents 16
+"""
+import argparse
+import sys
+import threading
+import time
+from models.job import Job
+from scheduler import results as results_module
+from scheduler.consumer import Consumer
+from scheduler.queue import JobQueue
+from scheduler.results import ResultStore
+from utils.logger import set_log_level
+
+SHARED_THRESHOLD = results_module.SHARED_THRESHOLD
+
+
+def make_payload(nbytes: int) -> bytearray:
+    """
+    Produce a large result.
+    """
+    return bytearray(nbytes)
+
+
+def checksum(results: dict) -> int:
+    """
+    Read a few bytes of every input, as a consumer of a large array typically does.
+    """
+    return sum(value[0] + value[-1] for value in results.values())
+
+
+def run(shared: bool, nbytes: int, dependents: int, rounds: int, workers: int) -> float:
+    """
+    Run `rounds` fan-outs of one large result to `dependents` jobs.
+
+    Returns:
+        - Throughput in dependent jobs per second.
+    """
+    # Worker processes inherit the threshold when they are forked
+    results_module.SHARED_THRESHOLD = SHARED_THRESHOLD if shared else sys.maxsize
+    queue = JobQueue(results=ResultStore(shared=shared))
+    completed_jobs = set()
+    consumer = Consumer(queue, num_workers=workers, completed_jobs=completed_jobs,
+                        completed_jobs_lock=threading.Lock(), backend="processes")
+
+    start = time.perf_counter()
+    threading.Thread(target=consumer.start, daemon=True).start()
+    for r in range(rounds):
+        queue.put(Job(f"{r}-source", 0, func=make_payload, args=(nbytes,)))
+        for i in range(dependents):
+            queue.put(Job(f"{r}-{i}", 0, dependencies=[f"{r}-source"], func=checksum, pass_results=True))
+    queue.queue.join()
+    elapsed = time.perf_counter() - start
+    consumer.shutdown()
+    queue.results.close()
+
+    assert len(completed_jobs) == rounds * (dependents + 1)
+    return rounds * dependents / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, nargs="+", default=[0.1, 1, 8])
+    parser.add_argument("--dependents", type=int, default=16, help="Dependents per large result")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    set_log_level("CRITICAL")
+
+    print(f"{args.dependents} dependents per result, {args.workers} workers")
+    print(f"{'size MB':>8}{'pickled jobs/s':>16}{'shared jobs/s':>16}")
+    for size in args.size_mb:
+        nbytes = int(size * 1024 * 1024)
+        pickled = run(False, nbytes, args.dependents, args.rounds, args.workers)
+        shared = run(True, nbytes, args.dependents, args.rounds, args.workers)
+        print(f"{size:>8}{pickled:>16.1f}{shared:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare the makespan predicted by the simulator with real runs, and time a simulated sweep.
+
+Run from the repository root:
+    python -m benchmarks.bench_simulator --jobs-per-producer 40 --time-scale 0.01
+"""
+import argparse
+import time
+from scheduler.job_manager import JobManager
+from scheduler.simulator import Simulator
+from utils.logger import set_log_level
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--producers", type=int, default=3)
+    parser.add_argument("--jobs-per-producer", type=int, default=40)
+    parser.add_argument("--dependency-chance", type=float, default=0.3)
+    parser.add_argument("--time-scale", type=float, default=0.01, help="Factor applied to job execution times")
+    parser.add_argument("--configs", type=str, nargs="+", default=["1:10", "2:10", "4:5", "8:0"],
+                        help="Configurations to run for real, as consumers:queue-size")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--sweep-jobs", type=int, default=2000, help="Jobs per producer of the timed sweep")
+    args = parser.parse_args()
+
+    set_log_level("CRITICAL")
+
+    simulator = Simulator.from_generator(args.producers, args.jobs_per_producer, args.dependency_chance,
+                                         seed=args.seed, time_scale=args.time_scale)
+    print(f"{args.producers} producers x {args.jobs_per_producer} jobs, seed {args.seed}")
+    print(f"{'consumers':>10}{'queue':>7}{'real s':>9}{'simulated s':>13}{'error':>8}")
+    for config in args.configs:
+        consumers, queue_size = map(int, config.split(":"))
+        manager = JobManager(num_producers=args.producers, num_consumers=consumers,
+                             jobs_per_producer=args.jobs_per_producer, queue_size=queue_size,
+                             dependency_chance=args.dependency_chance, seed=args.seed, time_scale=args.time_scale)
+        start = time.perf_counter()
+        manager.start()
+        real = time.perf_counter() - start
+        predicted = simulator.run(consumers, queue_size)["makespan"]
+        print(f"{consumers:>10}{queue_size or '-':>7}{real:>9.3f}{predicted:>13.3f}{(predicted - real) / real:>8.1%}")
+
+    start = time.perf_counter()
+    simulator = Simulator.from_generator(args.producers, args.sweep_jobs, args.dependency_chance, seed=args.seed)
+    results = simulator.sweep([1, 2, 4, 8, 16], [0, 10])
+    print(f"Simulated {len(results)} configurations of {args.producers * args.sweep_jobs} jobs "
+          f"in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
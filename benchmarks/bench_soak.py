@@ -0,0 +1,75 @@
+"""
+Soak-test the scheduler's service mode and track resident memory as jobs stream through.
+
+Runs JobManager in service mode on a zero-sleep workload and samples the process RSS at a
+fixed interval. Completed jobs are reclaimed, so RSS should level off after warm-up and the
+growth reported at the end should be close to zero. Tens of millions of jobs take a while;
+the default is shorter.
+
+Run from the repository root:
+    python -m benchmarks.bench_soak --jobs 20000000
+"""
+import argparse
+import os
+import resource
+import threading
+import time
+from scheduler.job_manager import JobManager
+from utils.logger import set_log_level
+
+
+def rss_mb() -> float:
+    """
+    Current resident set size in MB (peak RSS where /proc is unavailable).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=2_000_000, help="Total number of jobs")
+    parser.add_argument("--producers", type=int, default=2)
+    parser.add_argument("--consumers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--dependency-chance", type=float, default=0.3)
+    parser.add_argument("--dependency-window", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds between two RSS samples")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    set_log_level("WARNING")
+
+    job_manager = JobManager(
+        num_producers=args.producers, num_consumers=args.consumers, jobs_per_producer=args.jobs // args.producers,
+        queue_size=args.queue_size, dependency_chance=args.dependency_chance, batch_size=args.batch_size,
+        seed=args.seed, time_scale=0, service=True, dependency_window=args.dependency_window,
+    )
+    runner = threading.Thread(target=job_manager.serve, kwargs={"stop_when_done": True})
+
+    start = time.perf_counter()
+    baseline = rss_mb()
+    runner.start()
+    print(f"{'elapsed(s)':>10}{'completed':>12}{'jobs/s':>10}{'rss(MB)':>10}")
+    print(f"{0:>10.0f}{0:>12}{0:>10}{baseline:>10.1f}", flush=True)
+    samples = []
+    while runner.is_alive():
+        runner.join(args.interval)
+        elapsed = time.perf_counter() - start
+        completed = job_manager.consumer.stats.snapshot()["jobs_completed"]
+        samples.append((completed, rss_mb()))
+        print(f"{elapsed:>10.0f}{completed:>12}{completed / elapsed:>10.0f}{samples[-1][1]:>10.1f}", flush=True)
+
+    # Growth over the second half of the run, after warm-up
+    half = samples[len(samples) // 2:]
+    if len(half) >= 2 and half[-1][0] > half[0][0]:
+        growth = (half[-1][1] - half[0][1]) / (half[-1][0] - half[0][0]) * 1e6
+        print(f"RSS growth over the second half: {growth:+.1f} MB per million jobs")
+
+
+if __name__ == "__main__":
+    main()
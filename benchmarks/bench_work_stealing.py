@@ -0,0 +1,77 @@
+"""
+Compare the central dispatcher with work-stealing worker deques as worker count and job size vary.
+
+Run from the repository root:
+    python -m benchmarks.bench_work_stealing --workers 1 2 4 8
+"""
+import argparse
+import random
+import threading
+import time
+from models.job import Job
+from scheduler.consumer import Consumer
+from scheduler.queue import JobQueue
+from scheduler.stealing import WorkStealingConsumer
+from utils.logger import set_log_level
+
+
+def generate_dag(num_jobs: int, execution_time: float, rng: random.Random) -> list[Job]:
+    """
+    Generate a DAG in topological order where most jobs have one or two recent dependencies,
+    so finishing a job usually releases work.
+    """
+    jobs = []
+    for i in range(num_jobs):
+        candidates = range(max(0, i - 50), i)
+        dependencies = rng.sample(candidates, min(len(candidates), rng.randint(0, 2)))
+        jobs.append(Job(i, execution_time, dependencies=dependencies))
+    return jobs
+
+
+def run(consumer_class: type, jobs: list[Job], workers: int, queue_size: int) -> float:
+    """
+    Submit the jobs through a bounded queue and run them.
+
+    Returns:
+        - Throughput in jobs per second.
+    """
+    queue = JobQueue(maxsize=queue_size)
+    completed_jobs = set()
+    consumer = consumer_class(queue, num_workers=workers, completed_jobs=completed_jobs,
+                              completed_jobs_lock=threading.Lock(), batch_size=16)
+    start = time.perf_counter()
+    threading.Thread(target=consumer.start, daemon=True).start()
+    for i in range(0, len(jobs), 16):
+        queue.put_many([Job(job.job_id, job.execution_time, list(job.dependencies)) for job in jobs[i:i + 16]])
+    queue.queue.join()
+    elapsed = time.perf_counter() - start
+    consumer.shutdown()
+
+    assert len(completed_jobs) == len(jobs)
+    return len(jobs) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--job-times", type=float, nargs="+", default=[0, 0.0001, 0.001],
+                        help="Seconds each job sleeps")
+    parser.add_argument("--queue-size", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    set_log_level("CRITICAL")
+
+    print(f"{args.jobs} jobs, queue size {args.queue_size}")
+    print(f"{'job time s':>11}{'workers':>9}{'dispatcher jobs/s':>19}{'stealing jobs/s':>17}{'speedup':>9}")
+    for execution_time in args.job_times:
+        jobs = generate_dag(args.jobs, execution_time, random.Random(args.seed))
+        for workers in args.workers:
+            central = run(Consumer, jobs, workers, args.queue_size)
+            stealing = run(WorkStealingConsumer, jobs, workers, args.queue_size)
+            print(f"{execution_time:>11}{workers:>9}{central:>19.0f}{stealing:>17.0f}{stealing / central:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Reproducible scaling benchmark suite for the scheduler.
+
+Sweeps producers, consumers, jobs per producer, queue size and dependency chance, runs every
+configuration with seeded job generation, and reports jobs/sec, queue-to-start latency
+percentiles, makespan and peak memory. Results can be saved as JSON and compared against a
+stored baseline to catch regressions.
+
+Run from the repository root:
+    python -m benchmarks.suite --time-scale 0 --output results.json
+    python -m benchmarks.suite --time-scale 0 --baseline results.json
+"""
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from scheduler.job_manager import JobManager
+from utils.logger import set_log_level
+
+SWEEP_KEYS = ("producers", "consumers", "jobs_per_producer", "queue_size", "dependency_chance")
+
+# Metric name -> True if higher is better
+METRICS = {
+    "jobs_per_second": True,
+    "makespan": False,
+    "latency_p50": False,
+    "latency_p95": False,
+    "latency_p99": False,
+    "peak_memory_bytes": False,
+}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run_config(config: dict, seed: int, time_scale: float) -> dict:
+    """
+    Run one scheduler configuration and collect its metrics.
+
+    Args:
+        - config: Values for each of `SWEEP_KEYS`.
+        - seed: Seed for job generation.
+        - time_scale: Factor applied to job durations and production delays.
+
+    Returns:
+        - Dictionary of metrics.
+    """
+    tracemalloc.start()
+    job_manager = JobManager(
+        num_producers=config["producers"],
+        num_consumers=config["consumers"],
+        jobs_per_producer=config["jobs_per_producer"],
+        queue_size=config["queue_size"],
+        dependency_chance=config["dependency_chance"],
+        seed=seed,
+        time_scale=time_scale,
+    )
+    start = time.perf_counter()
+    job_manager.start()
+    makespan = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = sorted(
+        job.started_at - job.submitted_at for job in job_manager.all_jobs if job.started_at is not None
+    )
+    completed = len(job_manager.get_completed_jobs())
+    return {
+        "jobs": completed,
+        "jobs_per_second": completed / makespan,
+        "makespan": makespan,
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p95": percentile(latencies, 0.95),
+        "latency_p99": percentile(latencies, 0.99),
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_suite(args: argparse.Namespace) -> list[dict]:
+    """
+    Run every configuration of the sweep `repeats` times and keep the median of each metric.
+    """
+    results = []
+    for values in itertools.product(*(getattr(args, key) for key in SWEEP_KEYS)):
+        config = dict(zip(SWEEP_KEYS, values))
+        runs = [run_config(config, args.seed + repeat, args.time_scale) for repeat in range(args.repeats)]
+        result = dict(config)
+        result["jobs"] = runs[0]["jobs"]
+        for metric in METRICS:
+            result[metric] = statistics.median(run[metric] for run in runs)
+        results.append(result)
+        print(format_result(result), flush=True)
+    return results
+
+
+def format_result(result: dict) -> str:
+    return (
+        f"{result['producers']:>4}{result['consumers']:>5}{result['jobs_per_producer']:>7}"
+        f"{result['queue_size']:>7}{result['dependency_chance']:>6.2f}"
+        f"{result['jobs_per_second']:>10.0f}{result['makespan']:>9.3f}"
+        f"{result['latency_p50'] * 1000:>9.2f}{result['latency_p95'] * 1000:>9.2f}{result['latency_p99'] * 1000:>9.2f}"
+        f"{result['peak_memory_bytes'] / 2**20:>9.1f}"
+    )
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compare results against a baseline run.
+
+    Args:
+        - results: Results of this run.
+        - baseline: Parsed baseline JSON.
+        - tolerance: Allowed relative change before a metric counts as a regression.
+
+    Returns:
+        - Human-readable description of every regression.
+    """
+    key = lambda result: tuple(result[k] for k in SWEEP_KEYS)
+    previous = {key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            before, after = old[metric], result[metric]
+            if not before:
+                continue
+            change = (after - before) / before
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                regressions.append(
+                    f"{dict(zip(SWEEP_KEYS, key(result)))}: {metric} {before:.6g} -> {after:.6g} ({change:+.1%})"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--producers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--consumers", type=int, nargs="+", default=[2, 8])
+    parser.add_argument("--jobs-per-producer", type=int, nargs="+", default=[250])
+    parser.add_argument("--queue-size", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--dependency-chance", type=float, nargs="+", default=[0.0, 0.3])
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per configuration; the median is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-scale", type=float, default=0.0,
+                        help="Factor applied to job durations and production delays (0: zero-sleep)")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare results against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative change (default: 0.10)")
+    args = parser.parse_args()
+
+    set_log_level("WARNING")
+
+    print(f"{'prod':>4}{'cons':>5}{'jobs':>7}{'queue':>7}{'deps':>6}"
+          f"{'jobs/s':>10}{'span(s)':>9}{'p50(ms)':>9}{'p95(ms)':>9}{'p99(ms)':>9}{'mem(MB)':>9}")
+    results = run_suite(args)
+
+    if args.output:
+        report = {
+            "metadata": {
+                "seed": args.seed,
+                "time_scale": args.time_scale,
+                "repeats": args.repeats,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,12 @@
 import argparse
+from scheduler.deadlock import EDGE_POLICIES
+from scheduler.distributed import parse_address
+from scheduler.executors import BACKENDS
+from scheduler.fairshare import parse_tenant_values
+from scheduler.journal import SYNC_MODES
+from scheduler.metrics import EXPORT_FORMATS
+from scheduler.queue import CYCLE_CHECKS, POLICIES
+from scheduler.resources import parse_resources
 
 def parse_args():
     """
@@ -27,11 +35,207 @@ def parse_args():
         "--dependency-chance", type=float, default=0.3,
         help="Chance (0-1) of jobs having dependencies (default: 0.3)"
     )
+    parser.add_argument(
+        "--source", type=str, default=None,
+        help="Stream jobs from a JSON-lines manifest, or - for standard input, instead of generating "
+             "random jobs; --producers and --jobs-per-producer are then ignored (default: random jobs)"
+    )
+    parser.add_argument(
+        "--scheduling-policy", type=str, default="fifo", choices=POLICIES,
+        help="Order in which ready jobs run: fifo, critical-path (longest downstream path first) "
+             "or priority (highest job priority first) (default: fifo)"
+    )
+    parser.add_argument(
+        "--cycle-check", type=str, default="off", choices=CYCLE_CHECKS,
+        help="Check for dependency cycles as jobs are submitted: off, reject or drop "
+             "the offending dependencies (default: off)"
+    )
+    parser.add_argument(
+        "--deadlock-policy", type=str, default="newest", choices=list(EDGE_POLICIES),
+        help="Which dependency of a cycle to remove when resolving a deadlock: newest, "
+             "lowest-priority or cheapest (default: newest)"
+    )
+    parser.add_argument(
+        "--engine", type=str, default="threads", choices=["threads", "asyncio"],
+        help="Scheduling engine: threads, or asyncio for I/O-bound jobs on one event loop (default: threads)"
+    )
+    parser.add_argument(
+        "--backend", type=str, default="threads", choices=(*BACKENDS, "distributed"),
+        help="Where jobs execute: threads, processes, hybrid (CPU-bound jobs in processes), or distributed "
+             "(worker processes leasing jobs over a socket; --consumers of them are started locally) (default: threads)"
+    )
+    parser.add_argument(
+        "--listen", type=parse_address, default=None,
+        help="With --backend distributed, address workers connect to, host:port or a socket path "
+             "(default: a free port on 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--connect", type=parse_address, default=None,
+        help="Run as a worker of the distributed scheduler at this address, host:port or a socket path, "
+             "instead of scheduling jobs"
+    )
+    parser.add_argument(
+        "--authkey", type=str, default=None,
+        help="Secret shared by the distributed scheduler and its workers (default: random, local workers only)"
+    )
+    parser.add_argument(
+        "--heartbeat-timeout", type=float, default=5.0,
+        help="Seconds without a heartbeat after which the jobs leased to a worker are re-queued (default: 5)"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=1,
+        help="Maximum number of jobs sent to a worker process at once (default: 1)"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1,
+        help="Number of jobs producers submit and consumers drain per queue operation (default: 1)"
+    )
+    parser.add_argument(
+        "--in-flight-per-worker", type=int, default=1,
+        help="Maximum number of jobs in flight per consumer worker; further jobs stay on the bounded queue (default: 1)"
+    )
+    parser.add_argument(
+        "--max-retries", type=int, default=0,
+        help="Number of times a failed job is retried, with exponential backoff (default: 0)"
+    )
+    parser.add_argument(
+        "--retry-backoff", type=float, default=0.1,
+        help="Seconds before the first retry of a failed job; doubles with every attempt (default: 0.1)"
+    )
+    parser.add_argument(
+        "--job-timeout", type=float, default=None,
+        help="Seconds a job may run before it fails (default: no timeout)"
+    )
+    parser.add_argument(
+        "--resources", type=parse_resources, default=None,
+        help="Capacity of the resources jobs declare, e.g. cpu=4,memory=8192,db-connections=4; "
+             "ready jobs are packed against it with backfilling (default: requirements are ignored)"
+    )
+    parser.add_argument(
+        "--fair-share", action="store_true",
+        help="Share the consumers fairly between tenants (producers, or \"tenant\" in a manifest) instead of one FIFO"
+    )
+    parser.add_argument(
+        "--tenant-weights", type=parse_tenant_values, default=None,
+        help="With --fair-share, share of each tenant, e.g. Producer-0=2,Producer-1=1 (default: 1 each)"
+    )
+    parser.add_argument(
+        "--tenant-rates", type=parse_tenant_values, default=None,
+        help="With --fair-share, maximum jobs per second started for each listed tenant (default: unlimited)"
+    )
+    parser.add_argument(
+        "--tenant-max-in-flight", type=parse_tenant_values, default=None,
+        help="With --fair-share, maximum jobs in flight for each listed tenant (default: unlimited)"
+    )
+    parser.add_argument(
+        "--min-consumers", type=int, default=None,
+        help="Enable autoscaling: smallest number of consumer workers; --consumers is the initial number (default: no autoscaling)"
+    )
+    parser.add_argument(
+        "--max-consumers", type=int, default=None,
+        help="Enable autoscaling: largest number of consumer workers (default: --consumers)"
+    )
+    parser.add_argument(
+        "--autoscale-interval", type=float, default=0.5,
+        help="Seconds between two autoscaling decisions (default: 0.5)"
+    )
+    parser.add_argument(
+        "--work-stealing", action="store_true",
+        help="Give every worker its own deque of ready jobs and let idle workers steal, instead of one dispatcher"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None,
+        help="Seed for generating jobs, for reproducible runs (default: unseeded)"
+    )
+    parser.add_argument(
+        "--time-scale", type=float, default=1.0,
+        help="Factor applied to job durations and production delays; 0 disables sleeping (default: 1.0)"
+    )
+    parser.add_argument(
+        "--service", action="store_true",
+        help="Run as a long-lived service with flat memory: jobs may only depend on earlier jobs, completed "
+             "jobs are reclaimed, and the scheduler stops on SIGINT/SIGTERM or when its producers are done"
+    )
+    parser.add_argument(
+        "--retain-completed", type=int, default=1000,
+        help="In service mode, number of recent completed and of recent failed job IDs kept for reporting (default: 1000)"
+    )
+    parser.add_argument(
+        "--dependency-window", type=int, default=100,
+        help="In service mode, number of recent jobs each producer picks dependencies from (default: 100)"
+    )
+    parser.add_argument(
+        "--journal", type=str, default=None,
+        help="Write-ahead journal file; an existing journal is recovered, skipping completed jobs "
+             "and resubmitting pending ones (default: no journal)"
+    )
+    parser.add_argument(
+        "--journal-sync", type=str, default="group", choices=SYNC_MODES,
+        help="When journal writes are fsynced: group (batched on a background thread), always, or none (default: group)"
+    )
+    parser.add_argument(
+        "--journal-snapshot-every", type=int, default=10_000,
+        help="Number of journal records between two snapshots that truncate the log (default: 10000)"
+    )
+    parser.add_argument(
+        "--cache-size-mb", type=float, default=0,
+        help="Memory for cached results of deterministic jobs, in MB (default: 0, no cache unless --cache-dir is given)"
+    )
+    parser.add_argument(
+        "--cache-dir", type=str, default=None,
+        help="Directory of an on-disk result cache shared across runs (default: none)"
+    )
+    parser.add_argument(
+        "--simulate", action="store_true",
+        help="Predict makespan, utilization and wait times in virtual time instead of running the jobs, "
+             "for every combination of --sweep-consumers and --sweep-queue-sizes"
+    )
+    parser.add_argument(
+        "--sweep-consumers", type=int, nargs="+", default=None,
+        help="With --simulate, consumer counts to try (default: --consumers)"
+    )
+    parser.add_argument(
+        "--sweep-queue-sizes", type=int, nargs="+", default=None,
+        help="With --simulate, queue sizes to try, 0 for unbounded (default: --queue-size)"
+    )
+    parser.add_argument(
+        "--simulate-format", type=str, default="table", choices=["table", "json"],
+        help="Output of --simulate: a text table or JSON (default: table)"
+    )
+    parser.add_argument(
+        "--stats-file", type=str, default=None,
+        help="Export scheduler metrics to this file every --stats-interval seconds (default: no export)"
+    )
+    parser.add_argument(
+        "--stats-format", type=str, default="json", choices=EXPORT_FORMATS,
+        help="Format of the metrics export: json or prometheus (text exposition format) (default: json)"
+    )
+    parser.add_argument(
+        "--stats-interval", type=float, default=1.0,
+        help="Seconds between two metrics aggregations and exports (default: 1.0)"
+    )
+    parser.add_argument(
+        "--trace-file", type=str, default=None,
+        help="Record a timeline of producers, queue operations and job execution and write it to this "
+             "file as Chrome trace-event JSON, viewable in chrome://tracing or Perfetto (default: off)"
+    )
     parser.add_argument(
         "--log-level", type=str, default="INFO",
         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
         help="Set the logging level (default: INFO)"
     )
+    parser.add_argument(
+        "--log-mode", type=str, default="sync", choices=["sync", "async"],
+        help="Write log records in the calling thread (sync) or on a background thread (async) (default: sync)"
+    )
+    parser.add_argument(
+        "--log-format", type=str, default="text", choices=["text", "json"],
+        help="Log output format: text or JSON lines (default: text)"
+    )
+    parser.add_argument(
+        "--log-rate-limit", type=int, default=0,
+        help="Maximum number of log records per message per second, 0 for no limit (default: 0)"
+    )
 
     return parser.parse_args()
 
@@ -1,6 +1,13 @@
+import asyncio
+import json
+import signal
 from scheduler.job_manager import JobManager
+from scheduler.async_manager import AsyncJobManager
+from scheduler.simulator import Simulator, format_table
+from scheduler.distributed import run_worker
 from cli.parser import parse_args
-from utils.logger import set_log_level
+from utils.logger import configure_logging, set_log_level
+from utils.tracing import disable_tracing, enable_tracing
 
 def main():
     """
@@ -8,23 +15,124 @@ def main():
     """
     args = parse_args()
 
+    configure_logging(mode=args.log_mode, fmt=args.log_format, rate_limit=args.log_rate_limit)
     set_log_level(args.log_level)
+    if args.trace_file:
+        enable_tracing()
 
-    # Initialize the job manager with CLI arguments
-    job_manager = JobManager(
-        num_producers=args.producers,
-        num_consumers=args.consumers,
-        jobs_per_producer=args.jobs_per_producer,
-        queue_size=args.queue_size,
-        dependency_chance=args.dependency_chance,
-    )
+    if args.simulate:
+        simulate(args)
+        return
 
-    # Start the job scheduler
-    job_manager.start()
+    authkey = args.authkey.encode() if args.authkey is not None else None
+    if args.connect is not None:
+        if authkey is None:
+            raise SystemExit("--connect requires the coordinator's --authkey")
+        run_worker(args.connect, authkey)
+        return
+
+    if args.engine == "asyncio":
+        job_manager = AsyncJobManager(
+            num_producers=args.producers,
+            num_consumers=args.consumers,
+            jobs_per_producer=args.jobs_per_producer,
+            queue_size=args.queue_size,
+            dependency_chance=args.dependency_chance,
+            deadlock_policy=args.deadlock_policy,
+        )
+        asyncio.run(job_manager.start())
+    else:
+        # Initialize the job manager with CLI arguments
+        job_manager = JobManager(
+            num_producers=args.producers,
+            num_consumers=args.consumers,
+            jobs_per_producer=args.jobs_per_producer,
+            queue_size=args.queue_size,
+            dependency_chance=args.dependency_chance,
+            scheduling_policy=args.scheduling_policy,
+            cycle_check=args.cycle_check,
+            deadlock_policy=args.deadlock_policy,
+            backend=args.backend,
+            chunk_size=args.chunk_size,
+            batch_size=args.batch_size,
+            in_flight_per_worker=args.in_flight_per_worker,
+            work_stealing=args.work_stealing,
+            min_consumers=args.min_consumers,
+            max_consumers=args.max_consumers,
+            autoscale_interval=args.autoscale_interval,
+            seed=args.seed,
+            time_scale=args.time_scale,
+            stats_interval=args.stats_interval,
+            stats_path=args.stats_file,
+            stats_format=args.stats_format,
+            source=args.source,
+            journal_path=args.journal,
+            journal_sync=args.journal_sync,
+            journal_snapshot_every=args.journal_snapshot_every,
+            service=args.service,
+            retain_completed=args.retain_completed,
+            dependency_window=args.dependency_window,
+            cache_bytes=int(args.cache_size_mb * 1024 * 1024),
+            cache_dir=args.cache_dir,
+            max_retries=args.max_retries,
+            retry_backoff=args.retry_backoff,
+            job_timeout=args.job_timeout,
+            resources=args.resources,
+            fair_share=args.fair_share,
+            tenant_weights=args.tenant_weights,
+            tenant_rates=args.tenant_rates,
+            tenant_max_in_flight=args.tenant_max_in_flight,
+            listen=args.listen,
+            authkey=authkey,
+            heartbeat_timeout=args.heartbeat_timeout,
+        )
+
+        # Start the job scheduler
+        if args.service:
+            serve(job_manager)
+        else:
+            job_manager.start()
+
+    if args.trace_file:
+        disable_tracing().write(args.trace_file)
 
     # Retrieve and print completed jobs
     completed_jobs = job_manager.get_completed_jobs()
     print(f"\nCompleted jobs: {completed_jobs}")
+    if args.engine != "asyncio":
+        failed_jobs = job_manager.get_failed_jobs()
+        if failed_jobs:
+            print(f"Failed or cancelled jobs: {failed_jobs}")
+
+
+def simulate(args) -> None:
+    """
+    Simulate the workload described by the arguments for every configuration of the sweep and print the predictions.
+
+    Args:
+        - args: Parsed command-line arguments.
+    """
+    options = dict(scheduling_policy=args.scheduling_policy, cycle_check=args.cycle_check,
+                   deadlock_policy=args.deadlock_policy)
+    if args.source is not None:
+        simulator = Simulator.from_manifest(args.source, **options)
+    else:
+        simulator = Simulator.from_generator(args.producers, args.jobs_per_producer, args.dependency_chance,
+                                             seed=args.seed, time_scale=args.time_scale, **options)
+    results = simulator.sweep(args.sweep_consumers or [args.consumers], args.sweep_queue_sizes or [args.queue_size])
+    print(json.dumps(results, indent=2) if args.simulate_format == "json" else format_table(results))
+
+
+def serve(job_manager: JobManager) -> None:
+    """
+    Run the job manager as a service until a termination signal arrives or its producers are done.
+
+    Args:
+        - job_manager: A job manager created with `service=True`.
+    """
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: job_manager.stop())
+    job_manager.serve(stop_when_done=True)
 
 
 if __name__ == "__main__":
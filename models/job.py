@@ -1,14 +1,48 @@
 import time
-import threading
+import asyncio
+from typing import Any, Callable
 from utils.logger import get_logger
+from utils.tracing import trace_span, tracing_enabled
 
 logger = get_logger(__name__)
 
+# Lifecycle states of a job
+PENDING = "pending"
+RUNNING = "running"
+RETRYING = "retrying"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+JOB_STATES = (PENDING, RUNNING, RETRYING, COMPLETED, FAILED, CANCELLED)
+
+
+class JobTimeoutError(Exception):
+    """
+    Raised when a job runs longer than its timeout.
+    """
+
+    def __init__(self, job_id, timeout: float) -> None:
+        super().__init__(f"Job {job_id} exceeded its timeout of {timeout}s")
+        self.job_id = job_id
+        self.timeout = timeout
+
+
 class Job:
     """
     Represents a single unit of work (job) to be scheduled and executed.
+
+    Jobs use `__slots__` and carry no lock of their own: each field is written by one thread at a
+    time, and shared dependency state lives in `DependencyTracker`. See `models.job_table.JobTable`
+    for a columnar store when holding millions of jobs.
     """
-    def __init__(self, job_id: int, execution_time: int, dependencies : list | None =None) -> None:
+    __slots__ = ("job_id", "execution_time", "dependencies", "priority", "func", "args", "pass_results",
+                 "max_retries", "timeout", "resources", "tenant", "state", "attempts", "error",
+                 "is_completed", "submitted_at", "ready_at", "started_at", "finished_at", "result_refs")
+
+    def __init__(self, job_id: int, execution_time: int, dependencies : list | None =None, priority: int = 0,
+                 func: Callable | None = None, args: tuple = (), pass_results: bool = False,
+                 max_retries: int | None = None, timeout: float | None = None,
+                 resources: dict | None = None, tenant: str | None = None) -> None:
         """
         Initialize a Job instance.
 
@@ -16,32 +50,101 @@ class Job:
             - job_id: Unique identifier for the job.
             - execution_time: Estimated time to complete the job.
             - dependencies: List of job IDs that this job depends on
+            - priority: User-assigned priority, higher runs first under the "priority" policy.
+            - func: Optional callable doing the job's work. Without one, the job sleeps for `execution_time`.
+                Must be a module-level function to run on a process backend.
+            - args: Positional arguments passed to `func`.
+            - pass_results: Call `func` with a `results` keyword argument mapping each dependency ID
+                to the value its `func` returned. Large buffers arrive as read-only memoryviews.
+            - max_retries: Number of times the job is retried after failing, or None for the consumer's default.
+            - timeout: Seconds the job may run before it fails with `JobTimeoutError`, or None for the
+                consumer's default. A simulated job stops sleeping at the timeout and a job in a worker
+                process is interrupted; a callable running on a worker thread cannot be interrupted,
+                so it fails once it returns late.
+            - resources: Amount of each resource the job holds while it runs, e.g. {"cpu": 2, "memory": 512},
+                or None. Only enforced by a consumer with a resource capacity (see `scheduler.resources`).
+            - tenant: Who submitted the job, e.g. a producer or a team. A fair-share queue
+                (see `scheduler.fairshare`) shares the workers between tenants; None is the default tenant.
         """
         self.job_id = job_id
         self.execution_time = execution_time
         self.dependencies = dependencies if dependencies else []
+        self.priority = priority
+        self.func = func
+        self.args = args
+        self.pass_results = pass_results
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.resources = resources
+        self.tenant = tenant
+        self.state = PENDING
+        self.attempts = 0
+        self.error = None
         self.is_completed = False
-        self.lock = threading.Lock()
+        self.submitted_at = None
+        self.ready_at = None
+        self.started_at = None
+        self.finished_at = None
+        # Dependencies whose results the job holds a reference on (see `JobQueue.put`), released when it finishes
+        self.result_refs = ()
 
-    def execute(self) -> None:
+    def execute(self, results: dict | None = None) -> Any:
         """
-        Simulate the execution of the job.
-        This method sleeps for `execution_time` seconds to mimic work.
+        Execute the job.
+        Calls `func` if the job has one, otherwise sleeps for `execution_time` seconds to mimic work.
+
+        Args:
+            - results: Results of the job's dependencies, passed to `func` if `pass_results` is set.
+
+        Returns:
+            - The value returned by `func`, or None.
+
+        Raises:
+            - JobTimeoutError: If the job ran longer than its timeout.
         """
-        with self.lock:
-            logger.info(f"Executing job {self.job_id} (Estimated time: {self.execution_time}s)")
-            time.sleep(self.execution_time)
+        with trace_span("Job.execute", "job",
+                        {"job_id": self.job_id, "dependencies": self.dependencies} if tracing_enabled() else None):
+            logger.info("Executing job %s (Estimated time: %ss)", self.job_id, self.execution_time)
+            result = None
+            if self.func is None:
+                if self.timeout is not None and self.execution_time > self.timeout:
+                    time.sleep(self.timeout)
+                    raise JobTimeoutError(self.job_id, self.timeout)
+                time.sleep(self.execution_time)
+            else:
+                start = time.perf_counter()
+                if self.pass_results:
+                    result = self.func(*self.args, results=results or {})
+                else:
+                    result = self.func(*self.args)
+                if self.timeout is not None and time.perf_counter() - start > self.timeout:
+                    raise JobTimeoutError(self.job_id, self.timeout)
             self.is_completed = True
-            logger.info(f"Job {self.job_id} completed.")
+            logger.info("Job %s completed.", self.job_id)
+        return result
     
 
+    async def execute_async(self) -> None:
+        """
+        Execute the job on an event loop.
+        Awaits `func` if it is a coroutine function, otherwise sleeps for `execution_time` seconds without blocking the loop.
+        """
+        logger.info("Executing job %s (Estimated time: %ss)", self.job_id, self.execution_time)
+        if self.func is None:
+            await asyncio.sleep(self.execution_time)
+        elif asyncio.iscoroutinefunction(self.func):
+            await self.func(*self.args)
+        else:
+            self.func(*self.args)
+        self.is_completed = True
+        logger.info("Job %s completed.", self.job_id)
+
     def mark_complete(self) -> None:
         """
-        Mark the job as completed in a thread-safe manner.
+        Mark the job as completed.
         """
-        with self.lock:
-            self.is_completed = True
-            logger.info(f"Job {self.job_id} marked as complete.")
+        self.is_completed = True
+        logger.info("Job %s marked as complete.", self.job_id)
 
     
     def can_execute(self, completed_jobs: set) -> bool:
@@ -54,14 +157,13 @@ class Job:
         Returns: 
             - True if the job can be executed, False otherwise
         """
-        with self.lock:
-            unmet_dependencies = [dep for dep in self.dependencies if dep not in completed_jobs]
-            if unmet_dependencies:
-                logger.warning(
-                    f"Job {self.job_id} cannot execute due to unmet dependencies: {unmet_dependencies}"
-                )
-            return not unmet_dependencies
-            
+        unmet_dependencies = [dep for dep in self.dependencies if dep not in completed_jobs]
+        if unmet_dependencies:
+            logger.warning(
+                "Job %s cannot execute due to unmet dependencies: %s", self.job_id, unmet_dependencies
+            )
+        return not unmet_dependencies
+
     def __repr__(self) -> str:
         return f"<Job id={self.job_id}, completed={self.is_completed}, dependencies={self.dependencies}>"
 
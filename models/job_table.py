@@ -0,0 +1,153 @@
+import sys
+from array import array
+from models.job import Job
+
+class JobTable:
+    """
+    A columnar, array-backed store for very large job sets.
+
+    Job IDs are interned to dense integer rows; each attribute is a typed array indexed by row and
+    dependencies are stored as flat integer arrays, so a job costs a few dozen bytes instead of a
+    full Python object. Dependency checks read the arrays directly and need no per-job lock.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty table.
+        """
+        self.ids = []
+        self.rows = {}
+        self.execution_time = array("d")
+        self.priority = array("l")
+        self.dependency_start = array("q")
+        self.dependency_count = array("l")
+        self.dependency_rows = array("q")
+        self.completed = bytearray()
+        self.submitted = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, job_id) -> bool:
+        row = self.rows.get(job_id)
+        return row is not None and self.submitted[row] == 1
+
+    def intern(self, job_id) -> int:
+        """
+        Get the row of a job ID, reserving one if the ID has not been seen yet.
+
+        Args:
+            - job_id: External job ID.
+
+        Returns:
+            - The job's integer row.
+        """
+        row = self.rows.get(job_id)
+        if row is None:
+            if isinstance(job_id, str):
+                job_id = sys.intern(job_id)
+            row = len(self.ids)
+            self.rows[job_id] = row
+            self.ids.append(job_id)
+            self.execution_time.append(0.0)
+            self.priority.append(0)
+            self.dependency_start.append(0)
+            self.dependency_count.append(0)
+            self.completed.append(0)
+            self.submitted.append(0)
+        return row
+
+    def add(self, job_id, execution_time: float, dependencies: list | tuple = (), priority: int = 0) -> int:
+        """
+        Add a job to the table. Dependencies that are not in the table yet are interned as placeholders.
+
+        Args:
+            - job_id: Unique identifier for the job.
+            - execution_time: Estimated time to complete the job.
+            - dependencies: IDs of the jobs this job depends on.
+            - priority: User-assigned priority.
+
+        Returns:
+            - The job's integer row.
+        """
+        row = self.intern(job_id)
+        if self.submitted[row]:
+            raise ValueError(f"Job {job_id} is already in the table")
+
+        self.execution_time[row] = execution_time
+        self.priority[row] = priority
+        self.dependency_start[row] = len(self.dependency_rows)
+        self.dependency_count[row] = len(dependencies)
+        intern = self.intern
+        self.dependency_rows.extend([intern(dep) for dep in dependencies])
+        self.submitted[row] = 1
+        return row
+
+    def add_job(self, job: Job) -> int:
+        """
+        Add a `Job` instance to the table.
+
+        Args:
+            - job: The job to add.
+
+        Returns:
+            - The job's integer row.
+        """
+        row = self.add(job.job_id, job.execution_time, job.dependencies, job.priority)
+        self.completed[row] = job.is_completed
+        return row
+
+    def dependencies(self, row: int) -> memoryview:
+        """
+        Get the dependency rows of a job without copying.
+
+        Args:
+            - row: The job's row.
+
+        Returns:
+            - A read-only view of the dependency rows.
+        """
+        start = self.dependency_start[row]
+        return memoryview(self.dependency_rows)[start:start + self.dependency_count[row]].toreadonly()
+
+    def can_execute(self, row: int) -> bool:
+        """
+        Check if every dependency of a job has completed.
+
+        Args:
+            - row: The job's row.
+
+        Returns:
+            - True if the job can be executed, False otherwise.
+        """
+        completed = self.completed
+        start = self.dependency_start[row]
+        return all(completed[dep] for dep in self.dependency_rows[start:start + self.dependency_count[row]])
+
+    def mark_complete(self, row: int) -> None:
+        """
+        Mark a job as completed.
+
+        Args:
+            - row: The job's row.
+        """
+        self.completed[row] = 1
+
+    def job(self, row: int) -> Job:
+        """
+        Materialize a `Job` instance from a row, e.g. to hand it to a consumer.
+
+        Args:
+            - row: The job's row.
+
+        Returns:
+            - A new Job with the row's attributes.
+        """
+        ids = self.ids
+        job = Job(
+            ids[row], self.execution_time[row],
+            dependencies=[ids[dep] for dep in self.dependencies(row)],
+            priority=self.priority[row],
+        )
+        job.is_completed = bool(self.completed[row])
+        return job
@@ -0,0 +1,296 @@
+import asyncio
+import random
+import threading
+import time
+from models.job import CANCELLED, COMPLETED, FAILED, Job
+from scheduler.deadlock import DeadlockHandler
+from scheduler.dependency import DependencyTracker
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class AsyncJobQueue:
+    """
+    A bounded `asyncio.Queue` for managing jobs between async producers and consumers.
+    """
+
+    def __init__(self, maxsize: int = 0) -> None:
+        """
+        Initialize an AsyncJobQueue instance with a fixed maximum size.
+
+        Args:
+            - maxsize: Maximum number of jobs that can be stored in the queue.
+        """
+        self.queue = asyncio.Queue(maxsize)
+
+    async def put(self, job: Job) -> None:
+        """
+        Add a job to the queue. Waits if the queue is full.
+
+        Args:
+            - job: Job instance to be added to the queue.
+        """
+        logger.info("Adding job %s to the queue.", job.job_id)
+        job.submitted_at = time.perf_counter()
+        await self.queue.put(job)
+
+    async def get(self) -> Job:
+        """
+        Retrieve a job from the queue. Waits if the queue is empty.
+
+        Returns:
+            - Job instance removed from the queue.
+        """
+        job = await self.queue.get()
+        logger.info("Fetching job %s from the queue.", job.job_id)
+        return job
+
+    def task_done(self) -> None:
+        """
+        Indicate that a previously fetched job has been completed.
+        """
+        self.queue.task_done()
+        logger.info("Job marked as completed in the queue.")
+
+    async def join(self) -> None:
+        """
+        Wait until every job put on the queue has been completed.
+        """
+        await self.queue.join()
+
+
+class AsyncProducer:
+    """
+    A producer coroutine that generates jobs and adds them to a shared async queue.
+    """
+
+    def __init__(self, queue: AsyncJobQueue, job_count: int, producer_id: int, max_execution_time: int = 1,
+                 dependency_chance: float = 0.3) -> None:
+        """
+        Initialize the producer.
+
+        Args:
+            - queue: The shared job queue.
+            - job_count: Number of jobs to produce.
+            - producer_id: Unique identifier for this producer.
+            - max_execution_time: Maximum simulated execution time for a job.
+            - dependency_chance: Probability of a job having dependencies.
+        """
+        self.queue = queue
+        self.job_count = job_count
+        self.producer_id = producer_id
+        self.max_execution_time = max_execution_time
+        self.dependency_chance = dependency_chance
+        self.created_jobs = []
+        self.generated_jobs = []
+
+    async def run(self) -> None:
+        """
+        Generate jobs and add them to the queue.
+        """
+        for i in range(self.job_count):
+            job_id = f"Producer-{self.producer_id}-Job-{i}"
+            execution_time = random.randint(1, self.max_execution_time)
+
+            dependencies = []
+            if self.created_jobs and random.random() < self.dependency_chance:
+                dependencies = random.sample(self.created_jobs, k=random.randint(1, len(self.created_jobs)))
+
+            job = Job(job_id=job_id, execution_time=execution_time, dependencies=dependencies)
+            await self.queue.put(job)
+
+            logger.info("Producer %s created %s", self.producer_id, job)
+            self.created_jobs.append(job_id)
+            self.generated_jobs.append(job)
+
+            await asyncio.sleep(random.uniform(0.1, 0.5))  # Simulate time between job production
+
+
+class AsyncConsumer:
+    """
+    A pool of worker tasks that fetch and process jobs on the event loop.
+    """
+
+    def __init__(self, queue: AsyncJobQueue, num_workers: int, completed_jobs: set, completed_jobs_lock: threading.Lock) -> None:
+        """
+        Initialize the consumer pool.
+
+        Args:
+            - queue: The shared job queue.
+            - num_workers: Number of worker tasks, i.e. the maximum number of jobs in flight.
+            - completed_jobs: Shared set of completed job IDs.
+            - completed_jobs_lock: Lock for accessing the completed jobs set.
+        """
+        self.queue = queue
+        self.num_workers = num_workers
+        self.completed_jobs = completed_jobs
+        self.tracker = DependencyTracker(completed_jobs, completed_jobs_lock)
+        self.ready = asyncio.Queue()
+        self.tasks = []
+        self.failures = {}
+
+    async def process_job(self, job: Job) -> None:
+        """
+        Process a single ready job and dispatch the dependents it releases.
+        If the job fails, every job depending on it, directly or not, is cancelled.
+
+        Args:
+            - job: The job to process.
+        """
+        try:
+            job.started_at = time.perf_counter()
+            await job.execute_async()
+            job.state = COMPLETED
+            for dependent in self.tracker.complete(job.job_id):
+                self.ready.put_nowait(dependent)
+
+        except Exception as e:
+            job.state = FAILED
+            job.error = f"{type(e).__name__}: {e}"
+            self.failures[job.job_id] = job.error
+            logger.error("Error processing job %s: %s", job.job_id, e)
+            self.cancel(self.tracker.fail(job.job_id), f"dependency {job.job_id} failed")
+
+        finally:
+            self.queue.task_done()
+
+    def cancel(self, jobs: list[Job], reason: str) -> None:
+        """
+        Account for jobs cancelled because a job they depend on failed, so that `queue.join()` returns.
+
+        Args:
+            - jobs: The cancelled jobs, taken off the queue earlier.
+            - reason: Why they were cancelled.
+        """
+        for job in jobs:
+            job.error = f"cancelled: {reason}"
+            self.failures[job.job_id] = job.error
+            self.queue.task_done()
+
+    def release(self, job_ids: set) -> None:
+        """
+        Re-evaluate blocked jobs whose dependencies were rewritten and dispatch the ready ones.
+
+        Args:
+            - job_ids: IDs of the jobs whose dependency lists changed.
+        """
+        for job in self.tracker.refresh(job_ids):
+            self.ready.put_nowait(job)
+
+    async def worker(self) -> None:
+        """
+        Run ready jobs one after another.
+        """
+        while True:
+            job = await self.ready.get()
+            await self.process_job(job)
+
+    async def start(self) -> None:
+        """
+        Start the worker tasks and consume jobs from the queue.
+        Jobs with unmet dependencies are parked in the tracker until they become ready;
+        jobs depending on a failed job are cancelled.
+        """
+        self.tasks = [asyncio.create_task(self.worker()) for _ in range(self.num_workers)]
+        while True:
+            job = await self.queue.get()
+            if self.tracker.add(job):
+                self.ready.put_nowait(job)
+            elif job.state == CANCELLED:
+                self.cancel([job], "a dependency failed")
+
+    async def shutdown(self) -> None:
+        """
+        Cancel the worker tasks.
+        """
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        logger.info("Consumer pool has been shut down.")
+
+
+class AsyncJobManager:
+    """
+    Asyncio variant of `JobManager` for I/O-bound jobs: producers, consumers and jobs are coroutines
+    on one event loop, so jobs in flight do not each occupy an OS thread.
+    """
+
+    def __init__(self, num_producers: int, num_consumers: int, jobs_per_producer: int, queue_size: int,
+                 dependency_chance: float, deadlock_policy: str = "newest") -> None:
+        """
+        Initialize the AsyncJobManager with the required components.
+
+        Args:
+            - num_producers: Number of producer coroutines.
+            - num_consumers: Number of worker tasks.
+            - jobs_per_producer: Number of jobs each producer will generate.
+            - queue_size: Maximum size of the job queue.
+            - dependency_chance: Chance of jobs having dependencies.
+            - deadlock_policy: Which edge of a dependency cycle to remove ("newest", "lowest-priority" or "cheapest").
+        """
+        self.num_producers = num_producers
+        self.num_consumers = num_consumers
+        self.jobs_per_producer = jobs_per_producer
+        self.queue_size = queue_size
+        self.dependency_chance = dependency_chance
+        self.deadlock_policy = deadlock_policy
+        self.completed_jobs = set()
+        self.completed_jobs_lock = threading.Lock()
+        self.all_jobs = []
+
+    async def start(self) -> None:
+        """
+        Start the producers and consumers and wait until every job completed.
+        """
+        logger.info("Starting async job scheduler...")
+
+        # The queue and consumer are created here so they bind to the running event loop
+        self.queue = AsyncJobQueue(maxsize=self.queue_size)
+        self.consumer = AsyncConsumer(
+            self.queue, num_workers=self.num_consumers, completed_jobs=self.completed_jobs,
+            completed_jobs_lock=self.completed_jobs_lock
+        )
+        producers = [
+            AsyncProducer(self.queue, self.jobs_per_producer, producer_id=i, max_execution_time=random.randint(1, 3),
+                          dependency_chance=self.dependency_chance)
+            for i in range(self.num_producers)
+        ]
+
+        consumer_task = asyncio.create_task(self.consumer.start())
+        logger.info("Consumer pool started.")
+
+        await asyncio.gather(*(producer.run() for producer in producers))
+        for producer in producers:
+            logger.info("Producer-%s finished.", producer.producer_id)
+            self.all_jobs.extend(producer.generated_jobs)
+
+        deadlocked_jobs = DeadlockHandler.detect_deadlock(self.all_jobs)
+        if deadlocked_jobs:
+            removed = DeadlockHandler.break_cycles(self.all_jobs, self.deadlock_policy)
+            self.consumer.release({job_id for _, job_id in removed})
+
+        await self.queue.join()
+
+        consumer_task.cancel()
+        await asyncio.gather(consumer_task, return_exceptions=True)
+        await self.consumer.shutdown()
+        logger.info("Async job scheduler completed.")
+
+    def get_completed_jobs(self):
+        """
+        Get a list of all completed jobs.
+
+        Returns:
+            A sorted list of completed job IDs.
+        """
+        with self.completed_jobs_lock:
+            return sorted(self.completed_jobs)
+
+    def get_failed_jobs(self) -> dict:
+        """
+        Get the jobs that failed or were cancelled because a dependency failed.
+
+        Returns:
+            - Dictionary mapping each job ID to its error.
+        """
+        return dict(self.consumer.failures)
@@ -0,0 +1,168 @@
+import math
+import threading
+import time
+from collections import deque
+from scheduler.consumer import Consumer
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Autoscaler(threading.Thread):
+    """
+    Background thread that grows and shrinks a consumer pool between `min_workers` and `max_workers`.
+
+    Every `interval` it samples the backlog (jobs on the intake queue plus ready jobs waiting for a
+    worker), the utilization of the workers since the last sample and the mean time ready jobs waited
+    for a worker. The pool grows when there is a backlog and the workers are busy or jobs wait longer
+    than `max_wait`; it shrinks when there is no backlog and utilization stayed below half of
+    `target_utilization` for `scale_down_after` samples in a row. The gap between the two thresholds,
+    the consecutive samples and a cooldown after every change keep the pool from flapping.
+    """
+
+    def __init__(self, consumer: Consumer, min_workers: int, max_workers: int, interval: float = 0.5,
+                 target_utilization: float = 0.75, max_wait: float = 0.05, scale_down_after: int = 3,
+                 cooldown: int = 1) -> None:
+        """
+        Initialize the autoscaler.
+
+        Args:
+            - consumer: The pool to resize, created with `max_workers` of at least `max_workers`.
+                Must be `resizable`.
+            - min_workers: Smallest pool size.
+            - max_workers: Largest pool size.
+            - interval: Seconds between two samples.
+            - target_utilization: Utilization the pool is sized for when it shrinks.
+            - max_wait: Mean seconds ready jobs may wait for a worker before the pool grows.
+            - scale_down_after: Number of consecutive idle samples before the pool shrinks.
+            - cooldown: Number of samples skipped after every change.
+        """
+        super().__init__(name="Autoscaler", daemon=True)
+        if not consumer.resizable:
+            raise ValueError(f"{type(consumer).__name__} pools cannot be resized")
+        if not 0 < min_workers <= max_workers <= consumer.max_workers:
+            raise ValueError(f"Invalid autoscaling bounds {min_workers}-{max_workers} "
+                             f"for a pool of at most {consumer.max_workers} workers")
+        self.consumer = consumer
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.interval = interval
+        self.target_utilization = target_utilization
+        self.max_wait = max_wait
+        self.scale_down_after = scale_down_after
+        self.cooldown = cooldown
+        self.idle_samples = 0
+        self.cooldown_left = 0
+        self.scale_up_count = 0
+        self.scale_down_count = 0
+        self.decisions = deque(maxlen=100)
+        self.last = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        self.last = self.sample()
+        while not self.stopped.wait(self.interval):
+            try:
+                self.step()
+            except Exception as e:
+                logger.error("Autoscaler error: %s", e)
+
+    def sample(self) -> dict:
+        """
+        Read the pool's cumulative counters.
+        """
+        stats = self.consumer.stats
+        stats.aggregate()
+        with stats.lock:
+            queue_wait = stats.histograms["queue_wait"]
+            return {
+                "time": time.perf_counter(),
+                "busy": stats.busy_time,
+                "wait_sum": queue_wait.sum,
+                "wait_count": queue_wait.count,
+            }
+
+    def step(self) -> None:
+        """
+        Take a sample and resize the pool if needed.
+        """
+        current = self.sample()
+        last, self.last = self.last, current
+        workers = self.consumer.num_workers
+        metrics = self.consumer.metrics()
+        elapsed = current["time"] - last["time"]
+
+        # Jobs still running have not been credited as busy time yet; count them at least as busy now
+        busy = max((current["busy"] - last["busy"]) / elapsed if elapsed > 0 else 0.0,
+                   metrics["in_flight"] / self.consumer.in_flight_per_worker)
+        utilization = min(1.0, busy / workers)
+        waited = current["wait_count"] - last["wait_count"]
+        wait = (current["wait_sum"] - last["wait_sum"]) / waited if waited else 0.0
+        backlog = self.consumer.queue.queue.qsize() + metrics["ready"]
+
+        if self.cooldown_left:
+            self.cooldown_left -= 1
+            return
+
+        target = workers
+        if backlog and (utilization >= self.target_utilization or wait > self.max_wait):
+            self.idle_samples = 0
+            # Grow by the backlog, at most doubling per step
+            target = min(self.max_workers, workers + max(1, min(workers, backlog)))
+        elif not backlog and utilization < self.target_utilization / 2:
+            self.idle_samples += 1
+            if self.idle_samples >= self.scale_down_after:
+                # Size the pool for the target utilization, at most halving per step
+                target = max(self.min_workers, math.ceil(busy / self.target_utilization), workers // 2)
+        else:
+            self.idle_samples = 0
+
+        if target != workers:
+            self.resize(target, f"backlog {backlog}, utilization {utilization:.2f}, wait {wait * 1000:.1f}ms")
+
+    def resize(self, target: int, reason: str) -> None:
+        """
+        Resize the pool and record the decision.
+
+        Args:
+            - target: The new number of workers.
+            - reason: The signals that triggered the decision.
+        """
+        workers = self.consumer.num_workers
+        self.consumer.resize(target)
+        self.idle_samples = 0
+        self.cooldown_left = self.cooldown
+        with self.lock:
+            if target > workers:
+                self.scale_up_count += 1
+            else:
+                self.scale_down_count += 1
+            self.decisions.append({"time": time.time(), "from": workers, "to": target, "reason": reason})
+        logger.info("Autoscaler: %s -> %s workers (%s).", workers, target, reason)
+
+    def metrics(self) -> dict:
+        """
+        Get autoscaling metrics.
+
+        Returns:
+            - Dictionary with the current number of workers, the bounds, the number of times the pool
+                grew and shrank, and the most recent decisions.
+        """
+        with self.lock:
+            return {
+                "workers": self.consumer.num_workers,
+                "min_workers": self.min_workers,
+                "max_workers": self.max_workers,
+                "scale_ups": self.scale_up_count,
+                "scale_downs": self.scale_down_count,
+                "decisions": list(self.decisions)[-10:],
+            }
+
+    def stop(self) -> None:
+        """
+        Stop the thread.
+        """
+        self.stopped.set()
+        if self.is_alive():
+            self.join()
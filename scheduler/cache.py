@@ -0,0 +1,212 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any
+from models.job import Job
+from scheduler.results import SharedResult, attach, detach
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def func_path(job: Job) -> str:
+    """
+    Get the import path of a job's callable.
+    """
+    return f"{job.func.__module__}:{job.func.__qualname__}"
+
+
+class ResultCache:
+    """
+    Content-addressed cache of job results, for deterministic jobs resubmitted with the same inputs.
+
+    A job is keyed on its callable, its arguments and the digests of its dependencies' results, so a
+    job whose inputs changed upstream misses even if its own arguments are the same. Results are
+    pickled once; the pickles are kept in an in-memory LRU bounded by their total size and, with a
+    `path`, written to disk, where they survive restarts. A memory miss found on disk is promoted.
+    Jobs without a callable (simulated work) or with arguments that cannot be pickled are not cached.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, path: str | None = None) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            - max_bytes: Maximum total size of the pickled results kept in memory.
+            - path: Directory of the on-disk cache, created if needed, or None to keep results in memory only.
+        """
+        self.max_bytes = max_bytes
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hit_count = 0
+        self.disk_hit_count = 0
+        self.miss_count = 0
+        self.eviction_count = 0
+        self.saved_seconds = 0.0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def key(self, job: Job, dep_digests: list[str] | None) -> str | None:
+        """
+        Compute the cache key of a job.
+
+        Args:
+            - job: The job about to run.
+            - dep_digests: Digests of its dependencies' results, in order (see `ResultStore.digests_of`).
+
+        Returns:
+            - Hex digest, or None if the job cannot be cached.
+        """
+        if job.func is None or dep_digests is None:
+            return None
+        try:
+            data = pickle.dumps((func_path(job), job.args, job.pass_results, dep_digests))
+        except Exception as e:
+            logger.debug("Job %s is not cacheable: %s", job.job_id, e)
+            return None
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, key: str) -> tuple[Any, str] | None:
+        """
+        Look up a result and count a hit or a miss.
+
+        Args:
+            - key: Key returned by `key`.
+
+        Returns:
+            - A (result, digest) pair, or None on a miss.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+        if entry is None and self.path is not None:
+            entry = self._read(key)
+            if entry is not None:
+                with self.lock:
+                    self.disk_hit_count += 1
+                    self._insert(key, entry)
+
+        with self.lock:
+            if entry is None:
+                self.miss_count += 1
+                return None
+            self.hit_count += 1
+            self.saved_seconds += entry[2]
+
+        payload, digest, _ = entry
+        return self._load(payload), digest
+
+    def put(self, key: str, value: Any, seconds: float = 0.0) -> str | None:
+        """
+        Store the result of a job that ran.
+
+        Args:
+            - key: Key returned by `key`.
+            - value: The job's result, or a `SharedResult` handle created by a worker process.
+            - seconds: Time the job took, counted as saved on every later hit.
+
+        Returns:
+            - Digest of the result, or None if it cannot be pickled.
+        """
+        try:
+            payload = self._dump(value)
+        except Exception as e:
+            logger.debug("Result of key %s is not cacheable: %s", key, e)
+            return None
+        digest = hashlib.sha256(payload).hexdigest()
+        entry = (payload, digest, seconds)
+        with self.lock:
+            self._insert(key, entry)
+        if self.path is not None:
+            self._write(key, entry)
+        return digest
+
+    def metrics(self) -> dict:
+        """
+        Get cache metrics.
+
+        Returns:
+            - Dictionary with the hits (and how many were found on disk), misses, hit ratio, entries and
+                bytes in memory, evictions, and the execution seconds saved by hits.
+        """
+        with self.lock:
+            lookups = self.hit_count + self.miss_count
+            return {
+                "hits": self.hit_count,
+                "disk_hits": self.disk_hit_count,
+                "misses": self.miss_count,
+                "hit_ratio": self.hit_count / lookups if lookups else 0.0,
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "evictions": self.eviction_count,
+                "saved_seconds": self.saved_seconds,
+            }
+
+    def _insert(self, key: str, entry: tuple) -> None:
+        """
+        Add an entry to the LRU and evict the least recently used ones beyond `max_bytes`.
+        Must be called with the lock held.
+        """
+        if len(entry[0]) > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old[0])
+        self.entries[key] = entry
+        self.size += len(entry[0])
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted[0])
+            self.eviction_count += 1
+
+    @staticmethod
+    def _dump(value: Any) -> bytes:
+        if isinstance(value, SharedResult):
+            segment, view = attach(value)
+            try:
+                value = ("shared", view.format, view.shape, view.tobytes())
+            finally:
+                detach(segment, view)
+        else:
+            value = ("value", value)
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _load(payload: bytes) -> Any:
+        value = pickle.loads(payload)
+        if value[0] == "shared":
+            _, fmt, shape, data = value
+            return memoryview(data).cast(fmt, shape)
+        return value[1]
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def _read(self, key: str) -> tuple | None:
+        try:
+            with open(self._file(key), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", key, e)
+            return None
+
+    def _write(self, key: str, entry: tuple) -> None:
+        """
+        Write an entry atomically, so that a concurrent reader or a crash never sees half of it.
+        """
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write cache entry %s: %s", key, e)
@@ -1,8 +1,16 @@
-from queue import Queue
-from threading import Lock
-from concurrent.futures import ThreadPoolExecutor
-from models.job import Job
+import time
+from queue import Empty, Queue
+from threading import Condition, Lock
+from typing import Any
+from models.job import CANCELLED, COMPLETED, FAILED, PENDING, RETRYING, RUNNING, Job, JobTimeoutError
+from scheduler.cache import ResultCache
+from scheduler.dependency import DependencyTracker
+from scheduler.executors import create_backend
+from scheduler.metrics import JobStats
+from scheduler.resources import ResourcePool
+from scheduler.retry import RetryTimer, backoff_delay
 from utils.logger import get_logger
+from utils.tracing import trace_span, tracing_enabled
 
 logger = get_logger(__name__)
 
@@ -11,7 +19,14 @@ class Consumer:
     A consumer pool that fetches and processes jobs from the shared queue.
     """
 
-    def __init__(self, queue: Queue, num_workers: int, completed_jobs: set, completed_jobs_lock: Lock) -> None:
+    # Whether `resize` can change the number of workers of a running pool (see `Autoscaler`)
+    resizable = True
+
+    def __init__(self, queue: Queue, num_workers: int, completed_jobs: set, completed_jobs_lock: Lock,
+                 backend: str = "threads", chunk_size: int = 1, batch_size: int = 1,
+                 in_flight_per_worker: int = 1, cache: ResultCache | None = None, max_workers: int | None = None,
+                 max_retries: int = 0, retry_backoff: float = 0.1, max_backoff: float = 30.0,
+                 timeout: float | None = None, resources: dict | None = None) -> None:
         """
         Initialize the consumer pool.
 
@@ -20,52 +35,560 @@ class Consumer:
             - num_workers: Number of worker threads.
             - completed_jobs: Shared set of completed job IDs.
             - completed_jobs_lock: Lock for accessing the completed jobs set.
+            - backend: Where jobs execute: "threads", "processes" or "hybrid" (see `scheduler.executors`).
+            - chunk_size: Maximum number of ready jobs shipped to a worker process at once.
+            - batch_size: Maximum number of jobs drained from the queue at once.
+            - in_flight_per_worker: Credits per worker. No new job is taken off the queue while
+                `num_workers * in_flight_per_worker` jobs are in flight, so the queue bound applies.
+            - cache: Cache of job results. A job found in it completes without running, or None to run every job.
+            - max_workers: Largest number of workers the pool can be resized to (see `resize`);
+                defaults to `num_workers`.
+            - max_retries: Number of retries of a failed job that does not set `Job.max_retries`.
+            - retry_backoff: Seconds before the first retry; the delay doubles with every attempt.
+            - max_backoff: Maximum seconds between two attempts.
+            - timeout: Timeout of jobs that do not set `Job.timeout`, or None for no timeout.
+            - resources: Capacity of each resource jobs may require (see `Job.resources`), e.g.
+                {"cpu": 4, "memory": 8192}. Ready jobs are then packed against it by a `ResourcePool`
+                instead of running in policy order. None ignores job requirements.
         """
         self.queue = queue
         self.num_workers = num_workers
         self.completed_jobs = completed_jobs
         self.completed_jobs_lock = completed_jobs_lock
-        self.executor = ThreadPoolExecutor(max_workers=num_workers)
+        self.tracker = DependencyTracker(completed_jobs, completed_jobs_lock)
+        self.ready = queue.ready_queue()
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.max_workers = max(num_workers, max_workers or 0)
+        self.in_flight_per_worker = in_flight_per_worker
+        self.backend = create_backend(backend, self.max_workers)
+        self.executor = self.backend.executor
+        self.max_in_flight = num_workers * in_flight_per_worker
+        self.in_flight = 0
+        self.flow = Condition()
+        self.credit_wait_time = 0.0
+        self.queue_wait_time = 0.0
+        self.stats = JobStats(num_workers)
+        self.results = queue.results
+        self.cache = cache
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.retry_timer = RetryTimer()
+        self.failures = {}
+        # A long-running scheduler keeps as many failures for reporting as its completion window
+        self.retain_failures = self.tracker.window.failed.maxlen if self.tracker.window is not None else None
+        self.pool = ResourcePool(resources) if resources else None
+        queue.reject_listeners.append(self.reject)
 
     def process_job(self, job: Job) -> None:
         """
         Process a single job. This function is run by worker threads.
+        Only ready jobs reach this point; dependents released by the job are dispatched directly.
         
         Args:
             - job: The job to process.
         """
+        with trace_span("Consumer.process_job", args={"job_id": job.job_id} if tracing_enabled() else None):
+            done = True
+            try:
+                job.state = RUNNING
+                key, cached = self.lookup(job)
+                if cached is None:
+                    start = time.perf_counter()
+                    try:
+                        result = job.execute(self.results.inputs(job) if job.pass_results else None)
+                    except Exception as e:
+                        done = self.fail(job, f"{type(e).__name__}: {e}")
+                        return
+                    digest = self.cache.put(key, result, time.perf_counter() - start) if key else None
+                    cached = (result, digest)
+                self.finish(job, *cached)
+
+            except Exception as e:
+                logger.error("Error processing job %s: %s", job.job_id, e)
+
+            finally:
+                if done:
+                    self.results.release(job.result_refs)
+                    self.queue.done([job])
+
+    def process_chunk(self, jobs: list[Job]) -> None:
+        """
+        Run a chunk of jobs on the execution backend and record their completion.
+        This function is run by worker threads.
+
+        Args:
+            - jobs: The jobs to process.
+        """
+        keys = []
+        for job in jobs:
+            job.state = RUNNING
+        if self.cache:
+            misses = []
+            for job in jobs:
+                try:
+                    key, cached = self.lookup(job)
+                except Exception as e:
+                    key, cached = None, None
+                    logger.error("Error looking up job %s in the cache: %s", job.job_id, e)
+                if cached is None:
+                    misses.append(job)
+                    keys.append(key)
+                    continue
+                try:
+                    self.finish(job, *cached)
+                except Exception as e:
+                    logger.error("Error processing job %s: %s", job.job_id, e)
+                finally:
+                    self.results.release(job.result_refs)
+                    self.queue.done([job])
+            jobs = misses
+            if not jobs:
+                return
+
+        inputs = None
+        if any(job.pass_results for job in jobs):
+            # Shared results travel as handles and are mapped by the worker process
+            inputs = [self.results.inputs(job, local=False) if job.pass_results else None for job in jobs]
+        start = time.perf_counter()
+        with trace_span("Consumer.run_chunk",
+                        args={"job_ids": [job.job_id for job in jobs]} if tracing_enabled() else None):
+            outcomes = self.backend.run_chunk(jobs, inputs)
+        self.complete_chunk(jobs, outcomes, keys, (time.perf_counter() - start) / len(jobs))
+
+    def complete_chunk(self, jobs: list[Job], outcomes: list[tuple[str | None, Any]], keys: list | None = None,
+                       seconds: float = 0.0) -> None:
+        """
+        Record the outcomes of jobs that ran outside the worker thread: complete the successful ones
+        and fail or retry the others.
+
+        Args:
+            - jobs: The jobs that ran.
+            - outcomes: One (error, result) pair per job: error is None on success, otherwise the error message.
+            - keys: Cache key of each job (None if it is not cacheable), or None without a cache.
+            - seconds: Running time per job, recorded with cached results.
+        """
+        done = []
         try:
-            if not job.can_execute(self.completed_jobs):
-                logger.warning(f"Job {job.job_id} skipped due to unmet dependencies.")
-                self.queue.put(job)  # Re-queue the job for later processing
+            for i, (job, (error, result)) in enumerate(zip(jobs, outcomes)):
+                try:
+                    if error is not None:
+                        if self.fail(job, error):
+                            done.append(job)
+                        continue
+
+                    done.append(job)
+                    job.is_completed = True
+                    key = keys[i] if keys else None
+                    self.finish(job, result, self.cache.put(key, result, seconds) if key else None)
+
+                except Exception as e:
+                    logger.error("Error processing job %s: %s", job.job_id, e)
+
+        finally:
+            for job in done:
+                self.results.release(job.result_refs)
+            if done:
+                self.queue.done(done)
+
+    def fail(self, job: Job, error: str, retry: bool = True) -> bool:
+        """
+        Record a failed attempt. The job is retried after an exponential backoff while it has retries
+        left; otherwise it fails for good and every job depending on it, directly or not, is cancelled.
+
+        Args:
+            - job: The job that raised or timed out.
+            - error: The error message.
+            - retry: False to fail the job for good, e.g. when retrying cannot help.
+
+        Returns:
+            - True if the job failed for good, False if a retry is scheduled.
+        """
+        job.finished_at = time.perf_counter()
+        job.attempts += 1
+        job.error = error
+        if error.startswith(JobTimeoutError.__name__):
+            self.stats.record_timeout(job)
+
+        max_retries = self.max_retries if job.max_retries is None else job.max_retries
+        if retry and job.attempts <= max_retries:
+            job.state = RETRYING
+            delay = backoff_delay(job.attempts, self.retry_backoff, self.max_backoff)
+            logger.warning("Job %s failed (attempt %s of %s), retrying in %.2fs: %s",
+                           job.job_id, job.attempts, max_retries + 1, delay, error)
+            self.stats.record_retry(job)
+            self.retry_timer.schedule(delay, self.retry, job)
+            return False
+
+        job.state = FAILED
+        self.stats.record_failure(job)
+        self.record_failure(job, error)
+        logger.error("Error processing job %s: %s", job.job_id, error)
+        self.cancel(self.tracker.fail(job.job_id), f"dependency {job.job_id} failed")
+        return True
+
+    def retry(self, job: Job) -> None:
+        """
+        Dispatch a job again once its backoff has elapsed. Called on the retry timer thread.
+
+        Args:
+            - job: The job to retry.
+        """
+        job.state = PENDING
+        self.dispatch(job)
+
+    def cancel(self, jobs: list[Job], reason: str) -> None:
+        """
+        Account for jobs cancelled because a job they depend on failed, so that `queue.join()` returns.
+
+        Args:
+            - jobs: The cancelled jobs, taken off the queue earlier.
+            - reason: Why they were cancelled.
+        """
+        if not jobs:
+            return
+        for job in jobs:
+            job.error = f"cancelled: {reason}"
+            self.record_failure(job, job.error)
+            self.results.release(job.result_refs)
+        self.stats.record_cancel(len(jobs))
+        self.queue.done(jobs)
+
+    def reject(self, job: Job, error: Exception) -> None:
+        """
+        Fail a job rejected on submission for closing a dependency cycle, and cancel every job
+        depending on it, whether it was submitted before or is submitted later.
+
+        Args:
+            - job: The rejected job, which was never queued.
+            - error: Why it was rejected.
+        """
+        job.state = FAILED
+        job.error = f"{type(error).__name__}: {error}"
+        self.record_failure(job, job.error)
+        self.cancel(self.tracker.fail(job.job_id), f"dependency {job.job_id} was rejected")
+
+    def record_failure(self, job: Job, error: str) -> None:
+        """
+        Report a job that failed for good or was cancelled, and drop its queue state.
+        A long-running scheduler only keeps its most recent failures.
+
+        Args:
+            - job: The failed or cancelled job.
+            - error: The error message.
+        """
+        self.failures[job.job_id] = error
+        if self.retain_failures is not None and len(self.failures) > self.retain_failures:
+            del self.failures[next(iter(self.failures))]
+        self.queue.retire(job.job_id, completed=False)
+
+    def admit(self, jobs: list[Job]) -> list[Job]:
+        """
+        Register jobs taken off the queue with the dependency tracker, applying the default timeout.
+        Jobs depending on a failed job are cancelled right away.
+
+        Args:
+            - jobs: The jobs taken off the queue.
+
+        Returns:
+            - List of the jobs that are ready to run; the others were parked or cancelled.
+        """
+        if self.timeout is not None:
+            for job in jobs:
+                if job.timeout is None:
+                    job.timeout = self.timeout
+        ready = self.tracker.add_many(jobs)
+        if len(ready) < len(jobs):
+            self.cancel([job for job in jobs if job.state == CANCELLED], "a dependency failed")
+            ready_ids = {id(job) for job in ready}
+            self.queue.parked([job for job in jobs if job.state != CANCELLED and id(job) not in ready_ids])
+        return ready
+
+    def lookup(self, job: Job) -> tuple[str | None, tuple | None]:
+        """
+        Look a ready job up in the result cache.
+
+        Args:
+            - job: The job about to run.
+
+        Returns:
+            - The job's cache key (None if it is not cacheable or there is no cache) and,
+                on a hit, the cached (result, digest) pair, otherwise None.
+        """
+        if self.cache is None:
+            return None, None
+        key = self.cache.key(job, self.results.digests_of(job.dependencies))
+        if key is None:
+            return None, None
+        cached = self.cache.get(key)
+        if cached is not None:
+            job.is_completed = True
+            logger.info("Job %s completed from the cache.", job.job_id)
+        return key, cached
+
+    def finish(self, job: Job, result=None, digest: str | None = None) -> None:
+        """
+        Record a completed job and its result, and dispatch the dependents it releases.
+
+        Args:
+            - job: The job that completed.
+            - result: The value returned by the job, kept for dependents until they have finished.
+            - digest: Content digest of the result, if the job is cacheable.
+        """
+        job.state = COMPLETED
+        job.finished_at = time.perf_counter()
+        self.stats.record(job)
+        self.results.put(job.job_id, result, digest)
+        self.queue.retire(job.job_id)
+        for dependent in self.tracker.complete(job.job_id):
+            self.dispatch(dependent)
+
+    def dispatch(self, job: Job) -> None:
+        """
+        Hand a ready job to the worker pool.
+        The job waits in the ready queue and is picked by policy once a worker is free.
+        A new worker loop is started only if a credit is available; otherwise a running loop picks the job up.
+
+        Args:
+            - job: The job to run.
+        """
+        if job.ready_at is None:
+            job.ready_at = time.perf_counter()
+            self.queue.started(job)
+        if self.pool is None:
+            self.ready.put(job)
+        else:
+            reason = self.pool.check(job)
+            if reason is not None:
+                self.fail(job, f"ResourceError: {reason}", retry=False)
+                self.results.release(job.result_refs)
+                self.queue.done([job])
                 return
+        with self.flow:
+            if self.pool is not None:
+                self.pool.submit(job)
+            if self.in_flight < self.max_in_flight:
+                self.in_flight += 1
+                self.executor.submit(self.run_worker)
 
-            job.execute()
+    def run_worker(self) -> None:
+        """
+        Process ready jobs until none is left, then return the credit. This function is run by worker threads.
+        """
+        while True:
+            with self.flow:
+                try:
+                    # A pool that shrank retires its surplus workers as they finish a job
+                    if self.in_flight > self.max_in_flight:
+                        raise Empty
+                    job = self.take_ready()
+                except Empty:
+                    self.in_flight -= 1
+                    self.flow.notify()
+                    return
+            try:
+                job.started_at = time.perf_counter()
+                self.run_next(job)
+            except Exception as e:
+                logger.error("Error processing job %s: %s", job.job_id, e)
 
-            with self.completed_jobs_lock:
-                self.completed_jobs.add(job.job_id)
+    def run_next(self, job: Job) -> None:
+        """
+        Process a ready job taken off the ready queue, then return the resources it held.
+        Jobs executed by worker processes are shipped in chunks of up to `chunk_size`.
 
-        except Exception as e:
-            logger.error(f"Error processing job {job.job_id}: {e}")
+        Args:
+            - job: The highest-ranked ready job.
+        """
+        if not self.backend.is_remote(job):
+            try:
+                self.process_job(job)
+            finally:
+                self.release_resources([job])
+            return
 
+        chunk = [job]
+        while len(chunk) < self.chunk_size:
+            try:
+                job = self.take_ready()
+            except Empty:
+                break
+            if not self.backend.is_remote(job):
+                self.release_resources([job])
+                self.dispatch(job)
+                break
+            job.started_at = time.perf_counter()
+            chunk.append(job)
+        try:
+            self.process_chunk(chunk)
         finally:
-            self.queue.task_done()
+            self.release_resources(chunk)
+
+    def resize(self, num_workers: int) -> None:
+        """
+        Change the number of workers. Extra credits start worker loops for the jobs already waiting
+        to run and let the dispatcher take more jobs right away; after shrinking, workers beyond the
+        new size finish their current job and stop.
+
+        Args:
+            - num_workers: The new number of workers, at most `max_workers`.
+        """
+        if not 0 < num_workers <= self.max_workers:
+            raise ValueError(f"Cannot resize the pool to {num_workers} workers (max {self.max_workers})")
+        with self.flow:
+            self.num_workers = num_workers
+            self.max_in_flight = num_workers * self.in_flight_per_worker
+            waiting = self.ready.qsize() if self.pool is None else len(self.pool.waiting)
+            for _ in range(min(self.max_in_flight - self.in_flight, waiting)):
+                self.in_flight += 1
+                self.executor.submit(self.run_worker)
+            self.flow.notify_all()
+        self.stats.resize(num_workers)
+
+    def take_ready(self) -> Job:
+        """
+        Take the next ready job without waiting, to fill a chunk.
+
+        Returns:
+            - The highest-ranked ready job.
+
+        Raises:
+            - Empty: If no job is ready, or with resources, if none of the ready jobs may start now.
+        """
+        if self.pool is None:
+            return self.ready.get_nowait()
+        with self.flow:
+            job = self.pool.select()
+            if job is None:
+                raise Empty
+            # Another waiting job may fit as well: start a loop to try, which does the same if it succeeds
+            if self.pool.waiting and self.in_flight < self.max_in_flight:
+                self.in_flight += 1
+                self.executor.submit(self.run_worker)
+            # A slot in the waiting jobs freed up for the dispatcher
+            self.flow.notify()
+        return job
+
+    def release_resources(self, jobs: list[Job]) -> None:
+        """
+        Return the resources held by jobs that stopped running.
+        The worker loop that ran them then picks the next job that fits.
+
+        Args:
+            - jobs: The jobs that finished, failed or are waiting to be retried.
+        """
+        if self.pool is None:
+            return
+        with self.flow:
+            for job in jobs:
+                self.pool.release(job)
+
+    def release(self, job_ids: set) -> None:
+        """
+        Re-evaluate blocked jobs whose dependencies were rewritten and dispatch the ready ones.
+
+        Args:
+            - job_ids: IDs of the jobs whose dependency lists changed.
+        """
+        for job in self.tracker.refresh(job_ids):
+            self.dispatch(job)
+
+    def drop_dependencies(self, dep_ids: set) -> None:
+        """
+        Treat dependencies on jobs that will never be submitted as met and dispatch the jobs this frees.
+
+        Args:
+            - dep_ids: IDs of the jobs that do not exist.
+        """
+        for job in self.tracker.drop(dep_ids):
+            self.dispatch(job)
 
     def start(self) -> None:
         """
         Start consuming jobs from the queue.
+        Jobs with unmet dependencies are parked in the tracker instead of being re-queued.
+        While every credit is in use, jobs are left on the queue so that its bound applies.
         """
+        self.stats.start()
+        if self.pool is not None:
+            self.pool.start()
         while True:
             try:
+                start = time.perf_counter()
+                with self.flow:
+                    while self.backlogged():
+                        self.flow.wait()
+                fetch = time.perf_counter()
+                self.credit_wait_time += fetch - start
+
+                if self.batch_size > 1:
+                    jobs = self.queue.get_batch(self.batch_size)
+                    self.queue_wait_time += time.perf_counter() - fetch
+                    for job in self.admit(jobs):
+                        self.dispatch(job)
+                    continue
+
                 job = self.queue.get()
-                self.executor.submit(self.process_job, job)
+                self.queue_wait_time += time.perf_counter() - fetch
+                if self.admit([job]):
+                    self.dispatch(job)
             except Exception as e:
-                logger.error(f"Error fetching job: {e}")
+                logger.error("Error fetching job: %s", e)
                 break
 
+    def backlogged(self) -> bool:
+        """
+        Check whether the dispatcher should leave jobs on the queue. Called with the flow-control lock held.
+
+        Returns:
+            - True while every credit is in use or, with resources, while as many jobs wait for
+                resources as the pool examines for backfilling.
+        """
+        if self.in_flight >= self.max_in_flight:
+            return True
+        return self.pool is not None and len(self.pool.waiting) >= self.max_in_flight + self.pool.backfill_depth
+
+    def resource_metrics(self) -> dict | None:
+        """
+        Get the resource utilization metrics (see `ResourcePool.metrics`).
+
+        Returns:
+            - The metrics, or None if the pool does not manage resources.
+        """
+        if self.pool is None:
+            return None
+        with self.flow:
+            return self.pool.metrics()
+
+    def metrics(self) -> dict:
+        """
+        Get flow-control metrics of the consumer pool.
+
+        Returns:
+            - Dictionary with the current and maximum number of jobs in flight, the number of jobs
+                waiting in the ready queue, on dependencies or for a retry, and the seconds the dispatcher
+                spent blocked on credits and waiting for jobs.
+        """
+        with self.flow:
+            in_flight = self.in_flight
+            waiting = len(self.pool.waiting) if self.pool is not None else 0
+        return {
+            "in_flight": in_flight,
+            "max_in_flight": self.max_in_flight,
+            "ready": self.ready.qsize() + waiting,
+            "blocked_on_dependencies": self.tracker.blocked_count(),
+            "waiting_to_retry": self.retry_timer.pending(),
+            "credit_wait_seconds": self.credit_wait_time,
+            "queue_wait_seconds": self.queue_wait_time,
+        }
+
     def shutdown(self) -> None:
         """
         Shutdown the consumer pool gracefully.
         """
-        self.executor.shutdown(wait=True)
+        self.retry_timer.stop()
+        self.backend.shutdown()
+        self.stats.stop()
         logger.info("Consumer pool has been shut down.")
@@ -1,21 +1,60 @@
+import threading
+from typing import Callable, NamedTuple
 from utils.logger import get_logger
-from collections import deque
 from collections import defaultdict
 from models.job import Job
 
 
 logger = get_logger(__name__)
 
+class DependencyEdge(NamedTuple):
+    """
+    A dependency edge considered for removal: `job` depends on `dep_id`.
+    `job_index` is the job's submission position and `position` the index of `dep_id` in its dependencies.
+    """
+    dep_id: object
+    job: Job
+    job_index: int
+    position: int
+
+
+# Each policy maps a cycle edge to a sort key; the edge with the largest key is removed first.
+EDGE_POLICIES = {
+    "newest": lambda edge: (edge.job_index, edge.position),
+    "lowest-priority": lambda edge: (-edge.job.priority, edge.job_index, edge.position),
+    "cheapest": lambda edge: (-edge.job.execution_time, edge.job_index, edge.position),
+}
+
+
 class DeadlockHandler:
     """
     Handles deadlock detection and resolution for jobs with dependencies.
     """
 
+    @staticmethod
+    def find_cycles(jobs: list[Job]) -> list[list]:
+        """
+        Find the strongly connected components of the dependency graph that contain a cycle.
+        Uses an iterative version of Tarjan's algorithm, so deep graphs do not hit the recursion limit.
+
+        Args:
+            - jobs: List of all jobs.
+
+        Returns:
+            - List of components, each a list of job IDs.
+        """
+        successors = DeadlockHandler._successors(jobs)
+        return [
+            component for component in DeadlockHandler._strongly_connected(successors)
+            if len(component) > 1 or component[0] in successors[component[0]]
+        ]
+
     @staticmethod
     def detect_deadlock(jobs: list[Job]) -> set[Job]:
         """
         Detect if a deadlock exists in the job dependency graph.
-        Uses a topological sort (Kahn's algorithm) to detect cycles.
+        Only jobs that can never become ready are reported: members of a dependency cycle and jobs
+        depending on a job that was never submitted. Jobs merely downstream of a cycle are left out.
 
         Args:
             - jobs: List of all jobs.
@@ -23,47 +62,78 @@ class DeadlockHandler:
         Returns:
             - A set of jobs IDs involved in a deadlock cycle, or an empty set if no deadlock exists.
         """
-        
-        graph = defaultdict(list) 
-        in_degree = defaultdict(int)
-        queue = deque()
-        sorted_order = []
+        known = {job.job_id for job in jobs}
+        deadlocked_jobs = {job.job_id for job in jobs if any(dep not in known for dep in job.dependencies)}
+        for component in DeadlockHandler.find_cycles(jobs):
+            deadlocked_jobs.update(component)
 
-        
-        for job in jobs:
-            for dep_id in job.dependencies:
-                graph[dep_id].append(job)
-                in_degree[job.job_id] += 1
+        if deadlocked_jobs:
+            logger.warning("Deadlock detected involving jobs: %s", deadlocked_jobs)
+            return deadlocked_jobs
 
-        for job in jobs:
-            if in_degree[job.job_id] == 0:
-                queue.append(job)
+        logger.info("No deadlock detected.")
+        return set()
 
-        while queue:
-            current_job = queue.popleft()
-            sorted_order.append(current_job)
+    @staticmethod
+    def break_cycles(jobs: list[Job], policy: str | Callable[[DependencyEdge], tuple] = "newest") -> list[tuple]:
+        """
+        Break every dependency cycle by removing a small set of edges, leaving other jobs untouched.
+        Dependencies on jobs that were never submitted are removed as well.
 
-            for next_job in graph[current_job.job_id]:
-                in_degree[next_job.job_id] -= 1
-                if in_degree[next_job.job_id] == 0:
-                    queue.append(next_job)
+        Each cyclic component repeatedly loses the edge preferred by `policy` and is split again
+        into strongly connected components until none of them contains a cycle.
 
-        if len(sorted_order) != len(jobs):
-            deadlocked_jobs = {job.job_id for job in jobs if in_degree[job.job_id] > 0}
-            logger.warning(f"Deadlock detected involving jobs: {deadlocked_jobs}")
-            return deadlocked_jobs
+        Args:
+            - jobs: List of all jobs, in submission order.
+            - policy: Name of a policy in `EDGE_POLICIES` ("newest", "lowest-priority", "cheapest")
+                or a function mapping a `DependencyEdge` to a sort key (largest is removed).
 
-        logger.info("No deadlock detected.")
-        return set()
+        Returns:
+            - List of removed (dependency ID, job ID) edges.
+        """
+        key = EDGE_POLICIES[policy] if isinstance(policy, str) else policy
+        index = {job.job_id: i for i, job in enumerate(jobs)}
+        removed = []
+
+        for job in jobs:
+            dangling = [dep for dep in job.dependencies if dep not in index]
+            if dangling:
+                job.dependencies = [dep for dep in job.dependencies if dep in index]
+                removed.extend((dep, job.job_id) for dep in dangling)
+
+        pending = DeadlockHandler.find_cycles(jobs)
+        while pending:
+            component = set(pending.pop())
+            edges = [
+                DependencyEdge(dep, jobs[index[job_id]], index[job_id], position)
+                for job_id in component
+                for position, dep in enumerate(jobs[index[job_id]].dependencies)
+                if dep in component
+            ]
+            edge = max(edges, key=key)
+            edge.job.dependencies = [dep for dep in edge.job.dependencies if dep != edge.dep_id]
+            removed.append((edge.dep_id, edge.job.job_id))
+
+            subgraph = [jobs[index[job_id]] for job_id in component]
+            successors = DeadlockHandler._successors(subgraph)
+            pending.extend(
+                sub for sub in DeadlockHandler._strongly_connected(successors)
+                if len(sub) > 1 or sub[0] in successors[sub[0]]
+            )
+
+        for dep_id, job_id in removed:
+            logger.info("Removed dependency %s of job %s to resolve deadlock.", dep_id, job_id)
+        return removed
 
     @staticmethod
-    def resolve_deadlock(deadlocked_jobs: set, jobs: list[Job]) -> list[Job] | None:
+    def resolve_deadlock(deadlocked_jobs: set, jobs: list[Job], policy: str = "newest") -> list[Job] | None:
         """
-        Resolve deadlocks by removing dependencies or cancelling jobs.
+        Resolve deadlocks by removing the fewest dependency edges needed to break every cycle.
 
         Args:
             - deadlocked_jobs: Set of job IDs involved in a deadlock.
             - jobs: List of all jobs.
+            - policy: Edge removal policy, see `break_cycles`.
 
         Returns:
             - Updated list of jobs with deadlock resolved.
@@ -73,12 +143,200 @@ class DeadlockHandler:
             logger.info("No deadlocked jobs to resolve.")
             return jobs
 
+        DeadlockHandler.break_cycles(jobs, policy)
+        return jobs
 
-
+    @staticmethod
+    def _successors(jobs: list[Job]) -> dict:
+        """
+        Build the adjacency map (dependency -> dependents) restricted to the given jobs.
+        """
+        successors = {job.job_id: [] for job in jobs}
         for job in jobs:
-            if job.job_id in deadlocked_jobs:
-                job.dependencies = []
-                logger.info(f"Removed dependencies for job {job.job_id} to resolve deadlock.")
-        
-        return jobs
+            for dep_id in job.dependencies:
+                if dep_id in successors:
+                    successors[dep_id].append(job.job_id)
+        return successors
+
+    @staticmethod
+    def _strongly_connected(successors: dict) -> list[list]:
+        """
+        Iterative Tarjan's algorithm over an adjacency map.
+
+        Returns:
+            - List of strongly connected components, each a list of job IDs.
+        """
+        index = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        components = []
+
+        for root in successors:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(successors[root]))]
+
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = low[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(successors[child])))
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+        return components
+
+
+class DependencyCycleError(ValueError):
+    """
+    Raised when a submitted job would close a dependency cycle.
+    """
+
+    def __init__(self, job_id, dependencies: list) -> None:
+        super().__init__(f"Job {job_id} would close a dependency cycle through {dependencies}")
+        self.job_id = job_id
+        self.dependencies = dependencies
+
+
+class IncrementalCycleDetector:
+    """
+    Detects dependency cycles online, one edge at a time, as jobs are submitted.
+
+    Maintains a topological order of all known jobs (Pearce-Kelly dynamic topological sort).
+    An edge that already agrees with the order is accepted in O(1); otherwise only the jobs
+    whose position lies between the two endpoints are searched and reordered.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty dependency graph.
+        """
+        self.lock = threading.Lock()
+        self.order = {}
+        self.successors = defaultdict(set)
+        self.predecessors = defaultdict(set)
+        self.next_order = 0
+
+    def add_job(self, job_id, dependencies: list, atomic: bool = False) -> list:
+        """
+        Add a job and the edges from each of its dependencies.
+
+        Args:
+            - job_id: ID of the submitted job.
+            - dependencies: IDs of the jobs it depends on. Unknown IDs are added as placeholders.
+            - atomic: If True, no edge is kept when any of them would close a cycle.
+
+        Returns:
+            - List of dependency IDs whose edge would close a cycle. Those edges are not added.
+        """
+        with self.lock:
+            self._add_node(job_id)
+            added, cyclic = [], []
+            for dep_id in dict.fromkeys(dependencies):
+                self._add_node(dep_id)
+                if self._add_edge(dep_id, job_id):
+                    added.append(dep_id)
+                else:
+                    cyclic.append(dep_id)
+
+            if cyclic and atomic:
+                for dep_id in added:
+                    self.successors[dep_id].discard(job_id)
+                    self.predecessors[job_id].discard(dep_id)
+            return cyclic
+
+    def remove(self, job_id) -> None:
+        """
+        Remove a finished job. A completed job can no longer take part in a cycle.
+
+        Args:
+            - job_id: ID of the finished job.
+        """
+        with self.lock:
+            if self.order.pop(job_id, None) is None:
+                return
+            for successor in self.successors.pop(job_id, ()):
+                self.predecessors[successor].discard(job_id)
+            for predecessor in self.predecessors.pop(job_id, ()):
+                self.successors[predecessor].discard(job_id)
+
+    def _add_node(self, job_id) -> None:
+        if job_id not in self.order:
+            self.order[job_id] = self.next_order
+            self.next_order += 1
+
+    def _add_edge(self, source, target) -> bool:
+        """
+        Insert the edge source -> target, reordering the affected region if needed.
+
+        Returns:
+            - False if the edge would close a cycle, True otherwise.
+        """
+        if source == target:
+            return False
+
+        order = self.order
+        lower, upper = order[target], order[source]
+        if upper < lower:
+            self.successors[source].add(target)
+            self.predecessors[target].add(source)
+            return True
+
+        # Forward search from the target through jobs ordered before the source
+        forward = []
+        visited = {target}
+        stack = [target]
+        while stack:
+            node = stack.pop()
+            forward.append(node)
+            for successor in self.successors.get(node, ()):
+                if successor == source:
+                    return False
+                if successor not in visited and order[successor] < upper:
+                    visited.add(successor)
+                    stack.append(successor)
+
+        # Backward search from the source through jobs ordered after the target
+        backward = []
+        visited = {source}
+        stack = [source]
+        while stack:
+            node = stack.pop()
+            backward.append(node)
+            for predecessor in self.predecessors.get(node, ()):
+                if predecessor not in visited and order[predecessor] > lower:
+                    visited.add(predecessor)
+                    stack.append(predecessor)
+
+        # Move the backward region in front of the forward region, reusing their positions
+        backward.sort(key=order.__getitem__)
+        forward.sort(key=order.__getitem__)
+        nodes = backward + forward
+        positions = sorted(order[node] for node in nodes)
+        for node, position in zip(nodes, positions):
+            order[node] = position
 
+        self.successors[source].add(target)
+        self.predecessors[target].add(source)
+        return True
@@ -0,0 +1,308 @@
+from collections import defaultdict, deque
+from threading import Lock
+from models.job import CANCELLED, Job
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class RecentSet:
+    """
+    Set of the `maxlen` most recently added items; adding more forgets the oldest.
+    """
+
+    def __init__(self, maxlen: int) -> None:
+        self.maxlen = maxlen
+        self.items = {}
+
+    def add(self, item) -> None:
+        self.items.pop(item, None)
+        self.items[item] = None
+        if len(self.items) > self.maxlen:
+            del self.items[next(iter(self.items))]
+
+    def isdisjoint(self, other) -> bool:
+        return self.items.keys().isdisjoint(other)
+
+    def __contains__(self, item) -> bool:
+        return item in self.items
+
+    def __iter__(self):
+        return iter(list(self.items))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class CompletionWindow:
+    """
+    Set-like record of completed jobs for a long-running scheduler, in memory proportional to
+    the jobs still in the system rather than to every job ever run.
+
+    Jobs may only depend on jobs submitted before them. A job is then completed exactly when it
+    was submitted but is no longer live, so completed IDs need not be kept: membership tests
+    whether a job is live, and only the `retain` most recent completions are remembered for reporting.
+    An ID that was never submitted counts as completed.
+
+    Jobs that failed or were cancelled leave the window as well. The `retain` most recent of them
+    are remembered in `failed`, so that jobs submitted later with a dependency on them are cancelled;
+    a dependency on an older failure counts as met.
+    """
+
+    def __init__(self, retain: int = 1000) -> None:
+        """
+        Initialize the window.
+
+        Args:
+            - retain: Number of most recently completed job IDs kept for reporting, and of most
+                recently failed or cancelled job IDs kept to cancel their late dependents.
+        """
+        self.live = set()
+        self.recent = deque(maxlen=retain)
+        self.failed = RecentSet(retain)
+        self.count = 0
+
+    def submitted(self, job_id) -> None:
+        """
+        Record a job entering the system. Called before the job is queued.
+        """
+        self.live.add(job_id)
+
+    def add(self, job_id) -> None:
+        """
+        Record a completed job, reclaiming its entry.
+        """
+        self.live.discard(job_id)
+        self.recent.append(job_id)
+        self.count += 1
+
+    def fail(self, job_id) -> None:
+        """
+        Record a job that failed for good or was cancelled, reclaiming its entry.
+        """
+        self.live.discard(job_id)
+        self.failed.add(job_id)
+
+    def __contains__(self, job_id) -> bool:
+        return job_id not in self.live
+
+    def __iter__(self):
+        return iter(list(self.recent))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class DependencyTracker:
+    """
+    Tracks unmet job dependencies and releases jobs once they become ready.
+
+    Every blocked job keeps a counter of its remaining dependencies, and every dependency ID
+    maps to the jobs waiting on it, so completing a job only touches its own dependents.
+    """
+
+    def __init__(self, completed_jobs: set, completed_jobs_lock: Lock) -> None:
+        """
+        Initialize the dependency tracker.
+
+        Args:
+            - completed_jobs: Shared set of completed job IDs, or the `CompletionWindow` of a
+                long-running scheduler, which then also records failed and cancelled jobs.
+            - completed_jobs_lock: Lock for accessing the completed jobs set.
+        """
+        self.completed_jobs = completed_jobs
+        self.lock = completed_jobs_lock
+        self.remaining = {}
+        self.blocked = {}
+        self.waiters = defaultdict(list)
+        self.dropped = set()
+        self.window = completed_jobs if isinstance(completed_jobs, CompletionWindow) else None
+        self.failed = self.window.failed if self.window is not None else set()
+
+    def add(self, job: Job) -> bool:
+        """
+        Register a job with the tracker.
+
+        Args:
+            - job: The job to register.
+
+        Returns:
+            - True if the job is ready to run, False if it was parked until its dependencies complete.
+        """
+        with self.lock:
+            return self._park(job)
+
+    def add_many(self, jobs: list[Job]) -> list[Job]:
+        """
+        Register several jobs under a single lock acquisition.
+
+        Args:
+            - jobs: The jobs to register.
+
+        Returns:
+            - List of the jobs that are ready to run; the others were parked.
+        """
+        with self.lock:
+            return [job for job in jobs if self._park(job)]
+
+    def complete(self, job_id) -> list[Job]:
+        """
+        Mark a job as completed and release the dependents that no longer wait on anything.
+
+        Args:
+            - job_id: ID of the job that finished.
+
+        Returns:
+            - List of jobs that became ready.
+        """
+        ready = []
+        with self.lock:
+            self.completed_jobs.add(job_id)
+            for waiter_id in self.waiters.pop(job_id, ()):
+                self.remaining[waiter_id] -= 1
+                if self.remaining[waiter_id] == 0:
+                    del self.remaining[waiter_id]
+                    job, _ = self.blocked.pop(waiter_id)
+                    ready.append(job)
+
+        for job in ready:
+            logger.info("Job %s released after dependency %s completed.", job.job_id, job_id)
+        return ready
+
+    def refresh(self, job_ids: set) -> list[Job]:
+        """
+        Re-evaluate blocked jobs whose dependencies were rewritten (e.g. by deadlock resolution).
+
+        Args:
+            - job_ids: IDs of the jobs whose dependency lists changed.
+
+        Returns:
+            - List of jobs that became ready.
+        """
+        ready = []
+        with self.lock:
+            for job_id in job_ids:
+                entry = self.blocked.pop(job_id, None)
+                if entry is None:
+                    continue
+
+                job, unmet = entry
+                del self.remaining[job_id]
+                for dep_id in unmet:
+                    waiters = self.waiters[dep_id]
+                    waiters.remove(job_id)
+                    if not waiters:
+                        del self.waiters[dep_id]
+
+                if self._park(job):
+                    ready.append(job)
+        return ready
+
+    def drop(self, dep_ids: set) -> list[Job]:
+        """
+        Treat dependencies on jobs that will never be submitted as met, now and for jobs registered later.
+
+        Args:
+            - dep_ids: IDs of the jobs that do not exist.
+
+        Returns:
+            - List of jobs that became ready.
+        """
+        ready = []
+        with self.lock:
+            self.dropped |= dep_ids
+            for dep_id in dep_ids:
+                for waiter_id in self.waiters.pop(dep_id, ()):
+                    job, unmet = self.blocked[waiter_id]
+                    unmet.discard(dep_id)
+                    self.remaining[waiter_id] -= 1
+                    if self.remaining[waiter_id] == 0:
+                        del self.remaining[waiter_id]
+                        del self.blocked[waiter_id]
+                        ready.append(job)
+
+        for job in ready:
+            logger.warning("Job %s released after dropping its missing dependencies.", job.job_id)
+        return ready
+
+    def fail(self, job_id) -> list[Job]:
+        """
+        Mark a job as failed for good and cancel every job that transitively depends on it, in one pass.
+        Jobs registered later with a dependency on a failed or cancelled job are cancelled as well.
+
+        Args:
+            - job_id: ID of the job that failed.
+
+        Returns:
+            - List of the blocked jobs that were cancelled, with their state set to `CANCELLED`.
+        """
+        cancelled = []
+        with self.lock:
+            self._mark_failed(job_id)
+            doomed = [job_id]
+            while doomed:
+                failed_id = doomed.pop()
+                for waiter_id in self.waiters.pop(failed_id, ()):
+                    entry = self.blocked.pop(waiter_id, None)
+                    if entry is None:
+                        # Already cancelled through another failed dependency
+                        continue
+                    job, unmet = entry
+                    del self.remaining[waiter_id]
+                    for dep_id in unmet:
+                        waiters = self.waiters.get(dep_id)
+                        if waiters and dep_id != failed_id:
+                            waiters.remove(waiter_id)
+                            if not waiters:
+                                del self.waiters[dep_id]
+                    job.state = CANCELLED
+                    self._mark_failed(waiter_id)
+                    cancelled.append(job)
+                    doomed.append(waiter_id)
+
+        if cancelled:
+            logger.warning("Cancelled %s jobs depending on failed job %s.", len(cancelled), job_id)
+        return cancelled
+
+    def blocked_count(self) -> int:
+        """
+        Get the number of jobs currently waiting on dependencies.
+
+        Returns:
+            - The number of blocked jobs.
+        """
+        with self.lock:
+            return len(self.blocked)
+
+    def _mark_failed(self, job_id) -> None:
+        """
+        Record a failed or cancelled job. Must be called with the lock held.
+        """
+        if self.window is not None:
+            self.window.fail(job_id)
+        else:
+            self.failed.add(job_id)
+
+    def _park(self, job: Job) -> bool:
+        """
+        Park a job on its unmet dependencies. Must be called with the lock held.
+
+        Returns:
+            - True if the job has no unmet dependencies, False otherwise. A job depending on a failed
+                job is not parked but cancelled: its state is set to `CANCELLED`.
+        """
+        if self.failed and not self.failed.isdisjoint(job.dependencies):
+            job.state = CANCELLED
+            self._mark_failed(job.job_id)
+            logger.warning("Job %s cancelled: a dependency failed.", job.job_id)
+            return False
+
+        unmet = {dep for dep in job.dependencies if dep not in self.completed_jobs and dep not in self.dropped}
+        if not unmet:
+            return True
+
+        self.remaining[job.job_id] = len(unmet)
+        self.blocked[job.job_id] = (job, unmet)
+        for dep_id in unmet:
+            self.waiters[dep_id].append(job.job_id)
+        logger.info("Job %s waiting on dependencies: %s", job.job_id, unmet)
+        return False
@@ -0,0 +1,480 @@
+import itertools
+import multiprocessing
+import os
+import pickle
+import socket
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener
+from queue import Empty
+from typing import Any
+from models.job import PENDING, RUNNING, Job
+from scheduler.consumer import Consumer
+from scheduler.executors import execute_with_alarm
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def parse_address(spec: str) -> tuple[str, int] | str:
+    """
+    Parse the address of a coordinator, such as "127.0.0.1:7000" or "/tmp/scheduler.sock".
+
+    Args:
+        - spec: host:port for a TCP socket, or the path of a Unix domain socket.
+
+    Returns:
+        - A (host, port) tuple, or the socket path.
+
+    Raises:
+        - ValueError: If the port is not a number.
+    """
+    if "/" in spec:
+        return spec
+    host, _, port = spec.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def run_leased(job: Job, results: dict | None) -> tuple[Any, str | None, Any, float]:
+    """
+    Run a leased job in a worker process, interrupting it once its timeout expires.
+
+    Args:
+        - job: The job.
+        - results: Dependency results passed to `Job.execute`.
+
+    Returns:
+        - The job ID, the error message (None on success), the result and the seconds the job ran.
+    """
+    start = time.perf_counter()
+    error = result = None
+    try:
+        result = execute_with_alarm(job, results)
+        if result is not None:
+            # A result that cannot be sent back fails the job rather than the whole report
+            pickle.dumps(result)
+    except Exception as e:
+        error, result = f"{type(e).__name__}: {e}", None
+    return job.job_id, error, result, time.perf_counter() - start
+
+
+def run_worker(address: tuple[str, int] | str, authkey: bytes, name: str | None = None) -> int:
+    """
+    Connect to a coordinator and run the jobs it leases until it stops. This function is run by
+    every worker process, on the coordinator's machine or on another one.
+
+    The worker reports the outcomes of a lease together with its request for the next one, and a
+    background thread sends heartbeats meanwhile, so that the lease is kept while a long job runs.
+
+    Args:
+        - address: Address of the coordinator (see `parse_address`).
+        - authkey: Secret shared with the coordinator.
+        - name: Name of the worker in the coordinator's metrics, by default host and process ID.
+
+    Returns:
+        - The number of jobs the worker ran.
+    """
+    connection = Client(address, authkey=authkey)
+    lock = threading.Lock()
+    stopped = threading.Event()
+
+    def call(message: tuple) -> tuple:
+        with lock:
+            connection.send(message)
+            return connection.recv()
+
+    def beat(interval: float) -> None:
+        while not stopped.wait(interval):
+            try:
+                call(("heartbeat",))
+            except (EOFError, OSError):
+                return
+
+    count = 0
+    try:
+        _, worker_id, heartbeat_interval = call(("hello", name or f"{socket.gethostname()}-{os.getpid()}"))
+        logger.info("Worker %s connected to coordinator %s.", worker_id, address)
+        threading.Thread(target=beat, args=(heartbeat_interval,), name="Heartbeat", daemon=True).start()
+        outcomes = []
+        while True:
+            reply = call(("lease", outcomes))
+            if reply[0] == "stop":
+                break
+            _, jobs, inputs = reply
+            outcomes = [run_leased(job, results) for job, results in zip(jobs, inputs)]
+            count += len(jobs)
+    except (EOFError, OSError) as e:
+        logger.warning("Worker lost its connection to coordinator %s: %s", address, e)
+    finally:
+        stopped.set()
+        with lock:
+            connection.close()
+    logger.info("Worker ran %s jobs.", count)
+    return count
+
+
+class RemoteWorker:
+    """
+    A worker process connected to a `DistributedConsumer`, and the jobs leased to it.
+    """
+    __slots__ = ("worker_id", "name", "leased", "seen_at", "expired", "completed", "requeued")
+
+    def __init__(self, worker_id: int, name: str) -> None:
+        self.worker_id = worker_id
+        self.name = name
+        self.leased = {}
+        self.seen_at = time.monotonic()
+        self.expired = False
+        self.completed = 0
+        self.requeued = 0
+
+
+class DistributedConsumer(Consumer):
+    """
+    A coordinator handing ready jobs to worker processes that connect over a socket, so that jobs run
+    beyond one interpreter and, with workers on other machines, beyond one host.
+
+    The coordinator keeps the queue, the dependency tracker and the completed set, and dispatches
+    released jobs to a ready queue like `Consumer`, but no job runs in it. Every worker process leases
+    up to `chunk_size` ready jobs at a time, runs them, and reports their outcomes with its next lease
+    request, so the coordinator handles one message per lease rather than per job. Workers send
+    heartbeats while they run; when a worker disconnects or misses heartbeats for `heartbeat_timeout`
+    seconds, its leased jobs are dispatched again. Jobs therefore run at least once: the outcome of
+    a lease that was taken back is ignored.
+
+    Credits count leased and ready jobs: no new job is taken off the queue while
+    `workers * in_flight_per_worker * chunk_size` of them wait or run. Jobs and their results are
+    pickled, so a job's `func` must be a module-level function and large results are copied.
+    """
+
+    def __init__(self, *args, address: tuple[str, int] | str = ("127.0.0.1", 0), authkey: bytes | None = None,
+                 heartbeat_interval: float = 1.0, heartbeat_timeout: float = 5.0, poll_interval: float = 0.05,
+                 **kwargs) -> None:
+        """
+        Initialize the coordinator and start listening. Takes the same arguments as `Consumer`;
+        `num_workers` is the number of worker processes started on this machine, and more may connect.
+
+        Args:
+            - address: Address to listen on: (host, port) for TCP, port 0 for any free port,
+                or the path of a Unix domain socket.
+            - authkey: Secret workers must present, or None for a random one (only local workers can then connect).
+            - heartbeat_interval: Seconds between two heartbeats of a worker.
+            - heartbeat_timeout: Seconds without a message after which a worker is presumed dead.
+            - poll_interval: Maximum seconds a lease request waits for a ready job before returning none.
+        """
+        # Jobs do not run in the coordinator, which may have no local worker at all
+        kwargs["backend"] = "threads"
+        kwargs["max_workers"] = kwargs.get("max_workers") or 1
+        super().__init__(*args, **kwargs)
+        self.authkey = authkey if authkey is not None else os.urandom(32)
+        self.listener = Listener(address, backlog=128, authkey=self.authkey)
+        self.address = self.listener.address
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.poll_interval = poll_interval
+        self.workers = {}
+        self.worker_ids = itertools.count()
+        self.processes = []
+        self.stopping = threading.Event()
+        self.requeued_count = 0
+        self.stale_count = 0
+        self.credits_per_worker = self.in_flight_per_worker * self.chunk_size
+        self.max_in_flight = self.credits_per_worker
+
+    resizable = False
+
+    def resize(self, num_workers: int) -> None:
+        """
+        Not supported: credits follow the worker processes that connect, which the coordinator
+        neither starts nor stops after `start`.
+
+        Raises:
+            - NotImplementedError: Always.
+        """
+        raise NotImplementedError("A distributed pool cannot be resized; start or stop workers instead")
+
+    def start(self) -> None:
+        """
+        Start the local worker processes, accept workers, and consume jobs from the queue.
+        """
+        logger.info("Coordinator listening on %s.", self.address)
+        threading.Thread(target=self.accept, name="Coordinator", daemon=True).start()
+        threading.Thread(target=self.reap, name="Reaper", daemon=True).start()
+        for i in range(self.num_workers):
+            process = multiprocessing.Process(target=run_worker, args=(self.address, self.authkey),
+                                              kwargs={"name": f"local-{i}"}, daemon=True)
+            process.start()
+            self.processes.append(process)
+        super().start()
+
+    def accept(self) -> None:
+        """
+        Accept worker connections, serving each one on its own thread.
+        """
+        while not self.stopping.is_set():
+            try:
+                connection = self.listener.accept()
+            except (OSError, EOFError, multiprocessing.AuthenticationError) as e:
+                if not self.stopping.is_set():
+                    logger.error("Rejected a worker connection: %s", e)
+                continue
+            threading.Thread(target=self.serve, args=(connection,), name="WorkerSession", daemon=True).start()
+
+    def serve(self, connection: Connection) -> None:
+        """
+        Answer the heartbeats and lease requests of one worker until it disconnects or the coordinator stops.
+
+        Args:
+            - connection: The worker's connection.
+        """
+        worker = None
+        try:
+            _, name = connection.recv()
+            worker = self.register(name)
+            connection.send(("welcome", worker.worker_id, self.heartbeat_interval))
+            while True:
+                message = connection.recv()
+                self.touch(worker)
+                if message[0] == "heartbeat":
+                    connection.send(("ok",))
+                    continue
+                self.report(worker, message[1])
+                jobs = [] if self.stopping.is_set() else self.lease(worker)
+                if not jobs and self.stopping.is_set():
+                    connection.send(("stop",))
+                    return
+                inputs = [self.results.inputs(job) if job.pass_results else None for job in jobs]
+                try:
+                    connection.send(("jobs", jobs, inputs))
+                except (pickle.PicklingError, TypeError, AttributeError) as e:
+                    # Nothing was sent: the lease fails instead of being re-queued forever
+                    self.report(worker, [(job.job_id, f"{type(e).__name__}: {e}", None, 0.0) for job in jobs])
+                    connection.send(("jobs", [], []))
+        except (EOFError, OSError) as e:
+            if worker is not None and not self.stopping.is_set():
+                logger.warning("Worker %s (%s) disconnected: %s", worker.worker_id, worker.name, e)
+        except Exception as e:
+            logger.error("Error serving worker %s: %s", worker.worker_id if worker else "?", e)
+        finally:
+            connection.close()
+            if worker is not None:
+                self.expire(worker)
+
+    def register(self, name: str) -> RemoteWorker:
+        """
+        Add a worker to the pool, raising the number of credits.
+        """
+        with self.flow:
+            worker = RemoteWorker(next(self.worker_ids), name)
+            self.workers[worker.worker_id] = worker
+            self._resized()
+        logger.info("Worker %s (%s) joined; %s workers connected.", worker.worker_id, name, len(self.workers))
+        return worker
+
+    def touch(self, worker: RemoteWorker) -> None:
+        """
+        Record a sign of life of a worker. A worker presumed dead that is still alive rejoins the pool.
+        """
+        worker.seen_at = time.monotonic()
+        if worker.expired:
+            with self.flow:
+                worker.expired = False
+                self.workers[worker.worker_id] = worker
+                self._resized()
+            logger.warning("Worker %s (%s) is back.", worker.worker_id, worker.name)
+
+    def lease(self, worker: RemoteWorker) -> list[Job]:
+        """
+        Lease up to `chunk_size` ready jobs to a worker, waiting up to `poll_interval` for the first one.
+        Jobs found in the result cache complete right away instead.
+
+        Args:
+            - worker: The worker asking for jobs.
+
+        Returns:
+            - The leased jobs, empty if none was ready in time.
+        """
+        try:
+            first = self.ready.get(timeout=self.poll_interval)
+        except Empty:
+            return []
+        with self.flow:
+            jobs = [first]
+            while len(jobs) < self.chunk_size:
+                try:
+                    jobs.append(self.ready.get_nowait())
+                except Empty:
+                    break
+            self.in_flight += len(jobs)
+
+        leased = []
+        for job in jobs:
+            job.started_at = time.perf_counter()
+            job.state = RUNNING
+            try:
+                key, cached = self.lookup(job)
+            except Exception as e:
+                key, cached = None, None
+                logger.error("Error looking up job %s in the cache: %s", job.job_id, e)
+            if cached is not None:
+                self._settle([job])
+                try:
+                    self.finish(job, *cached)
+                finally:
+                    self.results.release(job.result_refs)
+                    self.queue.done([job])
+                continue
+            with self.flow:
+                worker.leased[job.job_id] = (job, key)
+            leased.append(job)
+        return leased
+
+    def report(self, worker: RemoteWorker, outcomes: list[tuple]) -> None:
+        """
+        Record the outcomes a worker reported for its last lease. Outcomes of jobs that are no longer
+        leased to the worker, because its lease expired, are ignored.
+
+        Args:
+            - worker: The reporting worker.
+            - outcomes: (job ID, error, result, seconds) tuples, see `run_leased`.
+        """
+        if not outcomes:
+            return
+        jobs, results, keys, seconds = [], [], [], 0.0
+        with self.flow:
+            for job_id, error, result, elapsed in outcomes:
+                entry = worker.leased.pop(job_id, None)
+                if entry is None:
+                    self.stale_count += 1
+                    continue
+                jobs.append(entry[0])
+                keys.append(entry[1])
+                results.append((error, result))
+                seconds += elapsed
+            worker.completed += len(jobs)
+        if not jobs:
+            return
+        self._settle(jobs)
+        self.complete_chunk(jobs, results, keys if self.cache else None, seconds / len(jobs))
+
+    def expire(self, worker: RemoteWorker) -> None:
+        """
+        Remove a worker that disconnected or stopped sending heartbeats, and dispatch its leased jobs again.
+
+        Args:
+            - worker: The worker presumed dead.
+        """
+        with self.flow:
+            if worker.expired:
+                return
+            worker.expired = True
+            self.workers.pop(worker.worker_id, None)
+            self._resized()
+            jobs = [job for job, _ in worker.leased.values()]
+            worker.leased.clear()
+            worker.requeued += len(jobs)
+            self.requeued_count += len(jobs)
+        if self.stopping.is_set():
+            return
+        if jobs:
+            logger.warning("Re-queueing %s jobs leased to worker %s (%s).", len(jobs), worker.worker_id, worker.name)
+        self._settle(jobs)
+        for job in jobs:
+            job.state = PENDING
+            job.started_at = None
+            self.dispatch(job)
+
+    def reap(self) -> None:
+        """
+        Expire the workers that missed their heartbeats. This function is run by a background thread.
+        """
+        while not self.stopping.wait(self.heartbeat_interval):
+            deadline = time.monotonic() - self.heartbeat_timeout
+            with self.flow:
+                silent = [worker for worker in self.workers.values() if worker.seen_at < deadline]
+            for worker in silent:
+                logger.warning("Worker %s (%s) missed its heartbeats.", worker.worker_id, worker.name)
+                self.expire(worker)
+
+    def dispatch(self, job: Job) -> None:
+        """
+        Put a ready job in the ready queue for the next lease request.
+
+        Args:
+            - job: The job to run.
+        """
+        if job.ready_at is None:
+            job.ready_at = time.perf_counter()
+            self.queue.started(job)
+        self.ready.put(job)
+
+    def backlogged(self) -> bool:
+        """
+        Check whether the dispatcher should leave jobs on the queue. Called with the flow-control lock held.
+
+        Returns:
+            - True while leased and ready jobs use every credit.
+        """
+        return self.in_flight + self.ready.qsize() >= self.max_in_flight
+
+    def _settle(self, jobs: list[Job]) -> None:
+        """
+        Return the credits of leased jobs that completed or were taken back.
+        """
+        with self.flow:
+            self.in_flight -= len(jobs)
+            self.flow.notify()
+
+    def _resized(self) -> None:
+        """
+        Scale the credits to the connected workers. Called with the flow-control lock held.
+        """
+        self.num_workers = max(1, len(self.workers))
+        self.max_in_flight = self.num_workers * self.credits_per_worker
+        self.flow.notify_all()
+        self.stats.resize(self.num_workers)
+
+    def metrics(self) -> dict:
+        """
+        Get flow-control metrics of the coordinator.
+
+        Returns:
+            - The `Consumer` metrics, with the jobs re-queued from dead workers ("requeued"), the ignored
+                outcomes of expired leases ("stale_reports"), and per connected worker its name, the jobs
+                leased to it, the jobs it completed and the seconds since it was last heard from ("workers").
+        """
+        metrics = super().metrics()
+        now = time.monotonic()
+        with self.flow:
+            metrics["requeued"] = self.requeued_count
+            metrics["stale_reports"] = self.stale_count
+            metrics["workers"] = {
+                worker.worker_id: {
+                    "name": worker.name,
+                    "leased": len(worker.leased),
+                    "completed": worker.completed,
+                    "last_seen_seconds": now - worker.seen_at,
+                }
+                for worker in self.workers.values()
+            }
+        return metrics
+
+    def shutdown(self) -> None:
+        """
+        Tell the workers to stop at their next lease request, wait for them, and stop listening.
+        """
+        self.stopping.set()
+        with self.flow:
+            # Connected workers are told to stop at their next lease request, within `poll_interval`
+            self.flow.wait_for(lambda: not self.workers, timeout=self.heartbeat_timeout)
+        for process in self.processes:
+            process.join(timeout=self.heartbeat_timeout)
+            if process.is_alive():
+                process.terminate()
+        try:
+            # Wake the accepting thread up so that it sees the coordinator is stopping
+            Client(self.address, authkey=self.authkey).close()
+        except (OSError, EOFError, multiprocessing.AuthenticationError):
+            pass
+        self.listener.close()
+        super().shutdown()
@@ -0,0 +1,168 @@
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import resource_tracker
+from typing import Any
+from models.job import Job, JobTimeoutError
+from scheduler.results import SharedResult, attach, detach, to_shared
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BACKENDS = ("threads", "processes", "hybrid")
+
+def execute_with_alarm(job: Job, results: dict | None) -> Any:
+    """
+    Execute a job, interrupting it with `JobTimeoutError` once its timeout expires.
+    Uses SIGALRM, so the job is only interrupted when called from the main thread (as in a worker process).
+
+    Args:
+        - job: The job to run.
+        - results: Dependency results passed to `Job.execute`.
+
+    Returns:
+        - The value returned by the job.
+    """
+    if job.timeout is None or threading.current_thread() is not threading.main_thread():
+        return job.execute(results)
+
+    def expire(signum, frame):
+        raise JobTimeoutError(job.job_id, job.timeout)
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, job.timeout)
+    try:
+        return job.execute(results)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def execute_chunk(jobs: list[Job], inputs: list[dict | None] | None = None) -> list[tuple[str | None, Any]]:
+    """
+    Execute a chunk of jobs in a worker process.
+    Shared dependency results are mapped without copying, and large results are returned in shared memory.
+    Jobs with a timeout are interrupted when it expires.
+
+    Args:
+        - jobs: Unpickled copies of the jobs to run.
+        - inputs: Dependency results of each job that takes them, or None.
+
+    Returns:
+        - One (error, result) pair per job: error is None on success, otherwise the error message.
+    """
+    outcomes = []
+    for job, results in zip(jobs, inputs or [None] * len(jobs)):
+        mapped = []
+        try:
+            if results:
+                for dep_id, value in results.items():
+                    if isinstance(value, SharedResult):
+                        mapped.append(attach(value))
+                        results[dep_id] = mapped[-1][1]
+            outcomes.append((None, to_shared(execute_with_alarm(job, results))))
+        except Exception as e:
+            outcomes.append((f"{type(e).__name__}: {e}", None))
+        finally:
+            for segment, view in mapped:
+                detach(segment, view)
+    return outcomes
+
+
+class ThreadBackend:
+    """
+    Runs jobs on the consumer's worker threads.
+    """
+
+    def __init__(self, num_workers: int) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            - num_workers: Number of worker threads.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=num_workers)
+
+    def is_remote(self, job: Job) -> bool:
+        """
+        Check whether a job runs outside the calling worker thread.
+
+        Args:
+            - job: The job to check.
+
+        Returns:
+            - True if the job is sent to `run_chunk`, False if it runs in the worker thread.
+        """
+        return False
+
+    def run_chunk(self, jobs: list[Job], inputs: list[dict | None] | None = None) -> list[tuple[str | None, Any]]:
+        """
+        Run a chunk of remote jobs and wait for the outcome.
+
+        Args:
+            - jobs: The jobs to run.
+            - inputs: Dependency results of each job that takes them, or None.
+
+        Returns:
+            - One (error, result) pair per job: error is None on success, otherwise the error message.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not run jobs remotely")
+
+    def shutdown(self) -> None:
+        """
+        Shut the backend down, waiting for running jobs.
+        """
+        self.executor.shutdown(wait=True)
+
+
+class ProcessBackend(ThreadBackend):
+    """
+    Runs jobs in a pool of worker processes, so CPU-bound jobs are not serialized by the GIL.
+    Worker threads in the parent only ship chunks of jobs and record their completion.
+    """
+
+    def __init__(self, num_workers: int) -> None:
+        super().__init__(num_workers)
+        # Worker processes must share this process's resource tracker, which owns shared result segments
+        resource_tracker.ensure_running()
+        self.process_pool = ProcessPoolExecutor(max_workers=num_workers)
+
+    def is_remote(self, job: Job) -> bool:
+        return True
+
+    def run_chunk(self, jobs: list[Job], inputs: list[dict | None] | None = None) -> list[tuple[str | None, Any]]:
+        try:
+            return self.process_pool.submit(execute_chunk, jobs, inputs).result()
+        except Exception as e:
+            # The whole chunk is lost if it cannot be pickled or the worker process dies
+            return [(f"{type(e).__name__}: {e}", None)] * len(jobs)
+
+    def shutdown(self) -> None:
+        super().shutdown()
+        self.process_pool.shutdown(wait=True)
+
+
+class HybridBackend(ProcessBackend):
+    """
+    Runs jobs that carry a callable (CPU-bound work) in worker processes and
+    simulated or I/O-bound jobs on worker threads.
+    """
+
+    def is_remote(self, job: Job) -> bool:
+        return job.func is not None
+
+
+def create_backend(name: str, num_workers: int) -> ThreadBackend:
+    """
+    Create an execution backend by name.
+
+    Args:
+        - name: One of "threads", "processes" or "hybrid".
+        - num_workers: Number of worker threads, and of worker processes if any.
+
+    Returns:
+        - The backend instance.
+    """
+    backends = {"threads": ThreadBackend, "processes": ProcessBackend, "hybrid": HybridBackend}
+    if name not in backends:
+        raise ValueError(f"Unknown execution backend: {name}")
+    return backends[name](num_workers)
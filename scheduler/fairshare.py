@@ -0,0 +1,283 @@
+import heapq
+import itertools
+import time
+from queue import Empty, Queue
+from typing import Callable
+from models.job import Job
+
+DEFAULT_TENANT = "default"
+
+
+def parse_tenant_values(spec: str | dict | None) -> dict[str, float]:
+    """
+    Parse per-tenant values such as "Producer-0=2,Producer-1=1".
+
+    Args:
+        - spec: Comma-separated tenant=value pairs, a dictionary, or None.
+
+    Returns:
+        - Dictionary mapping each tenant to its value.
+
+    Raises:
+        - ValueError: If an entry is malformed or a value is not positive.
+    """
+    if not spec:
+        return {}
+    items = spec.items() if isinstance(spec, dict) else [entry.rpartition("=")[::2] for entry in spec.split(",")]
+    values = {}
+    for tenant, value in items:
+        if not str(tenant).strip():
+            raise ValueError(f"Invalid tenant value {spec!r}, expected tenant=value")
+        value = float(value)
+        if value <= 0:
+            raise ValueError(f"Value of tenant {tenant} must be positive: {value}")
+        values[str(tenant).strip()] = value
+    return values
+
+
+class Tenant:
+    """
+    Jobs and accounting of one tenant of a `FairShareQueue`.
+    """
+    __slots__ = ("name", "weight", "rate", "burst", "tokens", "refilled_at", "max_in_flight", "in_flight",
+                 "jobs", "finish", "state", "served", "throttled")
+
+    def __init__(self, name: str, weight: float, rate: float | None, max_in_flight: int | None) -> None:
+        self.name = name
+        self.weight = weight
+        self.rate = rate
+        self.burst = max(1.0, rate) if rate else 0.0
+        self.tokens = self.burst
+        self.refilled_at = time.monotonic()
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.jobs = []
+        self.finish = 0.0
+        self.state = "idle"
+        self.served = 0
+        self.throttled = 0
+
+    def refill(self, now: float) -> None:
+        if self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate)
+            self.refilled_at = now
+
+
+class FairShareQueue(Queue):
+    """
+    A `queue.Queue` of jobs with one sub-queue per tenant (`Job.tenant`), served by start-time fair queuing.
+
+    Every tenant has a virtual finish tag that advances by `1 / weight` per job it is handed, and the
+    tenant with the smallest tag goes next, so backlogged tenants receive jobs in proportion to their
+    weights however many jobs each one submitted. A tenant that was idle restarts from the current
+    virtual time instead of its old tag, so it cannot save up credit. Tenants are kept in a heap by tag:
+    `put` and `get` cost O(log tenants).
+
+    A tenant may also have a rate limit (jobs per second, token bucket with a burst of one second) and
+    a cap on its jobs in flight, from the moment they are handed out until `release`. A tenant over
+    either limit is skipped until it is back under it. The queue bound counts every queued job,
+    eligible or not.
+
+    Within a tenant, jobs are handed out by `key` (lowest first), or in arrival order without one.
+    Keys are computed when a job arrives.
+    """
+
+    def __init__(self, maxsize: int, key: Callable[[Job], tuple] | None = None, weights: dict | None = None,
+                 rates: dict | None = None, max_in_flight: dict | None = None) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            - maxsize: Maximum number of jobs that can be stored in the queue.
+            - key: Function returning the sort key of a job within its tenant, or None for arrival order.
+            - weights: Share of each tenant; tenants not listed have a weight of 1.
+            - rates: Maximum jobs per second handed out for each listed tenant.
+            - max_in_flight: Maximum jobs in flight for each listed tenant.
+        """
+        self.key = key
+        self.weights = weights or {}
+        self.rates = rates or {}
+        self.max_in_flight = {tenant: int(cap) for tenant, cap in (max_in_flight or {}).items()}
+        super().__init__(maxsize)
+
+    def _init(self, maxsize: int) -> None:
+        self.tenants = {}
+        self.active = []
+        self.throttled = []
+        self.counter = itertools.count()
+        self.virtual_time = 0.0
+        self.size = 0
+        self.running = {}
+
+    def _qsize(self) -> int:
+        return self.size
+
+    def tenant(self, name) -> Tenant:
+        """
+        Get the accounting of a tenant, creating it on first use. Called with the queue's mutex held.
+        """
+        tenant = self.tenants.get(name)
+        if tenant is None:
+            tenant = self.tenants[name] = Tenant(name, self.weights.get(name, 1.0), self.rates.get(name),
+                                                 self.max_in_flight.get(name))
+        return tenant
+
+    def _put(self, job: Job) -> None:
+        tenant = self.tenant(job.tenant or DEFAULT_TENANT)
+        heapq.heappush(tenant.jobs, (self.key(job) if self.key else (), next(self.counter), job))
+        self.size += 1
+        if tenant.state == "idle":
+            # A tenant coming back from idle cannot claim the share it did not use
+            tenant.finish = max(tenant.finish, self.virtual_time)
+            self._schedule(tenant, time.monotonic())
+
+    def _get(self) -> Job:
+        tag, _, tenant = heapq.heappop(self.active)
+        _, _, job = heapq.heappop(tenant.jobs)
+        self.size -= 1
+        self.virtual_time = tag
+        tenant.finish = tag + 1 / tenant.weight
+        tenant.served += 1
+        if tenant.rate:
+            tenant.tokens -= 1
+            if tenant.tokens < 1:
+                tenant.throttled += 1
+        self.running[job.job_id] = tenant.name
+        tenant.in_flight += 1
+        tenant.state = "idle"
+        self._schedule(tenant, time.monotonic())
+        return job
+
+    def _schedule(self, tenant: Tenant, now: float) -> None:
+        """
+        Put a tenant that is neither active nor throttled back where it belongs.
+        """
+        if not tenant.jobs:
+            tenant.state = "idle"
+        elif tenant.max_in_flight is not None and tenant.in_flight >= tenant.max_in_flight:
+            tenant.state = "capped"
+        else:
+            tenant.refill(now)
+            if tenant.rate and tenant.tokens < 1:
+                tenant.state = "throttled"
+                heapq.heappush(self.throttled, (now + (1 - tenant.tokens) / tenant.rate, next(self.counter), tenant))
+            else:
+                tenant.state = "active"
+                heapq.heappush(self.active, (tenant.finish, next(self.counter), tenant))
+
+    def _available(self) -> float | None:
+        """
+        Activate the throttled tenants whose rate limit allows a job again.
+
+        Returns:
+            - 0 if a job can be handed out now, otherwise the seconds until the next throttled tenant
+                may be served, or None if no tenant is throttled.
+        """
+        now = time.monotonic()
+        while self.throttled and self.throttled[0][0] <= now:
+            _, _, tenant = heapq.heappop(self.throttled)
+            tenant.state = "idle"
+            self._schedule(tenant, now)
+        if self.active:
+            return 0
+        return self.throttled[0][0] - now if self.throttled else None
+
+    def get_many(self, max_n: int, block: bool = True, timeout: float | None = None) -> list[Job]:
+        """
+        Remove up to `max_n` jobs that may be handed out, fairly across tenants.
+
+        Args:
+            - max_n: Maximum number of jobs to return.
+            - block: Wait until a job may be handed out.
+            - timeout: Maximum number of seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            - List of jobs, empty if none could be handed out in time.
+        """
+        with self.not_empty:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                wait = self._available()
+                if wait == 0:
+                    break
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    wait = remaining if wait is None else min(wait, remaining)
+                if not block or (wait is not None and wait <= 0):
+                    return []
+                self.not_empty.wait(wait)
+
+            jobs = []
+            while len(jobs) < max_n and self._available() == 0:
+                jobs.append(self._get())
+            self.not_full.notify(len(jobs))
+            return jobs
+
+    def get(self, block: bool = True, timeout: float | None = None) -> Job:
+        jobs = self.get_many(1, block, timeout)
+        if not jobs:
+            raise Empty
+        return jobs[0]
+
+    def reprioritize(self, job_ids: set) -> None:
+        """
+        Keep the order of queued jobs: keys within a tenant are fixed when a job arrives.
+        """
+
+    def started(self, job: Job) -> None:
+        """
+        Count a job handed out earlier as in flight again, e.g. once a job parked on its dependencies
+        is ready. Does nothing if it is already counted.
+
+        Args:
+            - job: The job that became ready.
+        """
+        with self.mutex:
+            if job.job_id in self.running:
+                return
+            name = job.tenant or DEFAULT_TENANT
+            self.running[job.job_id] = name
+            self.tenant(name).in_flight += 1
+
+    def release(self, jobs: list[Job]) -> None:
+        """
+        Stop counting jobs as in flight: they finished, failed, were cancelled, or are parked on their
+        dependencies, so that a capped tenant does not wait on its own blocked jobs.
+
+        Args:
+            - jobs: The jobs.
+        """
+        with self.mutex:
+            now = time.monotonic()
+            for job in jobs:
+                name = self.running.pop(job.job_id, None)
+                if name is None:
+                    continue
+                tenant = self.tenants[name]
+                tenant.in_flight -= 1
+                if tenant.state == "capped":
+                    self._schedule(tenant, now)
+                    if tenant.state == "active":
+                        self.not_empty.notify()
+
+    def metrics(self) -> dict:
+        """
+        Get per-tenant metrics.
+
+        Returns:
+            - Dictionary mapping each tenant to its weight, queued jobs, jobs in flight, jobs handed out
+                ("served"), the number of times it hit its rate limit ("throttled") and its current state
+                ("active", "idle", "throttled" or "capped").
+        """
+        with self.mutex:
+            return {
+                name: {
+                    "weight": tenant.weight,
+                    "queued": len(tenant.jobs),
+                    "in_flight": tenant.in_flight,
+                    "served": tenant.served,
+                    "throttled": tenant.throttled,
+                    "state": tenant.state,
+                }
+                for name, tenant in self.tenants.items()
+            }
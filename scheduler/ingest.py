@@ -0,0 +1,174 @@
+import json
+import shlex
+import subprocess
+import sys
+import threading
+from typing import IO
+from models.job import Job
+from scheduler.deadlock import DependencyCycleError
+from scheduler.queue import JobQueue
+from scheduler.resources import parse_resources
+from utils.logger import get_logger
+from utils.tracing import trace_span
+
+logger = get_logger(__name__)
+
+
+def run_command(command: str | list) -> None:
+    """
+    Run a job's shell command, raising if it exits with a non-zero status.
+
+    Args:
+        - command: Command line, or list of program arguments.
+    """
+    args = shlex.split(command) if isinstance(command, str) else command
+    subprocess.run(args, check=True)
+
+
+def parse_job(record: dict, line_number: int) -> Job:
+    """
+    Build a job from one manifest record.
+
+    Recognized keys: "id" (or "job_id"), "duration" (or "execution_time", in seconds),
+    "command" (string or argument list, run instead of sleeping), "dependencies", "priority",
+    "retries" (number of retries after a failure), "timeout" (in seconds), "resources"
+    (an object such as {"cpu": 2, "memory": 512}, or a string such as "cpu=2,memory=512") and "tenant".
+    A record without an ID is named after its line number.
+
+    Args:
+        - record: The decoded JSON object.
+        - line_number: Line of the record in the manifest, starting at 1.
+
+    Returns:
+        - The job.
+    """
+    job_id = record.get("id", record.get("job_id", f"line-{line_number}"))
+    command = record.get("command")
+    return Job(
+        job_id=job_id,
+        execution_time=record.get("duration", record.get("execution_time", 0)),
+        dependencies=list(record.get("dependencies", ())),
+        priority=record.get("priority", 0),
+        func=run_command if command else None,
+        args=(command,) if command else (),
+        max_retries=record.get("retries"),
+        timeout=record.get("timeout"),
+        resources=parse_resources(record.get("resources")) or None,
+        tenant=record.get("tenant"),
+    )
+
+
+class StreamProducer(threading.Thread):
+    """
+    A producer thread that streams jobs from a JSON-lines manifest into the queue.
+
+    The manifest is read one line at a time and every job is handed to the queue right away,
+    so job objects are bounded by the queue size rather than by the manifest. The ID of every job
+    is still kept in `seen`, to tell forward references (to jobs later in the file) from dependencies
+    that never appear, so memory grows with the number of jobs unless `track_missing` is off.
+    """
+
+    def __init__(self, queue: JobQueue, source: str | IO, producer_id: int = 0, batch_size: int = 1,
+                 track_missing: bool = True) -> None:
+        """
+        Initialize the producer.
+
+        Args:
+            - queue: The shared job queue.
+            - source: Path of the manifest, "-" for standard input, or an open text stream.
+            - producer_id: Unique identifier for this producer.
+            - batch_size: Number of jobs submitted to the queue at once.
+            - track_missing: Keep the IDs of all ingested jobs to report dependencies that never appear
+                and skip duplicate jobs. Turn off for endless streams whose jobs only depend on jobs
+                before them, so that memory stays flat.
+        """
+        super().__init__()
+        self.queue = queue
+        self.source = source
+        self.producer_id = producer_id
+        self.batch_size = batch_size
+        self.track_missing = track_missing
+        self.seen = set()
+        self.missing = set()
+        self.rejected = set()
+        self.line_count = 0
+        self.job_count = 0
+        # Streamed jobs are not kept; see `JobManager` for how cycles are handled instead
+        self.generated_jobs = []
+
+    def run(self) -> None:
+        """
+        Read the manifest and add its jobs to the queue.
+        """
+        with trace_span("StreamProducer.run", args={"producer_id": self.producer_id}):
+            if isinstance(self.source, str):
+                if self.source == "-":
+                    self.ingest(sys.stdin)
+                else:
+                    with open(self.source, encoding="utf-8") as stream:
+                        self.ingest(stream)
+            else:
+                self.ingest(self.source)
+
+        if self.missing:
+            logger.warning("Producer %s: %s dependencies never defined in the manifest: %s",
+                           self.producer_id, len(self.missing), sorted(map(str, self.missing))[:10])
+        if self.rejected:
+            logger.warning("Producer %s: %s jobs rejected for closing a dependency cycle; their dependents are cancelled.",
+                           self.producer_id, len(self.rejected))
+        logger.info("Producer %s ingested %s jobs from %s lines.", self.producer_id, self.job_count, self.line_count)
+
+    def ingest(self, stream: IO) -> None:
+        """
+        Parse a stream line by line and submit the jobs, one at a time or in batches.
+
+        Args:
+            - stream: Text stream with one JSON object per line. Blank lines are skipped.
+        """
+        batch = []
+        for line_number, line in enumerate(stream, start=1):
+            self.line_count = line_number
+            if not line.strip():
+                continue
+            try:
+                job = parse_job(json.loads(line), line_number)
+            except (ValueError, TypeError, AttributeError) as e:
+                logger.error("Producer %s: skipping line %s: %s", self.producer_id, line_number, e)
+                continue
+
+            if self.track_missing:
+                if job.job_id in self.seen:
+                    logger.error("Producer %s: skipping duplicate job %s on line %s", self.producer_id, job.job_id, line_number)
+                    continue
+                self.seen.add(job.job_id)
+                self.missing.discard(job.job_id)
+                for dep_id in job.dependencies:
+                    if dep_id not in self.seen:
+                        self.missing.add(dep_id)
+
+            if self.batch_size > 1:
+                batch.append(job)
+                if len(batch) >= self.batch_size:
+                    self.submit_batch(batch)
+                    batch = []
+            else:
+                try:
+                    self.queue.put(job)
+                    self.job_count += 1
+                except DependencyCycleError as e:
+                    self.rejected.add(job.job_id)
+                    logger.error("Producer %s rejected job: %s", self.producer_id, e)
+
+        if batch:
+            self.submit_batch(batch)
+
+    def submit_batch(self, batch: list[Job]) -> None:
+        """
+        Submit a batch of jobs to the queue.
+
+        Args:
+            - batch: The jobs to submit.
+        """
+        rejected = self.queue.put_many(batch)
+        self.rejected.update(job.job_id for job in rejected)
+        self.job_count += len(batch) - len(rejected)
@@ -1,9 +1,19 @@
 import threading
 from scheduler.queue import JobQueue
 from scheduler.producer import Producer
+from scheduler.ingest import StreamProducer
 from scheduler.consumer import Consumer
+from scheduler.stealing import WorkStealingConsumer
+from scheduler.distributed import DistributedConsumer
+from scheduler.autoscaler import Autoscaler
 from utils.logger import get_logger
 from scheduler.deadlock import DeadlockHandler
+from scheduler.metrics import StatsReporter
+from scheduler.journal import Journal
+from scheduler.dependency import CompletionWindow
+from scheduler.results import ResultStore
+from scheduler.cache import ResultCache
+from models.job import Job
 import random
 
 
@@ -14,68 +24,311 @@ class JobManager:
     Orchestrates the job scheduling system, managing producers, consumers, and the job queue.
     """
 
-    def __init__(self, num_producers: int, num_consumers: int, jobs_per_producer: int, queue_size: int, dependency_chance: float) -> None:
+    def __init__(self, num_producers: int, num_consumers: int, jobs_per_producer: int, queue_size: int, dependency_chance: float,
+                 scheduling_policy: str = "fifo", cycle_check: str = "off", deadlock_policy: str = "newest",
+                 backend: str = "threads", chunk_size: int = 1, batch_size: int = 1,
+                 in_flight_per_worker: int = 1, seed: int | None = None, time_scale: float = 1.0,
+                 stats_interval: float = 1.0, stats_path: str | None = None, stats_format: str = "json",
+                 source: str | None = None, journal_path: str | None = None, journal_sync: str = "group",
+                 journal_snapshot_every: int = 10_000, service: bool = False, retain_completed: int = 1000,
+                 dependency_window: int = 100, cache_bytes: int = 0, cache_dir: str | None = None,
+                 work_stealing: bool = False, min_consumers: int | None = None, max_consumers: int | None = None,
+                 autoscale_interval: float = 0.5, max_retries: int = 0, retry_backoff: float = 0.1,
+                 job_timeout: float | None = None, resources: dict | None = None, fair_share: bool = False,
+                 tenant_weights: dict | None = None, tenant_rates: dict | None = None,
+                 tenant_max_in_flight: dict | None = None, listen: tuple[str, int] | str | None = None,
+                 authkey: bytes | None = None, heartbeat_timeout: float = 5.0) -> None:
         """
         Initialize the JobManager with the required components.
         
         Args:
             - num_producers: Number of producer threads.
-            - num_consumers: Number of consumer threads.
+            - num_consumers: Number of consumer threads; with the "distributed" backend, number of worker
+                processes started on this machine.
             - jobs_per_producer: Number of jobs each producer will generate.
             - queue_size: Maximum size of the job queue.
             - dependency_chance: Chance of jobs having dependencies.
+            - scheduling_policy: Order in which queued jobs run ("fifo", "critical-path" or "priority").
+            - cycle_check: Submit-time cycle handling ("off", "reject" or "drop").
+                When enabled, the full deadlock pass after the producers finish is skipped.
+            - deadlock_policy: Which edge of a dependency cycle to remove ("newest", "lowest-priority" or "cheapest").
+            - backend: Where jobs execute ("threads", "processes", "hybrid" or "distributed": worker
+                processes connected to this scheduler, see `DistributedConsumer`).
+            - chunk_size: Maximum number of jobs shipped to a worker process at once.
+            - batch_size: Number of jobs producers submit and the consumer drains per queue operation.
+            - in_flight_per_worker: Maximum number of jobs in flight per consumer worker.
+            - seed: Seed for generating jobs, so runs are reproducible.
+            - time_scale: Factor applied to job execution times and production delays (0: no sleeping).
+            - stats_interval: Seconds between two aggregations (and exports) of the job metrics.
+            - stats_path: File the stats are exported to every interval, or None to disable exporting.
+            - stats_format: Export format, "prometheus" (text exposition format) or "json".
+            - source: JSON-lines manifest to stream jobs from ("-" for standard input) instead of
+                generating random jobs; `num_producers` and `jobs_per_producer` are then ignored.
+                Streamed jobs are not kept in memory, so the deadlock pass after the producers finish
+                cannot run and cycle checking "off" is replaced by "drop".
+            - journal_path: Write-ahead journal of submissions and completions, or None for none.
+                If the journal exists, its completed jobs are not run again and its pending jobs are resubmitted.
+            - journal_sync: When journal writes are fsynced: "group" (batched), "always" or "none".
+            - journal_snapshot_every: Number of journal records between two snapshots.
+            - service: Prepare for `serve` instead of `start`. Jobs may then only depend on jobs submitted
+                before them, so no dependency cycle can form: cycle checking is turned off and no job is kept
+                for a deadlock pass. Finished jobs are reclaimed right away (see `CompletionWindow`), so
+                memory stays flat however many jobs pass through. A journal still keeps every job ID.
+            - retain_completed: In service mode, number of recently completed job IDs kept for `get_completed_jobs`,
+                and of recently failed or cancelled jobs kept for `get_failed_jobs`.
+            - dependency_window: In service mode, number of recent jobs each producer picks dependencies from.
+            - cache_bytes: Memory for cached job results (see `ResultCache`). 0 disables the cache unless
+                `cache_dir` is given.
+            - cache_dir: Directory of an on-disk result cache that persists across runs, or None.
+            - work_stealing: Use per-worker deques with work stealing (see `WorkStealingConsumer`)
+                instead of a dispatcher thread and a shared ready queue. `in_flight_per_worker` is then ignored.
+            - min_consumers: Enables autoscaling (see `Autoscaler`) together with `max_consumers`: smallest
+                number of consumer workers. `num_consumers` is then the initial number. Defaults to 1.
+            - max_consumers: Largest number of consumer workers when autoscaling. Defaults to `num_consumers`.
+            - autoscale_interval: Seconds between two autoscaling decisions.
+            - max_retries: Retries of failed jobs that do not set `Job.max_retries`. Once a job has failed
+                for good, every job depending on it is cancelled, so the run still finishes.
+            - retry_backoff: Seconds before the first retry; the delay doubles with every attempt.
+            - job_timeout: Timeout in seconds of jobs that do not set `Job.timeout`, or None.
+            - resources: Capacity of the resources jobs declare in `Job.resources`, e.g. {"cpu": 4, "memory": 8192}.
+                Ready jobs are packed against it (see `ResourcePool`); a job requiring more than the capacity fails.
+                None ignores job requirements.
+            - fair_share: Share the consumers fairly between tenants (`Job.tenant`; every generated job
+                belongs to its producer, e.g. "Producer-0") instead of serving the queue in one order
+                (see `FairShareQueue`).
+            - tenant_weights: With fair share, share of each tenant (default 1).
+            - tenant_rates: With fair share, maximum jobs per second taken off the queue for each listed tenant.
+            - tenant_max_in_flight: With fair share, maximum jobs in flight for each listed tenant.
+            - listen: With the "distributed" backend, address workers connect to: (host, port) or the path
+                of a Unix domain socket. Defaults to a free port on 127.0.0.1.
+            - authkey: With the "distributed" backend, secret workers must present, or None for a random one.
+            - heartbeat_timeout: With the "distributed" backend, seconds without a heartbeat after which
+                a worker's leased jobs are dispatched again.
+
+        Results of jobs with a `func` are handed to dependents created with `pass_results` (see `ResultStore`).
+        With a process backend, large buffers are passed through shared memory. A result is freed once every job
+        submitted so far that depends on it has finished, as soon as the producers are done, or right away in
+        service mode, where a dependent submitted after its dependency completed receives None.
         """
+        if service:
+            cycle_check = "off"
+        elif source is not None and cycle_check == "off":
+            cycle_check = "drop"
+
+        self.service = service
+        self.journal = None
+        self.recovered_jobs = []
+        self.completed_jobs = CompletionWindow(retain_completed) if service else set()
+        if journal_path is not None:
+            self.journal = Journal(journal_path, sync=journal_sync, snapshot_every=journal_snapshot_every)
+            self.recovered_jobs = self.journal.pending_jobs()
+            if not service:
+                self.completed_jobs.update(self.journal.completed)
 
-        self.queue = JobQueue(maxsize=queue_size)
-        self.completed_jobs = set()
+        self.results = ResultStore(sealed=service, shared=backend in ("processes", "hybrid"))
+        self.cache = None
+        if cache_bytes > 0 or cache_dir is not None:
+            self.cache = ResultCache(max_bytes=cache_bytes, path=cache_dir)
+        self.queue = JobQueue(maxsize=queue_size, policy=scheduling_policy, cycle_check=cycle_check, journal=self.journal,
+                              completion_window=self.completed_jobs if service else None, results=self.results,
+                              fair_share=fair_share, tenant_weights=tenant_weights, tenant_rates=tenant_rates,
+                              tenant_max_in_flight=tenant_max_in_flight)
         self.completed_jobs_lock = threading.Lock()
-        self.producers = [
-            Producer(self.queue, jobs_per_producer, producer_id=i, max_execution_time=random.randint(1, 3), dependency_chance=dependency_chance)
-            for i in range(num_producers)
-        ]
-        self.consumer = Consumer(
-            self.queue, num_workers=num_consumers, completed_jobs=self.completed_jobs, completed_jobs_lock=self.completed_jobs_lock
+        rng = random.Random(seed)
+        if source is not None:
+            self.producers = [StreamProducer(self.queue, source, batch_size=batch_size, track_missing=not service)]
+        else:
+            self.producers = [
+                Producer(self.queue, jobs_per_producer, producer_id=i, max_execution_time=rng.randint(1, 3), dependency_chance=dependency_chance,
+                         batch_size=batch_size, seed=None if seed is None else rng.getrandbits(32), time_scale=time_scale,
+                         history=dependency_window if service else None)
+                for i in range(num_producers)
+            ]
+        autoscale = min_consumers is not None or max_consumers is not None
+        if autoscale:
+            if work_stealing:
+                raise ValueError("Autoscaling is not supported with work stealing")
+            min_consumers = min_consumers or 1
+            max_consumers = max_consumers or num_consumers
+            num_consumers = min(max(num_consumers, min_consumers), max_consumers)
+        if resources and work_stealing:
+            raise ValueError("Resource requirements are not supported with work stealing")
+        options = {}
+        if backend == "distributed":
+            if autoscale or work_stealing or resources:
+                raise ValueError("Autoscaling, work stealing and resources are not supported with distributed workers")
+            consumer_class = DistributedConsumer
+            options = dict(authkey=authkey, heartbeat_timeout=heartbeat_timeout)
+            if listen is not None:
+                options["address"] = listen
+        else:
+            consumer_class = WorkStealingConsumer if work_stealing else Consumer
+        self.consumer = consumer_class(
+            self.queue, num_workers=num_consumers, completed_jobs=self.completed_jobs, completed_jobs_lock=self.completed_jobs_lock,
+            backend=backend, chunk_size=chunk_size, batch_size=batch_size,
+            in_flight_per_worker=in_flight_per_worker, cache=self.cache, max_workers=max_consumers,
+            max_retries=max_retries, retry_backoff=retry_backoff, timeout=job_timeout, resources=resources, **options
         )
+        self.autoscaler = None
+        if autoscale:
+            self.autoscaler = Autoscaler(self.consumer, min_workers=min_consumers, max_workers=max_consumers,
+                                         interval=autoscale_interval)
+        self.deadlock_policy = deadlock_policy
         self.all_jobs = []
+        self.reporter = StatsReporter(self.stats, interval=stats_interval, path=stats_path, fmt=stats_format)
+        self.stopped = threading.Event()
 
     def start(self) -> None:
         """
         Start the producers and consumers.
         """
         logger.info("Starting job scheduler...")
+        self._launch()
 
-        consumer_thread = threading.Thread(target=self.consumer.start, daemon=True)
-        consumer_thread.start()
-        logger.info("Consumer pool started.")
-        
+
+        # Wait for all producers to finish
         for producer in self.producers:
-            producer.start()
-            logger.info(f"Producer-{producer.producer_id} started.")
+            producer.join()
+            logger.info(f"Producer-{producer.producer_id} finished.")
+            # Jobs the journal skipped as already known were never queued (see `JobQueue.put`)
+            self.all_jobs.extend(job for job in producer.generated_jobs if job.submitted_at is not None)
+            if isinstance(producer, StreamProducer) and producer.missing:
+                self.consumer.drop_dependencies(producer.missing)
+        self.results.seal()
 
+        if self.queue.cycle_detector is None:
+            deadlocked_jobs = DeadlockHandler.detect_deadlock(self.all_jobs)
+            if deadlocked_jobs:
+                removed = DeadlockHandler.break_cycles(self.all_jobs, self.deadlock_policy)
+                self.consumer.release({job_id for _, job_id in removed})
+        else:
+            # Cycles were handled on submission; dependencies on jobs that never appeared remain
+            known = {job.job_id for job in self.all_jobs}
+            with self.completed_jobs_lock:
+                dangling = {dep for job in self.all_jobs for dep in job.dependencies
+                            if dep not in known and dep not in self.completed_jobs and dep not in self.consumer.failures}
+            if dangling:
+                logger.warning("Dropping %s dependencies on jobs that were never submitted: %s",
+                               len(dangling), sorted(map(str, dangling))[:10])
+                self.consumer.drop_dependencies(dangling)
+
+        self._drain()
+        logger.info("Job scheduler completed.")
+
+    def serve(self, stop_when_done: bool = False) -> None:
+        """
+        Run as a long-lived service until `stop` is called, scheduling jobs from the producers and
+        from `submit` as they arrive. After `stop`, waits for the producers and every accepted job to finish.
+
+        Args:
+            - stop_when_done: Stop by itself once every producer has finished.
+        """
+        logger.info("Starting job scheduler service...")
+        self._launch()
+        if stop_when_done:
+            for producer in self.producers:
+                producer.join()
+            self.stop()
+        self.stopped.wait()
 
-        # Wait for all producers to finish
         for producer in self.producers:
             producer.join()
             logger.info(f"Producer-{producer.producer_id} finished.")
-            self.all_jobs.extend(producer.generated_jobs)
+        self._drain()
+        logger.info("Job scheduler service stopped.")
+
+    def submit(self, job: Job) -> None:
+        """
+        Submit a job to the running scheduler. Blocks while the queue is full.
+
+        Args:
+            - job: The job to schedule. In service mode, it may only depend on jobs submitted before it.
+        """
+        self.queue.put(job)
+
+    def stop(self) -> None:
+        """
+        Ask `serve` to stop once the producers and the accepted jobs have finished.
+        """
+        self.stopped.set()
+
+    def _launch(self) -> None:
+        self.reporter.start()
+        if self.autoscaler:
+            self.autoscaler.start()
+
+        consumer_thread = threading.Thread(target=self.consumer.start, daemon=True)
+        consumer_thread.start()
+        logger.info("Consumer pool started.")
 
-        deadlocked_jobs = DeadlockHandler.detect_deadlock(self.all_jobs)
-        if deadlocked_jobs:
-            DeadlockHandler.resolve_deadlock(deadlocked_jobs, self.all_jobs)
+        if self.recovered_jobs:
+            logger.info("Resubmitting %s jobs recovered from the journal.", len(self.recovered_jobs))
+            self.queue.put_many(self.recovered_jobs)
+            if not self.service:
+                self.all_jobs.extend(self.recovered_jobs)
+            self.recovered_jobs = []
+
+        for producer in self.producers:
+            producer.start()
+            logger.info(f"Producer-{producer.producer_id} started.")
 
+    def _drain(self) -> None:
         # Wait for all jobs in the queue to be processed
         self.queue.queue.join()
 
+        if self.autoscaler:
+            self.autoscaler.stop()
         self.consumer.shutdown()
-        logger.info("Job scheduler completed.")
+        self.results.close()
+        if self.journal:
+            self.journal.close()
+        self.reporter.stop()
+        logger.info(f"Flow control: queue {self.queue.metrics()}, consumer {self.consumer.metrics()}")
+
+    def stats(self) -> dict:
+        """
+        Get a snapshot of the scheduler's metrics. Safe to call while the scheduler runs.
+
+        Returns:
+            - Dictionary with the per-job lifecycle metrics ("jobs"), the intake queue metrics
+                ("queue"), the consumer pool's flow-control metrics ("consumer"), the result store
+                metrics ("results") and, with a journal, a result cache, autoscaling or resources,
+                their metrics ("journal", "cache", "autoscaler", "resources").
+        """
+        stats = {
+            "jobs": self.consumer.stats.snapshot(),
+            "queue": self.queue.metrics(),
+            "consumer": self.consumer.metrics(),
+            "results": self.results.metrics(),
+        }
+        if self.journal:
+            stats["journal"] = self.journal.metrics()
+        if self.cache:
+            stats["cache"] = self.cache.metrics()
+        if self.autoscaler:
+            stats["autoscaler"] = self.autoscaler.metrics()
+        resources = self.consumer.resource_metrics()
+        if resources is not None:
+            stats["resources"] = resources
+        return stats
 
     def get_completed_jobs(self):
         """
         Get a list of all completed jobs.
 
         Returns:
-            A sorted list of completed job IDs.
+            A sorted list of completed job IDs. In service mode, only the most recently completed ones.
         """
         with self.completed_jobs_lock:
             return sorted(self.completed_jobs)
 
+    def get_failed_jobs(self) -> dict:
+        """
+        Get the jobs that failed for good or were cancelled because a dependency failed.
+        In service mode, only the most recent ones are kept.
+
+        Returns:
+            - Dictionary mapping each job ID to its last error.
+        """
+        return dict(self.consumer.failures)
+
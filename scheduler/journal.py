@@ -0,0 +1,319 @@
+import importlib
+import json
+import os
+import threading
+from models.job import Job
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SYNC_MODES = ("group", "always", "none")
+
+
+def job_to_record(job: Job) -> dict:
+    """
+    Serialize a job for the journal. A job's callable is stored by its import path.
+
+    Args:
+        - job: The job to serialize.
+
+    Returns:
+        - JSON-compatible dictionary.
+    """
+    record = {
+        "id": job.job_id,
+        "execution_time": job.execution_time,
+        "dependencies": list(job.dependencies),
+        "priority": job.priority,
+    }
+    if job.max_retries is not None:
+        record["max_retries"] = job.max_retries
+    if job.timeout is not None:
+        record["timeout"] = job.timeout
+    if job.resources:
+        record["resources"] = job.resources
+    if job.tenant is not None:
+        record["tenant"] = job.tenant
+    if job.func is not None:
+        record["func"] = f"{job.func.__module__}:{job.func.__qualname__}"
+        record["args"] = list(job.args)
+    return record
+
+
+def job_from_record(record: dict) -> Job:
+    """
+    Rebuild a job written by `job_to_record`.
+
+    Args:
+        - record: The journal record.
+
+    Returns:
+        - The job.
+    """
+    func = None
+    if record.get("func"):
+        module, _, name = record["func"].partition(":")
+        func = importlib.import_module(module)
+        for attribute in name.split("."):
+            func = getattr(func, attribute)
+    return Job(
+        job_id=record["id"],
+        execution_time=record["execution_time"],
+        dependencies=record["dependencies"],
+        priority=record.get("priority", 0),
+        func=func,
+        args=tuple(record.get("args", ())),
+        max_retries=record.get("max_retries"),
+        timeout=record.get("timeout"),
+        resources=record.get("resources"),
+        tenant=record.get("tenant"),
+    )
+
+
+class Journal:
+    """
+    Append-only write-ahead journal of job submissions and completions.
+
+    Every record is one JSON line. A submission is durable before the job is queued and a
+    completion before its dependents are released, so a restarted scheduler neither loses
+    submitted jobs nor reruns completed ones. With "group" sync, the first caller with unwritten
+    records writes and fsyncs everything buffered so far; records arriving meanwhile share the next fsync.
+
+    Every `snapshot_every` records the pending and completed state is written to `<path>.snapshot`
+    and the log is truncated, so recovery replays a bounded log.
+    """
+
+    def __init__(self, path: str, sync: str = "group", snapshot_every: int = 10_000) -> None:
+        """
+        Open the journal, recovering the state of an existing one.
+
+        Args:
+            - path: Path of the log file.
+            - sync: "group" (one fsync per group of concurrent appends), "always" (fsync every append)
+                or "none" (leave flushing to the operating system).
+            - snapshot_every: Number of records after which the state is snapshotted and the log truncated.
+        """
+        if sync not in SYNC_MODES:
+            raise ValueError(f"Unknown journal sync mode: {sync}")
+
+        self.path = path
+        self.snapshot_path = f"{path}.snapshot"
+        self.sync = sync
+        self.snapshot_every = snapshot_every
+        self.pending = {}
+        self.completed = set()
+        self.cond = threading.Condition(threading.Lock())
+        self.buffer = []
+        self.appended_seq = 0
+        self.durable_seq = 0
+        self.since_snapshot = 0
+        self.fsync_count = 0
+        self.record_count = 0
+        self.snapshot_count = 0
+        self.flushing = False
+        self.closed = False
+        self.error = None
+
+        self._recover()
+        # Submissions of recovered pending jobs are accepted once more without being logged again
+        self.recovering = set(self.pending)
+        self._write_snapshot(self._state())
+        self.file = open(self.path, "w", encoding="utf-8")
+
+    def pending_jobs(self) -> list[Job]:
+        """
+        Get the jobs that were submitted but had not completed when the journal was opened or since.
+
+        Returns:
+            - List of rebuilt jobs, in submission order.
+        """
+        with self.cond:
+            records = list(self.pending.values())
+        return [job_from_record(record) for record in records]
+
+    def submit(self, jobs: list[Job]) -> list[Job]:
+        """
+        Durably record submitted jobs. Jobs whose ID the journal already holds are skipped,
+        so a restarted producer can regenerate its jobs without running them twice.
+
+        Args:
+            - jobs: The submitted jobs.
+
+        Returns:
+            - List of the jobs that should be queued.
+        """
+        accepted, records = [], []
+        with self.cond:
+            for job in jobs:
+                job_id = job.job_id
+                if job_id in self.recovering:
+                    self.recovering.discard(job_id)
+                    accepted.append(job)
+                elif job_id not in self.pending and job_id not in self.completed:
+                    record = {"op": "submit", "job": job_to_record(job)}
+                    self._apply(record)
+                    records.append(record)
+                    accepted.append(job)
+                else:
+                    logger.info("Skipping job %s: already in the journal.", job_id)
+            if records:
+                self._append(records)
+        return accepted
+
+    def complete(self, job_id) -> None:
+        """
+        Durably record a completed job.
+
+        Args:
+            - job_id: ID of the job that finished.
+        """
+        record = {"op": "complete", "id": job_id}
+        with self.cond:
+            self._apply(record)
+            self._append([record])
+
+    def metrics(self) -> dict:
+        """
+        Get journal metrics.
+
+        Returns:
+            - Dictionary with the number of records, fsync calls and snapshots written,
+                and the number of pending and completed jobs.
+        """
+        with self.cond:
+            return {
+                "records": self.record_count,
+                "fsyncs": self.fsync_count,
+                "snapshots": self.snapshot_count,
+                "pending": len(self.pending),
+                "completed": len(self.completed),
+            }
+
+    def close(self) -> None:
+        """
+        Close the log. Every append has been made durable before it returned.
+        """
+        with self.cond:
+            if not self.closed:
+                self.closed = True
+                self.file.close()
+
+    def _apply(self, record: dict) -> None:
+        if record["op"] == "submit":
+            job_id = record["job"]["id"]
+            if job_id not in self.completed:
+                self.pending[job_id] = record["job"]
+        else:
+            self.pending.pop(record["id"], None)
+            self.completed.add(record["id"])
+
+    def _append(self, records: list[dict]) -> None:
+        """
+        Write records and wait until they are durable. Must be called with the condition held.
+        """
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        self.record_count += len(records)
+        self.since_snapshot += len(records)
+
+        if self.sync != "group":
+            self.file.write(lines)
+            self.file.flush()
+            if self.sync == "always":
+                os.fsync(self.file.fileno())
+                self.fsync_count += 1
+            if self.since_snapshot >= self.snapshot_every:
+                self._compact()
+            return
+
+        self.buffer.append(lines)
+        self.appended_seq += 1
+        seq = self.appended_seq
+        while self.durable_seq < seq:
+            if self.error:
+                raise self.error
+            if self.flushing:
+                self.cond.wait()
+            else:
+                self._flush()
+
+    def _flush(self) -> None:
+        """
+        Become the leader of a group commit: write and fsync everything buffered so far, with the
+        condition released so that other callers keep buffering records for the next group.
+        Must be called with the condition held.
+        """
+        self.flushing = True
+        lines, self.buffer = self.buffer, []
+        seq = self.appended_seq
+        self.cond.release()
+        try:
+            self.file.write("".join(lines))
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        except OSError as e:
+            logger.error("Journal write failed: %s", e)
+            self.error = e
+        finally:
+            self.cond.acquire()
+            self.flushing = False
+            self.cond.notify_all()
+
+        if self.error:
+            raise self.error
+        self.fsync_count += 1
+        self.durable_seq = seq
+        if self.since_snapshot >= self.snapshot_every:
+            self._compact()
+
+    def _state(self) -> dict:
+        self.since_snapshot = 0
+        return {"completed": list(self.completed), "pending": list(self.pending.values())}
+
+    def _compact(self) -> None:
+        """
+        Snapshot the state and start an empty log. Must be called with the condition held and
+        nothing left to write. Records still buffered are part of the snapshot and are written
+        to the new log as well, which is harmless because replaying them is idempotent.
+        """
+        self._write_snapshot(self._state())
+        self.file.close()
+        self.file = open(self.path, "w", encoding="utf-8")
+
+    def _write_snapshot(self, state: dict) -> None:
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            if self.sync != "none":
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self.snapshot_count += 1
+
+    def _recover(self) -> None:
+        """
+        Load the last snapshot and replay the log written after it. A torn last line is ignored.
+        """
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.completed.update(state["completed"])
+            for record in state["pending"]:
+                self.pending[record["id"]] = record
+
+        if not os.path.exists(self.path):
+            return
+
+        replayed = 0
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning("Ignoring torn journal record after %s records.", replayed)
+                    break
+                self._apply(record)
+                replayed += 1
+
+        if self.pending or self.completed:
+            logger.info("Recovered %s pending and %s completed jobs from %s (%s log records).",
+                        len(self.pending), len(self.completed), self.path, replayed)
@@ -0,0 +1,359 @@
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from models.job import Job
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EXPORT_FORMATS = ("prometheus", "json")
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Histogram name -> (start timestamp, end timestamp, description)
+PHASES = {
+    "dependency_wait": ("submitted_at", "ready_at", "Seconds from submission until all dependencies completed"),
+    "queue_wait": ("ready_at", "started_at", "Seconds from ready until a worker started the job"),
+    "execution": ("started_at", "finished_at", "Seconds spent executing the job"),
+    "turnaround": ("submitted_at", "finished_at", "Seconds from submission until the job finished"),
+}
+
+
+class Histogram:
+    """
+    Cumulative latency histogram with fixed bucket bounds, as exported by Prometheus.
+    """
+
+    def __init__(self, buckets: tuple = BUCKETS) -> None:
+        """
+        Initialize an empty histogram.
+
+        Args:
+            - buckets: Sorted upper bounds of the buckets; an implicit +Inf bucket is added.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, fraction: float) -> float:
+        """
+        Estimate a quantile as the upper bound of the bucket it falls in.
+
+        Args:
+            - fraction: The quantile, between 0 and 1.
+
+        Returns:
+            - The estimate, capped at the largest observed value.
+        """
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+        }
+
+
+class JobStats:
+    """
+    Collects per-job lifecycle metrics of a consumer pool.
+
+    Recording a job only appends it to a deque, so the worker threads do no bookkeeping of their own.
+    The histograms are updated by `aggregate`, which is called from a background thread
+    (see `StatsReporter`) or before a snapshot is taken.
+    """
+
+    def __init__(self, num_workers: int) -> None:
+        """
+        Initialize the collector.
+
+        Args:
+            - num_workers: Number of workers whose utilization is reported.
+        """
+        self.num_workers = num_workers
+        self.started = time.perf_counter()
+        self.stopped = None
+        self.finished = deque()
+        self.failed = deque()
+        self.lock = threading.Lock()
+        self.histograms = {name: Histogram() for name in PHASES}
+        self.completed_count = 0
+        self.failed_count = 0
+        self.retried_count = 0
+        self.cancelled_count = 0
+        self.timed_out_count = 0
+        self.busy_time = 0.0
+        self.capacity_time = 0.0
+        self.resized_at = self.started
+
+    def start(self) -> None:
+        """
+        Start the clock that throughput and utilization are measured against.
+        """
+        self.started = self.resized_at = time.perf_counter()
+        self.stopped = None
+        self.capacity_time = 0.0
+
+    def resize(self, num_workers: int) -> None:
+        """
+        Record a change in the number of workers, so utilization is measured against the worker-seconds provisioned.
+
+        Args:
+            - num_workers: The new number of workers.
+        """
+        with self.lock:
+            now = time.perf_counter()
+            self.capacity_time += self.num_workers * (now - self.resized_at)
+            self.resized_at = now
+            self.num_workers = num_workers
+
+    def stop(self) -> None:
+        """
+        Stop the clock, so later snapshots report the same rates.
+        """
+        self.stopped = time.perf_counter()
+
+    def record(self, job: Job) -> None:
+        """
+        Record a job that finished successfully. Called on the hot path.
+        """
+        self.finished.append(job)
+
+    def record_failure(self, job: Job) -> None:
+        """
+        Record a job that raised. Called on the hot path.
+        """
+        self.failed.append(job)
+
+    def record_retry(self, job: Job) -> None:
+        """
+        Record a failed attempt of a job that will be retried.
+        """
+        with self.lock:
+            self.retried_count += 1
+
+    def record_timeout(self, job: Job) -> None:
+        """
+        Record an attempt that exceeded the job's timeout.
+        """
+        with self.lock:
+            self.timed_out_count += 1
+
+    def record_cancel(self, count: int) -> None:
+        """
+        Record jobs cancelled because a job they depend on failed.
+        """
+        with self.lock:
+            self.cancelled_count += count
+
+    def aggregate(self) -> None:
+        """
+        Fold the jobs recorded since the last call into the histograms and counters.
+        """
+        with self.lock:
+            while self.finished:
+                job = self.finished.popleft()
+                self.completed_count += 1
+                for name, (start, end, _) in PHASES.items():
+                    begin, finish = getattr(job, start), getattr(job, end)
+                    if begin is not None and finish is not None:
+                        self.histograms[name].observe(finish - begin)
+                if job.started_at is not None and job.finished_at is not None:
+                    self.busy_time += job.finished_at - job.started_at
+
+            while self.failed:
+                job = self.failed.popleft()
+                self.failed_count += 1
+                if job.started_at is not None and job.finished_at is not None:
+                    self.busy_time += job.finished_at - job.started_at
+
+    def snapshot(self) -> dict:
+        """
+        Aggregate pending jobs and summarize everything recorded so far.
+
+        Returns:
+            - Dictionary with job counters, throughput, worker utilization and one
+                histogram summary per lifecycle phase (see `PHASES`).
+        """
+        self.aggregate()
+        with self.lock:
+            end = self.stopped or time.perf_counter()
+            elapsed = end - self.started
+            worker_seconds = self.capacity_time + self.num_workers * max(0.0, end - self.resized_at)
+            return {
+                "jobs_completed": self.completed_count,
+                "jobs_failed": self.failed_count,
+                "jobs_retried": self.retried_count,
+                "jobs_cancelled": self.cancelled_count,
+                "jobs_timed_out": self.timed_out_count,
+                "elapsed_seconds": elapsed,
+                "throughput": self.completed_count / elapsed if elapsed else 0.0,
+                "workers": self.num_workers,
+                "worker_seconds": worker_seconds,
+                "worker_busy_seconds": self.busy_time,
+                "worker_idle_seconds": max(0.0, worker_seconds - self.busy_time),
+                "worker_utilization": self.busy_time / worker_seconds if worker_seconds else 0.0,
+                "latency": {name: histogram.snapshot() for name, histogram in self.histograms.items()},
+            }
+
+
+def to_prometheus(stats: dict, prefix: str = "scheduler") -> str:
+    """
+    Render a `JobManager.stats()` snapshot in the Prometheus text exposition format.
+
+    Args:
+        - stats: The snapshot.
+        - prefix: Prefix of every metric name.
+
+    Returns:
+        - The metrics, one sample per line.
+    """
+    lines = []
+
+    def sample(name: str, kind: str, value, description: str) -> None:
+        lines.append(f"# HELP {prefix}_{name} {description}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        lines.append(f"{prefix}_{name} {value}")
+
+    jobs = stats["jobs"]
+    sample("jobs_completed_total", "counter", jobs["jobs_completed"], "Jobs that finished successfully")
+    sample("jobs_failed_total", "counter", jobs["jobs_failed"], "Jobs that failed after their last attempt")
+    sample("jobs_retried_total", "counter", jobs["jobs_retried"], "Failed attempts that were retried")
+    sample("jobs_cancelled_total", "counter", jobs["jobs_cancelled"], "Jobs cancelled because a dependency failed")
+    sample("jobs_timed_out_total", "counter", jobs["jobs_timed_out"], "Attempts that exceeded their timeout")
+    sample("worker_busy_seconds_total", "counter", jobs["worker_busy_seconds"], "Seconds workers spent executing jobs")
+    sample("worker_utilization", "gauge", jobs["worker_utilization"], "Fraction of worker time spent executing jobs")
+    sample("workers", "gauge", jobs["workers"], "Workers in the consumer pool")
+    sample("worker_idle_seconds_total", "counter", jobs["worker_idle_seconds"], "Seconds workers were provisioned but idle")
+    sample("queue_size", "gauge", stats["queue"]["size"], "Jobs waiting in the intake queue")
+    sample("queue_put_wait_seconds_total", "counter", stats["queue"]["put_wait_seconds"],
+           "Seconds producers spent blocked on a full queue")
+    sample("jobs_in_flight", "gauge", stats["consumer"]["in_flight"], "Jobs held by workers")
+    sample("jobs_ready", "gauge", stats["consumer"]["ready"], "Ready jobs waiting for a worker")
+    sample("jobs_blocked", "gauge", stats["consumer"]["blocked_on_dependencies"], "Jobs waiting on dependencies")
+    if "autoscaler" in stats:
+        sample("autoscaler_scale_ups_total", "counter", stats["autoscaler"]["scale_ups"], "Times the consumer pool grew")
+        sample("autoscaler_scale_downs_total", "counter", stats["autoscaler"]["scale_downs"], "Times the consumer pool shrank")
+    if "tenants" in stats["queue"]:
+        for name, description, kind, field in (
+                ("tenant_jobs_queued", "Jobs of each tenant waiting in the queue", "gauge", "queued"),
+                ("tenant_jobs_in_flight", "Jobs of each tenant in flight", "gauge", "in_flight"),
+                ("tenant_jobs_served_total", "Jobs of each tenant taken off the queue", "counter", "served")):
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for tenant, values in stats["queue"]["tenants"].items():
+                lines.append(f'{prefix}_{name}{{tenant="{tenant}"}} {values[field]}')
+    if "resources" in stats:
+        sample("jobs_backfilled_total", "counter", stats["resources"]["backfilled"],
+               "Jobs started ahead of a waiting job that did not fit")
+        for name, description, field in (("resource_capacity", "Capacity of each resource", "capacity"),
+                                          ("resource_in_use", "Amount of each resource held by running jobs", "in_use"),
+                                          ("resource_utilization", "Mean fraction of each resource in use", "utilization")):
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            for resource, values in stats["resources"]["resources"].items():
+                lines.append(f'{prefix}_{name}{{resource="{resource}"}} {values[field]}')
+
+    for name, histogram in jobs["latency"].items():
+        metric = f"{prefix}_job_{name}_seconds"
+        lines.append(f"# HELP {metric} {PHASES[name][2]}")
+        lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound, count in histogram["buckets"].items():
+            cumulative += count
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f"{metric}_sum {histogram['sum']}")
+        lines.append(f"{metric}_count {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_stats(stats: dict, path: str, fmt: str = "json") -> None:
+    """
+    Atomically replace `path` with a stats snapshot, so readers never see a partial file.
+
+    Args:
+        - stats: The snapshot.
+        - path: Destination file.
+        - fmt: "prometheus" for the text exposition format, "json" for a JSON document.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown stats format: {fmt}")
+
+    content = to_prometheus(stats) if fmt == "prometheus" else json.dumps(stats, indent=2)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+class StatsReporter(threading.Thread):
+    """
+    Background thread that periodically aggregates job metrics and optionally exports them.
+    """
+
+    def __init__(self, collect, interval: float = 1.0, path: str | None = None, fmt: str = "json") -> None:
+        """
+        Initialize the reporter.
+
+        Args:
+            - collect: Callable returning the current stats snapshot.
+            - interval: Seconds between two snapshots.
+            - path: File the snapshot is written to, or None to only aggregate.
+            - fmt: Export format, "prometheus" or "json".
+        """
+        super().__init__(name="StatsReporter", daemon=True)
+        self.collect = collect
+        self.interval = interval
+        self.path = path
+        self.fmt = fmt
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.report()
+
+    def report(self) -> None:
+        """
+        Take a snapshot and export it if a path is configured.
+        """
+        try:
+            stats = self.collect()
+            if self.path:
+                write_stats(stats, self.path, self.fmt)
+        except Exception as e:
+            logger.error("Error exporting stats: %s", e)
+
+    def stop(self) -> None:
+        """
+        Stop the thread and write a final snapshot.
+        """
+        self.stopped.set()
+        self.join()
+        self.report()
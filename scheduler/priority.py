@@ -0,0 +1,164 @@
+import heapq
+import itertools
+import threading
+from collections import defaultdict
+from queue import Queue
+from typing import Callable
+from models.job import Job
+
+class CriticalPathRanker:
+    """
+    Ranks jobs by the length of their longest remaining downstream path, weighted by execution time.
+
+    Ranks are maintained incrementally: when a job arrives, its cost is propagated up through the
+    jobs it depends on, stopping as soon as a rank no longer grows. Edges to a dependency that has
+    not arrived yet are kept pending and linked when it does.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty ranker.
+        """
+        self.lock = threading.Lock()
+        self.cost = {}
+        self.rank = {}
+        self.dependencies = {}
+        self.dependents = defaultdict(set)
+        self.pending = defaultdict(set)
+        self.pending_dependencies = {}
+
+    def observe(self, job: Job) -> set:
+        """
+        Record a new job and its dependency edges.
+
+        Args:
+            - job: The job that was submitted.
+
+        Returns:
+            - Set of job IDs whose rank changed, including the new job.
+        """
+        with self.lock:
+            job_id = job.job_id
+            self.cost[job_id] = job.execution_time
+            self.dependencies[job_id] = [dep for dep in job.dependencies if dep in self.cost]
+            for dep_id in self.dependencies[job_id]:
+                self.dependents[dep_id].add(job_id)
+            missing = [dep for dep in job.dependencies if dep not in self.cost]
+            if missing:
+                self.pending_dependencies[job_id] = missing
+                for dep_id in missing:
+                    self.pending[dep_id].add(job_id)
+            for child in self.pending.pop(job_id, ()):
+                self.pending_dependencies[child].remove(job_id)
+                self.dependencies[child].append(job_id)
+                self.dependents[job_id].add(child)
+
+            self.rank[job_id] = job.execution_time + max(
+                (self.rank[child] for child in self.dependents.get(job_id, ())), default=0
+            )
+
+            changed = {job_id}
+            stack = [job_id]
+            while stack:
+                child = stack.pop()
+                for dep_id in self.dependencies[child]:
+                    candidate = self.cost[dep_id] + self.rank[child]
+                    if candidate > self.rank[dep_id]:
+                        self.rank[dep_id] = candidate
+                        changed.add(dep_id)
+                        stack.append(dep_id)
+            return changed
+
+    def get(self, job: Job):
+        """
+        Get the current rank of a job.
+
+        Args:
+            - job: The job to rank.
+
+        Returns:
+            - The job's downstream path length, or its own execution time if it is unknown.
+        """
+        with self.lock:
+            return self.rank.get(job.job_id, job.execution_time)
+
+    def forget(self, job_id) -> None:
+        """
+        Drop a finished job. Ranks no longer propagate through it.
+
+        Args:
+            - job_id: ID of the finished job.
+        """
+        with self.lock:
+            if job_id not in self.cost:
+                return
+            del self.cost[job_id]
+            del self.rank[job_id]
+            for dep_id in self.dependencies.pop(job_id):
+                self.dependents[dep_id].discard(job_id)
+            for child in self.dependents.pop(job_id, ()):
+                self.dependencies[child].remove(job_id)
+            for dep_id in self.pending_dependencies.pop(job_id, ()):
+                self.pending[dep_id].discard(job_id)
+                if not self.pending[dep_id]:
+                    del self.pending[dep_id]
+
+
+class PriorityJobQueue(Queue):
+    """
+    A `queue.Queue` that hands out jobs in order of a sort key (lowest first, FIFO among equals).
+    Jobs already in the queue can be re-ranked when their key changes.
+    """
+
+    def __init__(self, maxsize: int, key: Callable[[Job], tuple]) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            - maxsize: Maximum number of jobs that can be stored in the queue.
+            - key: Function returning the sort key of a job.
+        """
+        self.key = key
+        super().__init__(maxsize)
+
+    def _init(self, maxsize: int) -> None:
+        self.heap = []
+        self.entries = {}
+        self.counter = itertools.count()
+
+    def _qsize(self) -> int:
+        return len(self.entries)
+
+    def _put(self, job: Job) -> None:
+        entry = [self.key(job), next(self.counter), job]
+        self.entries[job.job_id] = entry
+        heapq.heappush(self.heap, entry)
+
+    def _get(self) -> Job:
+        while True:
+            _, _, job = heapq.heappop(self.heap)
+            if job is not None:
+                del self.entries[job.job_id]
+                return job
+
+    def reprioritize(self, job_ids: set) -> None:
+        """
+        Recompute the sort key of queued jobs.
+
+        Args:
+            - job_ids: IDs of the jobs whose key may have changed.
+        """
+        with self.mutex:
+            for job_id in job_ids:
+                entry = self.entries.get(job_id)
+                if entry is None:
+                    continue
+                job = entry[-1]
+                key = self.key(job)
+                if key == entry[0]:
+                    continue
+                # Invalidate the old heap entry in place and push a fresh one
+                entry[-1] = None
+                new_entry = [key, entry[1], job]
+                self.entries[job_id] = new_entry
+                heapq.heappush(self.heap, new_entry)
@@ -2,8 +2,12 @@
 import threading
 import random
 import time
+from collections import deque
+from typing import Callable
 from models.job import Job
+from scheduler.deadlock import DependencyCycleError
 from utils.logger import get_logger
+from utils.tracing import trace_span
 from queue import Queue
 
 
@@ -14,7 +18,9 @@ class Producer(threading.Thread):
     A producer thread that generates jobs and adds them to a shared queue.
     """
 
-    def __init__(self, queue: Queue, job_count: int, producer_id: int, max_execution_time: int= 1, dependency_chance: float= 0.3) -> None:
+    def __init__(self, queue: Queue, job_count: int, producer_id: int, max_execution_time: int= 1, dependency_chance: float= 0.3, batch_size: int = 1,
+                 seed: int | None = None, time_scale: float = 1.0, history: int | None = None,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
         """
         Initialize the producer.
 
@@ -24,6 +30,14 @@ class Producer(threading.Thread):
             - producer_id: Unique identifier for this producer.
             - max_execution_time: Maximum simulated execution time for a job.
             - dependency_chance: Probability of a job having dependencies.
+            - batch_size: Number of jobs submitted to the queue at once.
+            - seed: Seed of this producer's random generator, for reproducible job sets.
+            - time_scale: Factor applied to job execution times and to the delay between jobs.
+                0 produces jobs that do not sleep at all.
+            - history: Number of most recent jobs that new jobs may depend on. With a history, generated
+                jobs are not kept, so a producer can run indefinitely; None keeps every job (needed for
+                the deadlock pass of `JobManager.start`).
+            - sleep: Function waiting between two jobs. The simulator records the delays instead of sleeping.
         """
         super().__init__()
         self.queue = queue
@@ -31,27 +45,73 @@ class Producer(threading.Thread):
         self.producer_id = producer_id
         self.max_execution_time = max_execution_time
         self.dependency_chance = dependency_chance
-        self.created_jobs = []
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+        self.time_scale = time_scale
+        self.history = history
+        self.created_jobs = deque(maxlen=history) if history else []
         self.generated_jobs = []
+        self.sleep = sleep
 
     def run(self) -> None:
         """
         Generate jobs and add them to the queue.
         """
+        with trace_span("Producer.run", args={"producer_id": self.producer_id}):
+            self.produce()
+
+    def produce(self) -> None:
+        """
+        Generate `job_count` jobs, submitting them one at a time or in batches.
+        """
+        batch = []
         for i in range(self.job_count):
             job_id = f"Producer-{self.producer_id}-Job-{i}"
-            execution_time = random.randint(1, self.max_execution_time)
+            execution_time = self.random.randint(1, self.max_execution_time)
+            if self.time_scale != 1:
+                execution_time *= self.time_scale
 
             # Randomly assign dependencies based on previous jobs
             dependencies = []
-            if self.created_jobs and random.random() < self.dependency_chance:
-                dependencies = random.sample(self.created_jobs, k=random.randint(1, len(self.created_jobs)))
+            if self.created_jobs and self.random.random() < self.dependency_chance:
+                dependencies = self.random.sample(self.created_jobs, k=self.random.randint(1, len(self.created_jobs)))
 
-            job = Job(job_id=job_id, execution_time=execution_time, dependencies=dependencies)
-            self.queue.put(job)
+            job = Job(job_id=job_id, execution_time=execution_time, dependencies=dependencies,
+                      tenant=f"Producer-{self.producer_id}")
+            if self.batch_size > 1:
+                batch.append(job)
+            else:
+                try:
+                    self.queue.put(job)
+                except DependencyCycleError as e:
+                    logger.error("Producer %s rejected job: %s", self.producer_id, e)
+                    continue
 
-            logger.info(f"Producer {self.producer_id} created {job}")
+            logger.info("Producer %s created %s", self.producer_id, job)
             self.created_jobs.append(job_id)
-            self.generated_jobs.append(job)
+            if self.history is None:
+                self.generated_jobs.append(job)
+
+            if len(batch) >= self.batch_size:
+                self.submit_batch(batch)
+                batch = []
+
+            if self.time_scale:
+                self.sleep(self.random.uniform(0.1, 0.5) * self.time_scale) # Simulate time between job production
 
-            time.sleep(random.uniform(0.1, 0.5)) # Simulate time between job production
+        if batch:
+            self.submit_batch(batch)
+
+    def submit_batch(self, batch: list[Job]) -> None:
+        """
+        Submit a batch of jobs to the queue, forgetting the ones rejected for closing a cycle.
+
+        Args:
+            - batch: The jobs to submit.
+        """
+        rejected = self.queue.put_many(batch)
+        if rejected:
+            rejected_ids = {job.job_id for job in rejected}
+            created_jobs = [job_id for job_id in self.created_jobs if job_id not in rejected_ids]
+            self.created_jobs = deque(created_jobs, maxlen=self.history) if self.history else created_jobs
+            self.generated_jobs = [job for job in self.generated_jobs if job.job_id not in rejected_ids]
@@ -1,31 +1,227 @@
+import time
+import threading
 from queue import Queue
 from utils.logger import get_logger
+from utils.tracing import trace_span, tracing_enabled
 from models.job import Job
+from scheduler.priority import CriticalPathRanker, PriorityJobQueue
+from scheduler.deadlock import DependencyCycleError, IncrementalCycleDetector
+from scheduler.journal import Journal
+from scheduler.dependency import CompletionWindow
+from scheduler.results import ResultStore
+from scheduler.fairshare import FairShareQueue
 logger = get_logger(__name__)
 
+POLICIES = ("fifo", "critical-path", "priority")
+CYCLE_CHECKS = ("off", "reject", "drop")
+
 class JobQueue:
     """
     A thread-safe, bounded queue for managing jobs between producers and consumers.
     """
 
-    def __init__(self, maxsize: int=0) -> None:
+    def __init__(self, maxsize: int=0, policy: str="fifo", cycle_check: str="off", journal: Journal | None = None,
+                 completion_window: CompletionWindow | None = None, results: ResultStore | None = None,
+                 fair_share: bool = False, tenant_weights: dict | None = None, tenant_rates: dict | None = None,
+                 tenant_max_in_flight: dict | None = None) -> None:
         """
         Initialize a JobQueue instance with a fixed maximum size.
 
         Args:
             - maxsize: Maximum number of jobs that can be stored in the queue.
+            - policy: Order in which jobs are handed out:
+                "fifo" (arrival order), "critical-path" (longest downstream path first)
+                or "priority" (highest `Job.priority` first).
+            - cycle_check: What to do with a job whose dependencies close a cycle when it is submitted:
+                "off" (leave it to the deadlock pass), "reject" (raise `DependencyCycleError` and call
+                every function in `reject_listeners` with the job and the error) or "drop" (remove the
+                offending dependencies).
+            - journal: Journal recording submissions and completions, or None. Jobs whose ID it already
+                holds are not queued again.
+            - completion_window: Window of a long-running scheduler that every accepted job is registered with.
+            - results: Store keeping job results for their dependents, or None for a new unsealed store.
+            - fair_share: Keep one sub-queue per tenant (`Job.tenant`) and share the consumers between them
+                (see `FairShareQueue`). The policy then only orders jobs within a tenant.
+            - tenant_weights: With fair share, share of each tenant (default 1).
+            - tenant_rates: With fair share, maximum jobs per second taken off the queue for each listed tenant.
+            - tenant_max_in_flight: With fair share, maximum jobs in flight for each listed tenant.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown scheduling policy: {policy}")
+        if cycle_check not in CYCLE_CHECKS:
+            raise ValueError(f"Unknown cycle check: {cycle_check}")
+
+        self.policy = policy
+        self.ranker = CriticalPathRanker() if policy == "critical-path" else None
+        self.cycle_check = cycle_check
+        self.cycle_detector = IncrementalCycleDetector() if cycle_check != "off" else None
+        self.journal = journal
+        self.completion_window = completion_window
+        self.results = results if results is not None else ResultStore()
+        self.ready_queues = []
+        self.reject_listeners = []
+        self.fair_share = fair_share
+        if fair_share:
+            self.queue = FairShareQueue(maxsize, key=self._sort_key if policy != "fifo" else None,
+                                        weights=tenant_weights, rates=tenant_rates, max_in_flight=tenant_max_in_flight)
+        else:
+            self.queue = self._new_queue(maxsize)
+        self.put_wait_time = 0.0
+        self.metrics_lock = threading.Lock()
+
+    def _new_queue(self, maxsize: int) -> Queue:
+        if self.policy == "fifo":
+            return Queue(maxsize)
+        return PriorityJobQueue(maxsize, key=self._sort_key)
+
+    def _sort_key(self, job: Job) -> tuple:
+        if self.ranker:
+            return (-self.ranker.get(job), -job.priority)
+        return (-job.priority,)
+
+    def ready_queue(self) -> Queue:
+        """
+        Create an unbounded queue ordered by the same policy, for jobs whose dependencies are met.
+        Its ranking is kept up to date as new jobs arrive on this queue.
+
+        Returns:
+            - A `queue.Queue` instance.
         """
-        self.queue = Queue(maxsize)
+        ready = self._new_queue(0)
+        self.ready_queues.append(ready)
+        return ready
     
     def put(self, job: Job) -> None:
         """
         Add a job to the queue. Blocks if the queue is full.
+        A job the journal already holds is skipped; its `submitted_at` stays unset.
 
         Args:
             - job: Job instance to be added to the queue.
+
+        Raises:
+            - DependencyCycleError: If cycle checking is "reject" and the job closes a cycle.
+        """
+        if self.cycle_detector:
+            self._check_cycles(job)
+        if self.journal and not self.journal.submit([job]):
+            return
+        if self.completion_window is not None:
+            self.completion_window.submitted(job.job_id)
+        job.result_refs = job.dependencies
+        self.results.retain(job.result_refs)
+
+        logger.info("Adding job %s to the queue.", job.job_id)
+        if self.ranker:
+            changed = self.ranker.observe(job)
+            for queue in (self.queue, *self.ready_queues):
+                queue.reprioritize(changed)
+
+        start = job.submitted_at = time.perf_counter()
+        with trace_span("JobQueue.put", args={"job_id": job.job_id} if tracing_enabled() else None):
+            self.queue.put(job)
+        self._record_put_wait(time.perf_counter() - start)
+
+    def put_many(self, jobs: list[Job]) -> list[Job]:
+        """
+        Add several jobs to the queue, taking the queue lock once per run of free slots
+        instead of once per job. Blocks while the queue is full.
+
+        Args:
+            - jobs: Job instances to be added to the queue, in order.
+
+        Returns:
+            - List of jobs rejected because they close a dependency cycle (cycle checking "reject").
+                The other jobs of the batch are still added.
+        """
+        rejected = []
+        if self.cycle_detector:
+            accepted = []
+            for job in jobs:
+                try:
+                    self._check_cycles(job)
+                    accepted.append(job)
+                except DependencyCycleError as e:
+                    logger.error("Rejected job %s: %s", job.job_id, e)
+                    rejected.append(job)
+            jobs = accepted
+        if self.journal:
+            jobs = self.journal.submit(jobs)
+        if self.completion_window is not None:
+            for job in jobs:
+                self.completion_window.submitted(job.job_id)
+        for job in jobs:
+            job.result_refs = job.dependencies
+            self.results.retain(job.result_refs)
+
+        if self.ranker:
+            changed = set()
+            for job in jobs:
+                changed |= self.ranker.observe(job)
+            for queue in (self.queue, *self.ready_queues):
+                queue.reprioritize(changed)
+
+        logger.info("Adding %s jobs to the queue.", len(jobs))
+        queue = self.queue
+        i = 0
+        start = time.perf_counter()
+        for job in jobs:
+            job.submitted_at = start
+        with trace_span("JobQueue.put_many", args={"count": len(jobs)} if tracing_enabled() else None), queue.not_full:
+            while i < len(jobs):
+                if queue.maxsize > 0:
+                    while queue._qsize() >= queue.maxsize:
+                        queue.not_full.wait()
+                    room = queue.maxsize - queue._qsize()
+                else:
+                    room = len(jobs) - i
+
+                batch = jobs[i:i + room]
+                for job in batch:
+                    queue._put(job)
+                queue.unfinished_tasks += len(batch)
+                queue.not_empty.notify(len(batch))
+                i += len(batch)
+        self._record_put_wait(time.perf_counter() - start)
+
+        return rejected
+
+    def get_batch(self, max_n: int, timeout: float | None = None) -> list[Job]:
+        """
+        Retrieve up to `max_n` jobs from the queue under a single lock acquisition.
+        Blocks until at least one job is available. Every returned job needs its own `task_done`.
+
+        Args:
+            - max_n: Maximum number of jobs to return.
+            - timeout: Maximum number of seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            - List of jobs removed from the queue, empty if the timeout expired.
         """
-        logger.info(f"Adding job {job.job_id} to the queue.")
-        self.queue.put(job)
+        queue = self.queue
+        if self.fair_share:
+            with trace_span("JobQueue.get_batch"):
+                jobs = queue.get_many(max_n, timeout=timeout)
+            logger.info("Fetching %s jobs from the queue.", len(jobs))
+            return jobs
+
+        with trace_span("JobQueue.get_batch"), queue.not_empty:
+            if timeout is None:
+                while not queue._qsize():
+                    queue.not_empty.wait()
+            else:
+                deadline = time.monotonic() + timeout
+                while not queue._qsize():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return []
+                    queue.not_empty.wait(remaining)
+
+            jobs = [queue._get() for _ in range(min(max_n, queue._qsize()))]
+            queue.not_full.notify(len(jobs))
+
+        logger.info("Fetching %s jobs from the queue.", len(jobs))
+        return jobs
 
     def get(self) -> Job:
         """
@@ -34,17 +230,115 @@ class JobQueue:
         Returns:
             - Job instance removed from the queue.
         """
-        job = self.queue.get()
-        logger.info(f"Fetching job {job.job_id} from the queue.")
+        with trace_span("JobQueue.get"):
+            job = self.queue.get()
+        logger.info("Fetching job %s from the queue.", job.job_id)
         return job
     
-    def task_done(self) -> None:
+    def task_done(self, count: int = 1) -> None:
         """
-        Indicate that a previously fetched job has been completed.
+        Indicate that previously fetched jobs have been completed.
+
+        Args:
+            - count: Number of completed jobs.
         """
-        self.queue.task_done()
+        if count == 1:
+            self.queue.task_done()
+        else:
+            queue = self.queue
+            with queue.all_tasks_done:
+                unfinished = queue.unfinished_tasks - count
+                if unfinished < 0:
+                    raise ValueError("task_done() called too many times")
+                if unfinished == 0:
+                    queue.all_tasks_done.notify_all()
+                queue.unfinished_tasks = unfinished
         logger.info("Job marked as completed in the queue.")
 
+    def done(self, jobs: list[Job]) -> None:
+        """
+        Indicate that jobs taken off the queue finished for good: completed, failed or cancelled.
+
+        Args:
+            - jobs: The jobs.
+        """
+        if self.fair_share:
+            self.queue.release(jobs)
+        self.task_done(len(jobs))
+
+    def started(self, job: Job) -> None:
+        """
+        Count a job released from its dependencies against its tenant's in-flight cap again.
+
+        Args:
+            - job: The job that became ready.
+        """
+        if self.fair_share:
+            self.queue.started(job)
+
+    def parked(self, jobs: list[Job]) -> None:
+        """
+        Stop counting jobs parked on their dependencies against their tenant's in-flight cap.
+
+        Args:
+            - jobs: The parked jobs.
+        """
+        if self.fair_share and jobs:
+            self.queue.release(jobs)
+
+    def retire(self, job_id, completed: bool = True) -> None:
+        """
+        Record a finished job in the journal, if any, and drop its ranking and cycle-checking state.
+
+        Args:
+            - job_id: ID of the finished job.
+            - completed: False for a job that failed or was cancelled. It stays pending in the
+                journal, so a restarted scheduler runs it again.
+        """
+        if self.journal and completed:
+            self.journal.complete(job_id)
+        if self.ranker:
+            self.ranker.forget(job_id)
+        if self.cycle_detector:
+            self.cycle_detector.remove(job_id)
+
+    def _check_cycles(self, job: Job) -> None:
+        atomic = self.cycle_check == "reject"
+        cyclic = self.cycle_detector.add_job(job.job_id, job.dependencies, atomic=atomic)
+        if not cyclic:
+            return
+
+        if atomic:
+            error = DependencyCycleError(job.job_id, cyclic)
+            for listener in self.reject_listeners:
+                listener(job, error)
+            raise error
+
+        job.dependencies = [dep for dep in job.dependencies if dep not in cyclic]
+        logger.warning("Removed dependencies %s of job %s to avoid a dependency cycle.", cyclic, job.job_id)
+
+    def metrics(self) -> dict:
+        """
+        Get backpressure metrics of the queue.
+
+        Returns:
+            - Dictionary with the current size, the maximum size, the total seconds producers
+                spent in put calls (mostly blocked on a full queue) and, with fair share, per-tenant
+                metrics ("tenants", see `FairShareQueue.metrics`).
+        """
+        metrics = {
+            "size": self.queue.qsize(),
+            "maxsize": self.queue.maxsize,
+            "put_wait_seconds": self.put_wait_time,
+        }
+        if self.fair_share:
+            metrics["tenants"] = self.queue.metrics()
+        return metrics
+
+    def _record_put_wait(self, seconds: float) -> None:
+        with self.metrics_lock:
+            self.put_wait_time += seconds
+
     def qsize(self):
         """
         Get the current size of the queue.
@@ -53,5 +347,5 @@ class JobQueue:
             - The number of jobs currently in the queue.
         """
         size = self.queue.qsize()
-        logger.info(f"Queue size: {size}")
-        return size
\ No newline at end of file
+        logger.info("Queue size: %s", size)
+        return size
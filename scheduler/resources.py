@@ -0,0 +1,212 @@
+import bisect
+import itertools
+import math
+import time
+from models.job import Job
+
+
+def parse_resources(spec: str | dict | None) -> dict[str, float]:
+    """
+    Parse resource amounts such as "cpu=4,memory=8192,db-connections=4".
+
+    Args:
+        - spec: Comma-separated name=amount pairs, a dictionary, or None.
+
+    Returns:
+        - Dictionary mapping each resource name to its amount.
+
+    Raises:
+        - ValueError: If an entry is malformed or an amount is negative.
+    """
+    if not spec:
+        return {}
+    if isinstance(spec, dict):
+        items = spec.items()
+    else:
+        items = []
+        for entry in spec.split(","):
+            name, sep, amount = entry.partition("=")
+            if not sep or not name.strip():
+                raise ValueError(f"Invalid resource {entry!r}, expected name=amount")
+            items.append((name, amount))
+
+    resources = {}
+    for name, amount in items:
+        amount = float(amount)
+        if amount < 0:
+            raise ValueError(f"Negative amount of resource {name}: {amount}")
+        resources[name.strip()] = amount
+    return resources
+
+
+class ResourcePool:
+    """
+    Packs ready jobs against a fixed capacity of named resources (CPU slots, memory, connections...).
+
+    Jobs wait in priority order, then arrival order. The first waiting job runs as soon as it fits.
+    If it does not fit, it gets a reservation: from the expected end of the running jobs
+    (`started_at + execution_time`), the pool computes when enough capacity will be free for it.
+    Other jobs may then backfill the free capacity, picked best-fit (the one leaving the least capacity
+    unused), but only if they are expected to finish before the reservation or only use capacity the
+    waiting job will not need. Small jobs therefore keep the machine busy without starving a large one.
+
+    Not thread-safe: the consumer calls it with its flow-control lock held.
+    """
+
+    def __init__(self, capacity: dict[str, float], backfill_depth: int = 64) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            - capacity: Amount of every resource. Jobs may only require resources listed here.
+            - backfill_depth: Maximum number of waiting jobs examined for backfilling per selection.
+        """
+        self.capacity = dict(capacity)
+        self.free = dict(capacity)
+        self.backfill_depth = backfill_depth
+        self.waiting = []
+        self.running = {}
+        self.counter = itertools.count()
+        self.peak = dict.fromkeys(capacity, 0.0)
+        self.used_time = dict.fromkeys(capacity, 0.0)
+        self.started = self.updated = time.perf_counter()
+        self.started_count = 0
+        self.backfilled_count = 0
+
+    def start(self) -> None:
+        """
+        Start the clock that utilization is measured against.
+        """
+        self.started = self.updated = time.perf_counter()
+        self.used_time = dict.fromkeys(self.capacity, 0.0)
+
+    def check(self, job: Job) -> str | None:
+        """
+        Check that a job's requirements can ever be met.
+
+        Args:
+            - job: The job to check.
+
+        Returns:
+            - None if the job can run, otherwise the reason why it cannot.
+        """
+        for name, amount in (job.resources or {}).items():
+            if name not in self.capacity:
+                return f"unknown resource {name}"
+            if amount > self.capacity[name]:
+                return f"requires {amount} {name} but the capacity is {self.capacity[name]}"
+        return None
+
+    def submit(self, job: Job) -> None:
+        """
+        Add a ready job to the waiting jobs.
+        """
+        bisect.insort(self.waiting, (-job.priority, next(self.counter), job))
+
+    def select(self) -> Job | None:
+        """
+        Pick the next job to run and allocate its resources.
+
+        Returns:
+            - The job, or None if no waiting job may start now.
+        """
+        if not self.waiting:
+            return None
+        head = self.waiting[0][2]
+        if self._fits(head.resources, self.free):
+            return self._take(0)
+
+        now = time.perf_counter()
+        shadow, spare = self._reservation(head, now)
+        best, best_leftover = None, math.inf
+        for i in range(1, min(len(self.waiting), self.backfill_depth + 1)):
+            job = self.waiting[i][2]
+            resources = job.resources or {}
+            if not self._fits(resources, self.free):
+                continue
+            if now + job.execution_time > shadow and not self._fits(resources, spare):
+                continue
+            leftover = sum((free - resources.get(name, 0.0)) / self.capacity[name]
+                           for name, free in self.free.items() if self.capacity[name])
+            if leftover < best_leftover:
+                best, best_leftover = i, leftover
+
+        if best is None:
+            return None
+        self.backfilled_count += 1
+        return self._take(best)
+
+    def release(self, job: Job) -> None:
+        """
+        Return the resources of a job that finished, failed or is waiting to be retried.
+        """
+        if self.running.pop(id(job), None) is None:
+            return
+        self._account()
+        for name, amount in (job.resources or {}).items():
+            self.free[name] += amount
+
+    def metrics(self) -> dict:
+        """
+        Get per-resource metrics.
+
+        Returns:
+            - Dictionary with the number of jobs waiting, running, started and backfilled (started
+                ahead of a waiting job that did not fit), and for every resource its capacity, amount in use,
+                peak and utilization (mean fraction in use since `start`).
+        """
+        self._account()
+        elapsed = self.updated - self.started
+        return {
+            "waiting": len(self.waiting),
+            "running": len(self.running),
+            "started": self.started_count,
+            "backfilled": self.backfilled_count,
+            "resources": {
+                name: {
+                    "capacity": capacity,
+                    "in_use": capacity - self.free[name],
+                    "peak": self.peak[name],
+                    "utilization": self.used_time[name] / (capacity * elapsed) if capacity and elapsed else 0.0,
+                }
+                for name, capacity in self.capacity.items()
+            },
+        }
+
+    def _take(self, index: int) -> Job:
+        _, _, job = self.waiting.pop(index)
+        self._account()
+        for name, amount in (job.resources or {}).items():
+            self.free[name] -= amount
+            self.peak[name] = max(self.peak[name], self.capacity[name] - self.free[name])
+        self.running[id(job)] = (job, time.perf_counter() + job.execution_time)
+        self.started_count += 1
+        return job
+
+    def _reservation(self, head: Job, now: float) -> tuple[float, dict]:
+        """
+        Compute when the first waiting job is expected to fit, and the capacity it leaves spare then.
+
+        Returns:
+            - The expected time (infinite if unknown) and the resources left over at that time.
+        """
+        available = dict(self.free)
+        for end, resources in sorted(((end, job.resources or {}) for job, end in self.running.values()),
+                                     key=lambda entry: entry[0]):
+            for name, amount in resources.items():
+                available[name] += amount
+            if self._fits(head.resources, available):
+                spare = {name: available[name] - (head.resources or {}).get(name, 0.0) for name in available}
+                return max(end, now), spare
+        return math.inf, dict.fromkeys(available, 0.0)
+
+    def _account(self) -> None:
+        now = time.perf_counter()
+        elapsed = now - self.updated
+        for name, capacity in self.capacity.items():
+            self.used_time[name] += (capacity - self.free[name]) * elapsed
+        self.updated = now
+
+    @staticmethod
+    def _fits(resources: dict | None, available: dict) -> bool:
+        return all(amount <= available.get(name, 0.0) + 1e-9 for name, amount in (resources or {}).items())
@@ -0,0 +1,254 @@
+import threading
+from collections import defaultdict
+from multiprocessing import shared_memory
+from typing import Any, NamedTuple
+from models.job import Job
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Buffers at least this large are handed to worker processes through shared memory
+SHARED_THRESHOLD = 64 * 1024
+
+
+class SharedResult(NamedTuple):
+    """
+    Handle of a result stored in a shared memory segment. Only the handle is pickled.
+    """
+    name: str
+    nbytes: int
+    format: str
+    shape: tuple
+
+
+def to_shared(value: Any, threshold: int | None = None) -> Any:
+    """
+    Move a large buffer (bytes, bytearray, array, memoryview...) into a new shared memory segment.
+
+    Args:
+        - value: A job result.
+        - threshold: Minimum size in bytes for a buffer to be moved, `SHARED_THRESHOLD` by default.
+
+    Returns:
+        - A `SharedResult` handle, or `value` itself if it is no buffer or smaller than `threshold`.
+    """
+    try:
+        view = memoryview(value)
+    except TypeError:
+        return value
+    if view.nbytes < (SHARED_THRESHOLD if threshold is None else threshold) or not view.c_contiguous:
+        return value
+
+    segment = shared_memory.SharedMemory(create=True, size=view.nbytes)
+    segment.buf[:view.nbytes] = view.cast("B")
+    handle = SharedResult(segment.name, view.nbytes, view.format, view.shape)
+    segment.close()
+    return handle
+
+
+def attach(handle: SharedResult) -> tuple[shared_memory.SharedMemory, memoryview]:
+    """
+    Map a shared result into this process without copying it.
+
+    Args:
+        - handle: The result's handle.
+
+    Returns:
+        - The segment, to be closed once the view is no longer used, and a read-only view of the
+            result with its original format and shape.
+    """
+    segment = shared_memory.SharedMemory(name=handle.name)
+    view = segment.buf[:handle.nbytes].toreadonly()
+    if handle.format != "B" or len(handle.shape) != 1:
+        view = view.cast(handle.format, handle.shape)
+    return segment, view
+
+
+def detach(segment: shared_memory.SharedMemory, view: memoryview) -> None:
+    """
+    Release a view created by `attach`. The mapping stays alive if a job kept a reference to it.
+    """
+    view.release()
+    try:
+        segment.close()
+    except BufferError:
+        pass
+
+
+class ResultStore:
+    """
+    Holds job results until the jobs depending on them have finished.
+
+    Each submitted job counts as a reference on each of its dependencies (`retain`), and finishing it
+    drops them (`release`). A result is freed once its job completed and no reference is left, but only
+    after the store is sealed: until then, a job submitted later could still depend on it.
+    Results in shared memory are unlinked when freed; results in this process are handed to dependents
+    by reference, so neither is copied per dependent. The content digests recorded by a `ResultCache`
+    are kept alongside, for the cache keys of dependents.
+    """
+
+    def __init__(self, sealed: bool = False, shared: bool = False) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            - sealed: Free results as soon as their references are gone, for schedulers whose jobs are
+                always submitted before the jobs they depend on complete.
+            - shared: Move large buffers into shared memory so that worker processes can map them.
+        """
+        self.sealed = sealed
+        self.shared = shared
+        self.lock = threading.Lock()
+        self.values = {}
+        self.digests = {}
+        self.refs = defaultdict(int)
+        self.segments = {}
+        self.freed_count = 0
+
+    def retain(self, dep_ids: list) -> None:
+        """
+        Count a reference on each dependency of a submitted job.
+        """
+        if not dep_ids:
+            return
+        with self.lock:
+            for dep_id in dep_ids:
+                self.refs[dep_id] += 1
+
+    def put(self, job_id, value: Any, digest: str | None = None) -> None:
+        """
+        Store the result of a completed job. None is not stored.
+
+        Args:
+            - job_id: ID of the completed job.
+            - value: Its result, or a `SharedResult` handle created by a worker process.
+            - digest: Content digest of the result, or None if it is not known.
+        """
+        if value is None and digest is None:
+            return
+        if self.shared:
+            value = to_shared(value)
+        with self.lock:
+            if self.sealed and not self.refs.get(job_id):
+                if value is not None:
+                    self._free(value)
+                return
+            if value is not None:
+                self.values[job_id] = value
+            if digest is not None:
+                self.digests[job_id] = digest
+
+    def digests_of(self, dep_ids: list) -> list[str] | None:
+        """
+        Get the content digests of dependency results.
+
+        Args:
+            - dep_ids: IDs of the dependencies, in order.
+
+        Returns:
+            - The digests in the same order, or None if any of them is unknown.
+        """
+        with self.lock:
+            try:
+                return [self.digests[dep_id] for dep_id in dep_ids]
+            except KeyError:
+                return None
+
+    def inputs(self, job: Job, local: bool = True) -> dict:
+        """
+        Collect the results of a job's dependencies.
+
+        Args:
+            - job: The job about to run.
+            - local: True if the job runs in this process, so shared results are mapped here;
+                False to pass `SharedResult` handles for a worker process to map.
+
+        Returns:
+            - Dictionary mapping each dependency ID to its result (None if it produced none).
+        """
+        with self.lock:
+            inputs = {dep_id: self.values.get(dep_id) for dep_id in job.dependencies}
+            if local:
+                for dep_id, value in inputs.items():
+                    if isinstance(value, SharedResult):
+                        inputs[dep_id] = self._view(value)
+        return inputs
+
+    def release(self, dep_ids: list) -> None:
+        """
+        Drop the references a finished job held on its dependencies, freeing results no longer needed.
+        """
+        if not dep_ids:
+            return
+        with self.lock:
+            for dep_id in dep_ids:
+                self.refs[dep_id] -= 1
+                if self.refs[dep_id] <= 0:
+                    del self.refs[dep_id]
+                    if self.sealed:
+                        self.digests.pop(dep_id, None)
+                        if dep_id in self.values:
+                            self._free(self.values.pop(dep_id))
+
+    def seal(self) -> None:
+        """
+        Declare that no more jobs will be submitted, and free every result nobody depends on.
+        """
+        with self.lock:
+            self.sealed = True
+            for job_id in [job_id for job_id in self.values if not self.refs.get(job_id)]:
+                self._free(self.values.pop(job_id))
+            for job_id in [job_id for job_id in self.digests if not self.refs.get(job_id)]:
+                del self.digests[job_id]
+
+    def close(self) -> None:
+        """
+        Free every result, e.g. when the scheduler shuts down.
+        """
+        with self.lock:
+            for value in self.values.values():
+                self._free(value)
+            self.values.clear()
+            self.digests.clear()
+
+    def metrics(self) -> dict:
+        """
+        Get result store metrics.
+
+        Returns:
+            - Dictionary with the number of results held, how many of them are in shared memory,
+                and how many results were freed.
+        """
+        with self.lock:
+            return {
+                "held": len(self.values),
+                "shared": sum(isinstance(value, SharedResult) for value in self.values.values()),
+                "freed": self.freed_count,
+            }
+
+    def _view(self, handle: SharedResult) -> memoryview:
+        """
+        Map a shared result into this process once. Must be called with the lock held.
+        """
+        if handle.name not in self.segments:
+            self.segments[handle.name] = attach(handle)
+        return self.segments[handle.name][1]
+
+    def _free(self, value: Any) -> None:
+        """
+        Release a result. Must be called with the lock held.
+        """
+        self.freed_count += 1
+        if not isinstance(value, SharedResult):
+            return
+        mapped = self.segments.pop(value.name, None)
+        if mapped:
+            detach(*mapped)
+            segment = mapped[0]
+        else:
+            segment = shared_memory.SharedMemory(name=value.name)
+            segment.close()
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            logger.warning("Shared result %s was already unlinked.", value.name)
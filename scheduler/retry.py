@@ -0,0 +1,90 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Compute the exponential backoff before a retry.
+
+    Args:
+        - attempt: Number of failed attempts so far, starting at 1.
+        - base: Delay after the first failure, in seconds.
+        - cap: Maximum delay, in seconds.
+
+    Returns:
+        - `base * 2 ** (attempt - 1)`, capped at `cap`.
+    """
+    return min(cap, base * 2 ** (attempt - 1))
+
+
+class RetryTimer(threading.Thread):
+    """
+    Background thread that runs callbacks after a delay, e.g. to dispatch a failed job again.
+
+    Delayed callbacks wait in a heap ordered by due time, so jobs waiting to be retried hold
+    neither a worker nor a thread of their own. The thread is started by the first `schedule`.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(name="RetryTimer", daemon=True)
+        self.heap = []
+        self.counter = itertools.count()
+        self.cond = threading.Condition()
+        self.stopped = False
+
+    def schedule(self, delay: float, callback: Callable, *args) -> None:
+        """
+        Run `callback(*args)` on the timer thread after `delay` seconds.
+
+        Args:
+            - delay: Seconds to wait.
+            - callback: The function to call.
+            - args: Positional arguments passed to `callback`.
+        """
+        with self.cond:
+            if not self.is_alive() and not self.stopped:
+                self.start()
+            heapq.heappush(self.heap, (time.monotonic() + delay, next(self.counter), callback, args))
+            self.cond.notify()
+
+    def pending(self) -> int:
+        """
+        Get the number of callbacks waiting to run.
+        """
+        with self.cond:
+            return len(self.heap)
+
+    def run(self) -> None:
+        while True:
+            with self.cond:
+                while not self.stopped:
+                    if self.heap:
+                        remaining = self.heap[0][0] - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self.cond.wait(remaining)
+                    else:
+                        self.cond.wait()
+                if self.stopped:
+                    return
+                _, _, callback, args = heapq.heappop(self.heap)
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error("Error in delayed callback: %s", e)
+
+    def stop(self) -> None:
+        """
+        Stop the thread. Callbacks still waiting are dropped.
+        """
+        with self.cond:
+            self.stopped = True
+            self.cond.notify()
+        if self.is_alive():
+            self.join()
@@ -0,0 +1,326 @@
+import heapq
+import itertools
+import random
+import threading
+from collections import deque
+from typing import IO
+from models.job import Job
+from scheduler.deadlock import DeadlockHandler, DependencyCycleError
+from scheduler.dependency import DependencyTracker
+from scheduler.ingest import StreamProducer
+from scheduler.metrics import PHASES
+from scheduler.producer import Producer
+from scheduler.queue import JobQueue
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Recorder:
+    """
+    Stands in for the queue and the clock of a `Producer`, recording each job with the delay before it.
+    """
+
+    def __init__(self) -> None:
+        self.entries = []
+        self.delay = 0.0
+
+    def sleep(self, seconds: float) -> None:
+        self.delay += seconds
+
+    def put(self, job: Job) -> None:
+        self.entries.append((self.delay, job))
+        self.delay = 0.0
+
+    def put_many(self, jobs: list[Job]) -> list[Job]:
+        for job in jobs:
+            self.put(job)
+        return []
+
+
+def summarize(values: list[float]) -> dict:
+    """
+    Summarize a distribution of durations.
+
+    Args:
+        - values: The durations, in seconds.
+
+    Returns:
+        - Dictionary with the count, mean, maximum and exact 50th, 95th and 99th percentiles.
+    """
+    if not values:
+        return {"count": 0, "mean": 0.0, "max": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+    values = sorted(values)
+    quantile = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "max": values[-1],
+        "p50": quantile(0.50),
+        "p95": quantile(0.95),
+        "p99": quantile(0.99),
+    }
+
+
+class Simulator:
+    """
+    Replays a job set in virtual time to predict how a scheduler configuration would perform.
+
+    Jobs go through the same `JobQueue` (scheduling policy and cycle checking), `DependencyTracker`
+    and deadlock pass as in `JobManager.start`, but nothing sleeps: an event loop advances the clock
+    from one job arrival or completion to the next. The model follows the consumer pool: producers
+    block while the queue is full, the dispatcher takes a job off the queue only while a worker is free,
+    and free workers run ready jobs in policy order for exactly their `execution_time`.
+    Batching, backends and process overheads are not modelled.
+    """
+
+    def __init__(self, producers: list[list[tuple[float, Job]]], scheduling_policy: str = "fifo",
+                 cycle_check: str = "off", deadlock_policy: str = "newest") -> None:
+        """
+        Initialize the simulator.
+
+        Args:
+            - producers: For every producer, its jobs in submission order, each with the seconds the
+                producer waits before submitting it.
+            - scheduling_policy: Order in which queued jobs run ("fifo", "critical-path" or "priority").
+            - cycle_check: Submit-time cycle handling ("off", "reject" or "drop"). With "off", cycles
+                are broken by the deadlock pass once every producer has finished.
+            - deadlock_policy: Which edge of a dependency cycle to remove.
+        """
+        self.producers = producers
+        self.scheduling_policy = scheduling_policy
+        self.cycle_check = cycle_check
+        self.deadlock_policy = deadlock_policy
+
+    @classmethod
+    def from_generator(cls, num_producers: int, jobs_per_producer: int, dependency_chance: float,
+                       seed: int | None = None, time_scale: float = 1.0, **kwargs) -> "Simulator":
+        """
+        Simulate the jobs `JobManager` would generate with the same arguments, including the delays
+        between them. With the same seed, the job set is identical to a real run.
+
+        Args:
+            - num_producers: Number of producers.
+            - jobs_per_producer: Number of jobs each producer generates.
+            - dependency_chance: Chance of jobs having dependencies.
+            - seed: Seed for generating jobs.
+            - time_scale: Factor applied to job execution times and production delays.
+            - kwargs: Other arguments of `Simulator`.
+        """
+        rng = random.Random(seed)
+        producers = []
+        for i in range(num_producers):
+            recorder = _Recorder()
+            producer = Producer(recorder, jobs_per_producer, producer_id=i, max_execution_time=rng.randint(1, 3),
+                                dependency_chance=dependency_chance, seed=None if seed is None else rng.getrandbits(32),
+                                time_scale=time_scale, sleep=recorder.sleep)
+            producer.produce()
+            producers.append(recorder.entries)
+        return cls(producers, **kwargs)
+
+    @classmethod
+    def from_manifest(cls, source: str | IO, **kwargs) -> "Simulator":
+        """
+        Simulate the jobs of a JSON-lines manifest (see `scheduler.ingest`), all submitted at once.
+
+        Args:
+            - source: Path of the manifest ("-" for standard input), or an open file.
+            - kwargs: Other arguments of `Simulator`.
+        """
+        # Like `JobManager`, a manifest is checked for cycles as it is read
+        if kwargs.get("cycle_check", "off") == "off":
+            kwargs["cycle_check"] = "drop"
+        recorder = _Recorder()
+        StreamProducer(recorder, source).run()
+        entries = recorder.entries
+        return cls([entries], **kwargs)
+
+    def run(self, num_workers: int, queue_size: int = 0) -> dict:
+        """
+        Simulate one configuration.
+
+        Args:
+            - num_workers: Number of consumer workers.
+            - queue_size: Bound of the intake queue (0: unbounded).
+
+        Returns:
+            - Dictionary with the configuration, the predicted makespan, throughput and worker utilization,
+                the seconds producers spent blocked on a full queue, the number of jobs that never ran,
+                and a distribution (see `summarize`) per lifecycle phase (see `scheduler.metrics.PHASES`).
+        """
+        run = _Run(self, num_workers, queue_size)
+        run.simulate()
+        makespan = run.now
+        finished = run.finished
+        return {
+            "workers": num_workers,
+            "queue_size": queue_size,
+            "jobs": len(finished),
+            "unfinished": len(run.all_jobs) - len(finished),
+            "makespan": makespan,
+            "throughput": len(finished) / makespan if makespan else 0.0,
+            "utilization": run.busy_time / (num_workers * makespan) if makespan else 0.0,
+            "put_wait_seconds": run.put_wait_time,
+            "latency": {
+                name: summarize([getattr(job, end) - getattr(job, start) for job in finished])
+                for name, (start, end, _) in PHASES.items()
+            },
+        }
+
+    def sweep(self, workers: list[int], queue_sizes: list[int] = (0,)) -> list[dict]:
+        """
+        Simulate every combination of worker count and queue size.
+
+        Args:
+            - workers: Worker counts to try.
+            - queue_sizes: Queue bounds to try (0: unbounded).
+
+        Returns:
+            - List of `run` results.
+        """
+        return [self.run(n, size) for size in queue_sizes for n in workers]
+
+    @staticmethod
+    def _copy(job: Job) -> Job:
+        # Deadlock resolution and the tracker rewrite dependencies, so every run starts from fresh jobs
+        return Job(job.job_id, job.execution_time, list(job.dependencies), priority=job.priority,
+                   resources=job.resources, tenant=job.tenant)
+
+    def _resolve_deadlocks(self, queue: JobQueue, tracker: DependencyTracker, all_jobs: list[Job]) -> list[Job]:
+        """
+        Run the deadlock pass of `JobManager.start` once every job is submitted.
+
+        Returns:
+            - The jobs it released.
+        """
+        if queue.cycle_detector is not None:
+            known = {job.job_id for job in all_jobs}
+            return tracker.drop({dep for job in all_jobs for dep in job.dependencies if dep not in known})
+        if not DeadlockHandler.detect_deadlock(all_jobs):
+            return []
+        removed = DeadlockHandler.break_cycles(all_jobs, self.deadlock_policy)
+        return tracker.refresh({job_id for _, job_id in removed})
+
+
+class _Run:
+    """
+    State of one simulated configuration. Events are job arrivals and completions, in virtual time.
+    """
+
+    def __init__(self, simulator: Simulator, num_workers: int, queue_size: int) -> None:
+        self.simulator = simulator
+        self.queue_size = queue_size
+        self.queue = JobQueue(maxsize=0, policy=simulator.scheduling_policy, cycle_check=simulator.cycle_check)
+        self.ready = self.queue.ready_queue()
+        self.completed_jobs = set()
+        self.tracker = DependencyTracker(self.completed_jobs, threading.Lock())
+        self.producers = [deque((delay, simulator._copy(job)) for delay, job in entries)
+                          for entries in simulator.producers]
+        self.producing = len(self.producers)
+        self.blocked = deque()
+        self.events = []
+        self.counter = itertools.count()
+        self.now = 0.0
+        self.free_workers = num_workers
+        self.busy_time = 0.0
+        self.put_wait_time = 0.0
+        self.all_jobs = []
+        self.finished = []
+
+    def simulate(self) -> None:
+        for index, entries in enumerate(self.producers):
+            if entries:
+                self.arrive(index)
+            else:
+                self.producing -= 1
+
+        while self.events:
+            self.now, _, kind, payload = heapq.heappop(self.events)
+            if kind == "arrive":
+                if self.queue_size and self.queue.queue.qsize() >= self.queue_size:
+                    # The producer blocks on the full queue until the dispatcher takes a job
+                    self.blocked.append((payload, self.now))
+                else:
+                    self.submit(payload, self.now)
+            else:
+                self.finish(payload)
+            self.dispatch()
+
+    def arrive(self, index: int) -> None:
+        delay = self.producers[index][0][0]
+        heapq.heappush(self.events, (self.now + delay, next(self.counter), "arrive", index))
+
+    def submit(self, index: int, arrived_at: float) -> None:
+        _, job = self.producers[index].popleft()
+        self.put_wait_time += self.now - arrived_at
+        try:
+            self.queue.put(job)
+        except DependencyCycleError as e:
+            logger.error("Producer %s rejected job: %s", index, e)
+        else:
+            job.submitted_at = arrived_at
+            self.all_jobs.append(job)
+
+        if self.producers[index]:
+            self.arrive(index)
+            return
+        self.producing -= 1
+        if not self.producing:
+            for job in self.simulator._resolve_deadlocks(self.queue, self.tracker, self.all_jobs):
+                self.make_ready(job)
+
+    def finish(self, job: Job) -> None:
+        job.finished_at = self.now
+        self.free_workers += 1
+        self.busy_time += job.execution_time
+        self.finished.append(job)
+        self.completed_jobs.add(job.job_id)
+        for dependent in self.tracker.complete(job.job_id):
+            self.make_ready(dependent)
+
+    def make_ready(self, job: Job) -> None:
+        job.ready_at = self.now
+        self.ready.put(job)
+
+    def dispatch(self) -> None:
+        """
+        While a worker is free, take a job off the queue and start the highest-ranked ready job.
+        """
+        intake = self.queue.queue
+        while self.free_workers:
+            if intake.qsize():
+                taken = intake.get_nowait()
+                if self.blocked:
+                    self.submit(*self.blocked.popleft())
+                for job in self.tracker.add_many([taken]):
+                    self.make_ready(job)
+            if not self.ready.qsize():
+                if intake.qsize():
+                    continue
+                return
+            job = self.ready.get_nowait()
+            job.started_at = self.now
+            self.free_workers -= 1
+            heapq.heappush(self.events, (self.now + job.execution_time, next(self.counter), "finish", job))
+
+
+def format_table(results: list[dict]) -> str:
+    """
+    Render `Simulator.sweep` results as a text table, one configuration per line.
+
+    Args:
+        - results: The results.
+
+    Returns:
+        - The table.
+    """
+    lines = [f"{'workers':>8}{'queue':>7}{'makespan s':>12}{'jobs/s':>9}{'util':>7}{'put wait s':>12}"
+             f"{'qwait p50':>11}{'qwait p99':>11}{'turnaround p50':>16}{'turnaround p99':>16}"]
+    for result in results:
+        queue_wait, turnaround = result["latency"]["queue_wait"], result["latency"]["turnaround"]
+        lines.append(
+            f"{result['workers']:>8}{result['queue_size'] or '-':>7}{result['makespan']:>12.2f}"
+            f"{result['throughput']:>9.2f}{result['utilization']:>7.0%}{result['put_wait_seconds']:>12.2f}"
+            f"{queue_wait['p50']:>11.2f}{queue_wait['p99']:>11.2f}{turnaround['p50']:>16.2f}{turnaround['p99']:>16.2f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,205 @@
+import random
+import threading
+import time
+from collections import deque
+from queue import Empty
+from models.job import Job
+from scheduler.consumer import Consumer
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class WorkStealingConsumer(Consumer):
+    """
+    A consumer pool without a central dispatcher or shared ready queue.
+
+    Every worker owns a deque of ready jobs. Dependents released by a finished job are pushed onto the
+    deque of the worker that finished it and popped from the same end (most recent first), so a chain
+    of jobs stays on one worker. A worker with an empty deque steals the oldest job of another worker,
+    and only then takes new jobs off the intake queue itself, so the queue bound still applies.
+    One idle worker at a time blocks on the intake queue; the others wait to be woken up when a
+    worker pushes jobs they could steal.
+
+    Deque appends and pops are atomic in CPython, so the deques need no lock. Local deques ignore the
+    scheduling policy, which only orders the intake queue.
+    """
+
+    def __init__(self, *args, idle_timeout: float = 0.01, **kwargs) -> None:
+        """
+        Initialize the consumer pool. Takes the same arguments as `Consumer`.
+
+        Args:
+            - idle_timeout: Maximum number of seconds an idle worker waits before checking for work again.
+        """
+        super().__init__(*args, **kwargs)
+        self.idle_timeout = idle_timeout
+        self.deques = [deque() for _ in range(self.num_workers)]
+        self.steal_counts = [0] * self.num_workers
+        self.intake_counts = [0] * self.num_workers
+        self.local = threading.local()
+        self.work = threading.Condition()
+        self.idle_count = 0
+        self.polling = False
+        self.next_deque = 0
+        self.stopping = threading.Event()
+
+    resizable = False
+
+    def resize(self, num_workers: int) -> None:
+        """
+        Not supported: the worker threads and their deques are fixed when the pool starts.
+
+        Raises:
+            - NotImplementedError: Always.
+        """
+        raise NotImplementedError("A work-stealing pool cannot be resized")
+
+    def dispatch(self, job: Job) -> None:
+        """
+        Push a ready job onto the calling worker's deque, or onto the deques in turn when called
+        from another thread, and wake an idle worker to steal it.
+
+        Args:
+            - job: The job to run.
+        """
+        if job.ready_at is None:
+            job.ready_at = time.perf_counter()
+            self.queue.started(job)
+        index = getattr(self.local, "index", None)
+        if index is None:
+            index = self.next_deque = (self.next_deque + 1) % self.num_workers
+        self.deques[index].append(job)
+        # Read without the lock: a missed wake-up only delays a steal until `idle_timeout`
+        if self.idle_count:
+            with self.work:
+                self.work.notify()
+
+    def take_ready(self) -> Job:
+        try:
+            return self.deques[self.local.index].pop()
+        except IndexError:
+            raise Empty from None
+
+    def run_loop(self, index: int) -> None:
+        """
+        Run ready jobs until the pool shuts down. This function is run by each worker thread.
+
+        Args:
+            - index: Index of the worker's deque.
+        """
+        self.local.index = index
+        while not self.stopping.is_set():
+            try:
+                job = self.find_job(index)
+                if job is None:
+                    continue
+                job.started_at = time.perf_counter()
+                self.run_next(job)
+            except Exception as e:
+                logger.error("Worker %s failed: %s", index, e)
+
+    def find_job(self, index: int) -> Job | None:
+        """
+        Find the next job for a worker: from its own deque, then from another worker's deque,
+        then from the intake queue. Waits up to `idle_timeout` if there is none.
+
+        Args:
+            - index: Index of the worker's deque.
+
+        Returns:
+            - The job to run, or None if there was none.
+        """
+        try:
+            return self.deques[index].pop()
+        except IndexError:
+            pass
+
+        job = self.steal(index)
+        if job is not None:
+            return job
+
+        with self.work:
+            poll = not self.polling
+            if poll:
+                self.polling = True
+            else:
+                self.idle_count += 1
+                self.work.wait(self.idle_timeout)
+                self.idle_count -= 1
+                return None
+
+        try:
+            fetch = time.perf_counter()
+            jobs = self.queue.get_batch(self.batch_size, timeout=self.idle_timeout)
+        finally:
+            with self.work:
+                self.polling = False
+                # Hand the intake over to an idle worker
+                self.work.notify()
+        if not jobs:
+            return None
+
+        self.queue_wait_time += time.perf_counter() - fetch
+        self.intake_counts[index] += len(jobs)
+        ready = self.admit(jobs)
+        for job in ready:
+            job.ready_at = time.perf_counter()
+        self.deques[index].extend(ready)
+        if len(ready) > 1 and self.idle_count:
+            with self.work:
+                self.work.notify(len(ready) - 1)
+        return None
+
+    def steal(self, index: int) -> Job | None:
+        """
+        Take the oldest ready job of another worker, trying victims from a random one onwards.
+
+        Args:
+            - index: Index of the stealing worker's deque.
+
+        Returns:
+            - The stolen job, or None if every other deque is empty.
+        """
+        n = self.num_workers
+        start = random.randrange(n)
+        for offset in range(n):
+            victim = (start + offset) % n
+            if victim == index:
+                continue
+            try:
+                job = self.deques[victim].popleft()
+            except IndexError:
+                continue
+            self.steal_counts[index] += 1
+            return job
+        return None
+
+    def start(self) -> None:
+        """
+        Start the worker loops and wait until the pool shuts down.
+        """
+        self.stats.start()
+        for index in range(self.num_workers):
+            self.executor.submit(self.run_loop, index)
+        self.stopping.wait()
+
+    def metrics(self) -> dict:
+        """
+        Get flow-control metrics of the consumer pool.
+
+        Returns:
+            - The `Consumer` metrics, with the jobs waiting in the local deques ("ready"), the jobs
+                each worker stole ("stolen") and took off the intake queue ("taken").
+        """
+        metrics = super().metrics()
+        metrics["ready"] = sum(len(jobs) for jobs in self.deques)
+        metrics["stolen"] = list(self.steal_counts)
+        metrics["taken"] = list(self.intake_counts)
+        return metrics
+
+    def shutdown(self) -> None:
+        self.stopping.set()
+        with self.work:
+            self.work.notify_all()
+        super().shutdown()
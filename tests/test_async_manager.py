@@ -0,0 +1,67 @@
+import asyncio
+import threading
+from scheduler.async_manager import AsyncConsumer, AsyncJobManager, AsyncJobQueue
+from models.job import Job
+
+def test_async_consumer_releases_dependents():
+    completed_jobs = set()
+    calls = []
+
+    async def work(job_id):
+        await asyncio.sleep(0)
+        calls.append(job_id)
+
+    async def run():
+        queue = AsyncJobQueue(maxsize=2)
+        consumer = AsyncConsumer(queue, num_workers=2, completed_jobs=completed_jobs,
+                                 completed_jobs_lock=threading.Lock())
+        consumer_task = asyncio.create_task(consumer.start())
+
+        await queue.put(Job(3, 0, dependencies=[1, 2], func=work, args=(3,)))
+        await queue.put(Job(2, 0, dependencies=[1], func=work, args=(2,)))
+        await queue.put(Job(1, 0, func=work, args=(1,)))
+        await queue.join()
+
+        consumer_task.cancel()
+        await consumer.shutdown()
+
+    asyncio.run(run())
+    assert completed_jobs == {1, 2, 3}
+    assert calls == [1, 2, 3]
+
+def test_async_consumer_cancels_dependents_of_failed_job():
+    completed_jobs = set()
+
+    async def broken():
+        raise ValueError("broken")
+
+    async def run():
+        queue = AsyncJobQueue()
+        consumer = AsyncConsumer(queue, num_workers=2, completed_jobs=completed_jobs,
+                                 completed_jobs_lock=threading.Lock())
+        consumer_task = asyncio.create_task(consumer.start())
+
+        await queue.put(Job("root", 0, func=broken))
+        await queue.put(Job("child", 0, dependencies=["root"]))
+        await queue.put(Job("grandchild", 0, dependencies=["child"]))
+        await queue.put(Job("other", 0))
+        await asyncio.wait_for(queue.join(), timeout=5)
+        await queue.put(Job("late", 0, dependencies=["root"]))
+        await asyncio.wait_for(queue.join(), timeout=5)
+
+        consumer_task.cancel()
+        await consumer.shutdown()
+        return consumer.failures
+
+    failures = asyncio.run(run())
+    assert completed_jobs == {"other"}
+    assert failures["root"] == "ValueError: broken"
+    assert {job_id for job_id, error in failures.items() if error.startswith("cancelled")} == {"child", "grandchild", "late"}
+
+def test_async_scheduler():
+    job_manager = AsyncJobManager(num_producers=2, num_consumers=2, jobs_per_producer=2, queue_size=2,
+                                  dependency_chance=0.3)
+    asyncio.run(job_manager.start())
+
+    completed_jobs = job_manager.get_completed_jobs()
+    assert len(completed_jobs) == 4
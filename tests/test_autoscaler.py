@@ -0,0 +1,85 @@
+import threading
+import time
+import pytest
+from scheduler.autoscaler import Autoscaler
+from scheduler.consumer import Consumer
+from scheduler.job_manager import JobManager
+from scheduler.queue import JobQueue
+from models.job import Job
+
+def make_consumer(num_workers, max_workers):
+    return Consumer(JobQueue(), num_workers=num_workers, completed_jobs=set(),
+                    completed_jobs_lock=threading.Lock(), max_workers=max_workers)
+
+def start_consumer(num_workers, max_workers):
+    consumer = make_consumer(num_workers, max_workers)
+    threading.Thread(target=consumer.start, daemon=True).start()
+    return consumer
+
+def release_backlog(consumer, count, seconds):
+    """
+    Park `count` dependents of a root job, then complete the root so they all become ready at once.
+    """
+    for i in range(count):
+        consumer.queue.put(Job(i, seconds, dependencies=["root"]))
+    while consumer.tracker.blocked_count() < count:
+        time.sleep(0.001)
+    consumer.queue.put(Job("root", 0))
+    while consumer.ready.qsize() < count - consumer.num_workers:
+        time.sleep(0.001)
+
+def test_resize_runs_waiting_jobs_concurrently():
+    consumer = start_consumer(1, 8)
+    release_backlog(consumer, 8, 0.3)
+    start = time.perf_counter()
+    consumer.resize(8)
+    consumer.queue.queue.join()
+
+    # One worker would take 2.4s
+    assert time.perf_counter() - start < 1.2
+    assert len(consumer.completed_jobs) == 9
+    with pytest.raises(ValueError):
+        consumer.resize(9)
+    with pytest.raises(ValueError):
+        Autoscaler(consumer, min_workers=1, max_workers=16)
+    consumer.shutdown()
+
+def test_autoscaler_grows_on_backlog_and_shrinks_with_hysteresis():
+    consumer = start_consumer(1, 8)
+    autoscaler = Autoscaler(consumer, min_workers=1, max_workers=8, scale_down_after=3, cooldown=0)
+    release_backlog(consumer, 8, 0.3)
+    start = time.perf_counter()
+
+    # Busy workers with a backlog: grow, at most doubling per step
+    autoscaler.last = autoscaler.sample()
+    for workers in (2, 4, 8):
+        autoscaler.step()
+        assert consumer.num_workers == workers
+    consumer.queue.queue.join()
+    assert time.perf_counter() - start < 1.2
+
+    # Idle without a backlog: shrink only after three samples in a row
+    autoscaler.last = autoscaler.sample()
+    for _ in range(2):
+        time.sleep(0.05)
+        autoscaler.step()
+    assert consumer.num_workers == 8
+    time.sleep(0.05)
+    autoscaler.step()
+    assert consumer.num_workers == 4
+
+    metrics = autoscaler.metrics()
+    assert (metrics["scale_ups"], metrics["scale_downs"]) == (3, 1)
+    assert metrics["decisions"][-1]["to"] == 4
+    assert consumer.stats.snapshot()["workers"] == 4
+    consumer.shutdown()
+
+def test_job_manager_autoscaling():
+    job_manager = JobManager(num_producers=2, num_consumers=1, jobs_per_producer=30, queue_size=10,
+                             dependency_chance=0.3, seed=5, time_scale=0.01, min_consumers=1,
+                             max_consumers=4, autoscale_interval=0.05)
+    job_manager.start()
+    assert len(job_manager.get_completed_jobs()) == 60
+    stats = job_manager.stats()
+    assert stats["autoscaler"]["max_workers"] == 4
+    assert stats["jobs"]["worker_seconds"] >= stats["jobs"]["worker_busy_seconds"]
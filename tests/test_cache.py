@@ -0,0 +1,77 @@
+import array
+import threading
+from scheduler.cache import ResultCache
+from scheduler.consumer import Consumer
+from scheduler.queue import JobQueue
+from scheduler.results import ResultStore
+from models.job import Job
+
+calls = []
+
+def add(x, y):
+    calls.append((x, y))
+    return x + y
+
+def total(results):
+    calls.append("total")
+    return sum(results.values())
+
+def run_dag(cache, x, backend="threads"):
+    queue = JobQueue(results=ResultStore(shared=backend != "threads"))
+    completed_jobs = set()
+    queue.put(Job("a", 0, func=add, args=(x, 1)))
+    queue.put(Job("b", 0, func=add, args=(2, 3)))
+    queue.put(Job("sum", 0, dependencies=["a", "b"], func=total, pass_results=True))
+    consumer = Consumer(queue, num_workers=2, completed_jobs=completed_jobs,
+                        completed_jobs_lock=threading.Lock(), backend=backend, cache=cache)
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.queue.join()
+    consumer.shutdown()
+    assert completed_jobs == {"a", "b", "sum"}
+    return queue.results.values["sum"]
+
+def test_cache_hits_skip_execution():
+    cache = ResultCache()
+    calls.clear()
+    assert run_dag(cache, 1) == 7
+    assert len(calls) == 3
+    assert cache.metrics()["misses"] == 3
+
+    calls.clear()
+    assert run_dag(cache, 1) == 7
+    assert calls == []
+    assert cache.metrics()["hits"] == 3
+
+    # A changed upstream result changes the dependent's key
+    calls.clear()
+    assert run_dag(cache, 2) == 8
+    assert calls == [(2, 1), "total"]
+
+def test_cache_lru_eviction():
+    cache = ResultCache(max_bytes=1000)
+    job = Job(1, 0, func=add, args=(1, 2))
+    keys = [cache.key(Job(i, 0, func=add, args=(i, 0)), []) for i in range(3)]
+    for key in keys:
+        cache.put(key, bytes(400))
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2])[0] == bytes(400)
+    assert cache.metrics()["evictions"] == 1
+    assert cache.key(job, None) is None
+    assert cache.key(Job(2, 0), []) is None
+
+def test_disk_cache_survives_restart(tmp_path):
+    value = array.array("d", range(10_000))
+    key = ResultCache(path=str(tmp_path)).key(Job(1, 0, func=add, args=(1, 2)), [])
+    digest = ResultCache(path=str(tmp_path)).put(key, value)
+
+    cache = ResultCache(max_bytes=0, path=str(tmp_path))
+    result, cached_digest = cache.get(key)
+    assert cached_digest == digest
+    assert list(result) == list(value)
+    assert cache.metrics()["disk_hits"] == 1
+
+def test_process_backend_uses_cache():
+    cache = ResultCache()
+    assert run_dag(cache, 1, backend="processes") == 7
+    assert run_dag(cache, 1, backend="processes") == 7
+    assert cache.metrics()["hits"] == 3
@@ -1,7 +1,10 @@
 import threading
+import time
+import pytest
 from scheduler.consumer import Consumer
+from scheduler.deadlock import DependencyCycleError
 from scheduler.queue import JobQueue
-from models.job import Job
+from models.job import CANCELLED, COMPLETED, FAILED, Job
 
 def test_consumer_processes_jobs():
     queue = JobQueue(maxsize=5)
@@ -23,3 +26,166 @@ def test_consumer_processes_jobs():
     assert len(completed_jobs) == 2
     assert 1 in completed_jobs
     assert 2 in completed_jobs
+
+def test_consumer_releases_dependents():
+    queue = JobQueue(maxsize=5)
+    completed_jobs = set()
+    completed_jobs_lock = threading.Lock()
+
+    # Dependents arrive before the job they depend on
+    queue.put(Job(3, 0, dependencies=[1, 2]))
+    queue.put(Job(2, 0, dependencies=[1]))
+    queue.put(Job(1, 0))
+
+    consumer = Consumer(queue, num_workers=2, completed_jobs=completed_jobs, completed_jobs_lock=completed_jobs_lock)
+    consumer_thread = threading.Thread(target=consumer.start, daemon=True)
+    consumer_thread.start()
+
+    queue.queue.join()
+    consumer.shutdown()
+
+    assert completed_jobs == {1, 2, 3}
+    assert consumer.tracker.blocked_count() == 0
+
+def test_consumer_drains_in_batches():
+    queue = JobQueue(maxsize=10)
+    completed_jobs = set()
+
+    queue.put_many([Job(i, 0, dependencies=[i - 1] if i else None) for i in range(6)])
+
+    consumer = Consumer(queue, num_workers=2, completed_jobs=completed_jobs, completed_jobs_lock=threading.Lock(),
+                        batch_size=4)
+    consumer_thread = threading.Thread(target=consumer.start, daemon=True)
+    consumer_thread.start()
+
+    queue.queue.join()
+    consumer.shutdown()
+
+    assert completed_jobs == set(range(6))
+
+def test_consumer_respects_in_flight_credits():
+    queue = JobQueue(maxsize=10)
+    completed_jobs = set()
+    started = threading.Event()
+    release = threading.Event()
+
+    def work():
+        started.set()
+        release.wait(timeout=5)
+
+    for i in range(5):
+        queue.put(Job(i, 0, func=work))
+
+    consumer = Consumer(queue, num_workers=1, completed_jobs=completed_jobs, completed_jobs_lock=threading.Lock(),
+                        in_flight_per_worker=1)
+    threading.Thread(target=consumer.start, daemon=True).start()
+    started.wait(timeout=5)
+
+    # The dispatcher waits for a credit instead of draining the bounded queue
+    assert queue.queue.qsize() == 4
+    metrics = consumer.metrics()
+    assert metrics["in_flight"] == 1
+    assert metrics["max_in_flight"] == 1
+
+    release.set()
+    queue.queue.join()
+    consumer.shutdown()
+    assert completed_jobs == set(range(5))
+
+attempts = []
+
+def flaky(job_id, failures):
+    attempts.append(job_id)
+    if attempts.count(job_id) <= failures:
+        raise RuntimeError("flaky")
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def test_consumer_retries_and_cancels_dependents():
+    attempts.clear()
+    queue = JobQueue()
+    completed_jobs = set()
+    queue.put(Job("flaky", 0, func=flaky, args=("flaky", 2), max_retries=2))
+    queue.put(Job("broken", 0, func=flaky, args=("broken", 5)))
+    queue.put(Job("child", 0, dependencies=["broken", "flaky"]))
+    queue.put(Job("grandchild", 0, dependencies=["child"]))
+    queue.put(Job("after", 0, dependencies=["flaky"]))
+
+    consumer = Consumer(queue, num_workers=2, completed_jobs=completed_jobs, completed_jobs_lock=threading.Lock(),
+                        max_retries=1, retry_backoff=0.01)
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.queue.join()
+    # Jobs depending on a job that already failed are cancelled when they arrive
+    queue.put(Job("late", 0, dependencies=["grandchild"]))
+    queue.queue.join()
+    consumer.shutdown()
+
+    assert completed_jobs == {"flaky", "after"}
+    assert attempts.count("flaky") == 3
+    assert attempts.count("broken") == 2
+    assert consumer.failures["broken"] == "RuntimeError: flaky"
+    assert set(consumer.failures) == {"broken", "child", "grandchild", "late"}
+    snapshot = consumer.stats.snapshot()
+    assert (snapshot["jobs_failed"], snapshot["jobs_retried"], snapshot["jobs_cancelled"]) == (1, 3, 3)
+
+def test_job_states_after_each_outcome():
+    attempts.clear()
+    queue = JobQueue()
+    jobs = {
+        "ok": Job("ok", 0),
+        "retried": Job("retried", 0, func=flaky, args=("retried", 1), max_retries=1),
+        "broken": Job("broken", 0, func=flaky, args=("broken", 5)),
+        "child": Job("child", 0, dependencies=["broken"]),
+    }
+    queue.put_many(list(jobs.values()))
+    consumer = Consumer(queue, num_workers=2, completed_jobs=set(), completed_jobs_lock=threading.Lock(),
+                        retry_backoff=0.01)
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.queue.join()
+    late = Job("late", 0, dependencies=["child"])
+    queue.put(late)
+    queue.queue.join()
+    consumer.shutdown()
+
+    assert jobs["ok"].state == COMPLETED
+    assert (jobs["retried"].state, jobs["retried"].attempts) == (COMPLETED, 1)
+    assert (jobs["broken"].state, jobs["broken"].attempts) == (FAILED, 1)
+    assert jobs["child"].state == CANCELLED
+    assert late.state == CANCELLED
+
+def test_rejected_job_cancels_its_dependents():
+    queue = JobQueue(cycle_check="reject")
+    consumer = Consumer(queue, num_workers=2, completed_jobs=set(), completed_jobs_lock=threading.Lock())
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.put(Job(1, 0, dependencies=[2]))
+    with pytest.raises(DependencyCycleError):
+        queue.put(Job(2, 0, dependencies=[1]))
+    queue.put(Job(3, 0, dependencies=[2]))
+    queue.put(Job(4, 0))
+    queue.queue.join()
+    consumer.shutdown()
+
+    assert consumer.completed_jobs == {4}
+    assert consumer.failures[2].startswith("DependencyCycleError")
+    assert consumer.failures[1].startswith("cancelled") and consumer.failures[3].startswith("cancelled")
+
+def test_process_backend_interrupts_timed_out_jobs():
+    queue = JobQueue()
+    completed_jobs = set()
+    queue.put(Job("slow", 0, func=spin, args=(10,), timeout=0.1))
+    queue.put(Job("fast", 0, func=spin, args=(0,)))
+
+    consumer = Consumer(queue, num_workers=1, completed_jobs=completed_jobs, completed_jobs_lock=threading.Lock(),
+                        backend="processes")
+    start = time.perf_counter()
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.queue.join()
+    consumer.shutdown()
+
+    assert time.perf_counter() - start < 5
+    assert completed_jobs == {"fast"}
+    assert consumer.failures["slow"].startswith("JobTimeoutError")
+    assert consumer.stats.snapshot()["jobs_timed_out"] == 1
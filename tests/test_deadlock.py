@@ -1,4 +1,4 @@
-from scheduler.deadlock import DeadlockHandler
+from scheduler.deadlock import DeadlockHandler, IncrementalCycleDetector
 from models.job import Job
 
 def test_deadlock_detection():
@@ -28,3 +28,69 @@ def test_deadlock_resolution():
     
     assert len(check_deadlock) == 0
 
+
+def test_deadlock_detection_ignores_downstream_jobs():
+    jobs = [
+        Job(1, 2, dependencies=[2]),
+        Job(2, 3, dependencies=[1]),
+        Job(3, 1, dependencies=[1]),  # Downstream of the cycle only
+        Job(4, 1, dependencies=[5]),  # Depends on a job that does not exist
+    ]
+    assert DeadlockHandler.detect_deadlock(jobs) == {1, 2, 4}
+
+def test_break_cycles_removes_minimal_edges():
+    jobs = [
+        Job(1, 2, dependencies=[3]),
+        Job(2, 3, dependencies=[1]),
+        Job(3, 1, dependencies=[2]),
+        Job(4, 1, dependencies=[3]),
+    ]
+    removed = DeadlockHandler.break_cycles(jobs, policy="newest")
+
+    assert removed == [(2, 3)]
+    assert jobs[0].dependencies == [3]
+    assert jobs[3].dependencies == [3]
+    assert DeadlockHandler.detect_deadlock(jobs) == set()
+
+def test_break_cycles_policies():
+    def make_jobs():
+        return [
+            Job(1, 5, dependencies=[2], priority=1),
+            Job(2, 1, dependencies=[1], priority=2),
+        ]
+
+    assert DeadlockHandler.break_cycles(make_jobs(), policy="lowest-priority") == [(2, 1)]
+    assert DeadlockHandler.break_cycles(make_jobs(), policy="cheapest") == [(1, 2)]
+
+def test_find_cycles_deep_chain():
+    # Far deeper than the recursion limit
+    jobs = [Job(i, 0, dependencies=[i - 1]) for i in range(1, 50000)]
+    jobs.append(Job(0, 0, dependencies=[49999]))
+    cycles = DeadlockHandler.find_cycles(jobs)
+    assert len(cycles) == 1
+    assert len(cycles[0]) == 50000
+
+def test_incremental_detection_rejects_cycle():
+    detector = IncrementalCycleDetector()
+    # Forward references: 1 and 2 are placeholders until they are submitted
+    assert detector.add_job(3, [1]) == []
+    assert detector.add_job(1, [2]) == []
+    assert detector.add_job(2, [3]) == [3]
+    assert detector.add_job(4, [4]) == [4]
+
+def test_incremental_detection_reorders():
+    detector = IncrementalCycleDetector()
+    detector.add_job(1, [])
+    detector.add_job(2, [])
+    detector.add_job(3, [])
+    # Edges against the insertion order force a reorder
+    assert detector.add_job(1, [3]) == []
+    assert detector.add_job(3, [2]) == []
+    assert detector.order[2] < detector.order[3] < detector.order[1]
+    assert detector.add_job(2, [1]) == [1]
+
+def test_incremental_detection_atomic():
+    detector = IncrementalCycleDetector()
+    detector.add_job(2, [1])
+    assert detector.add_job(1, [3, 2], atomic=True) == [2]
+    assert 1 not in detector.successors[3]
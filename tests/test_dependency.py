@@ -0,0 +1,81 @@
+import threading
+from scheduler.dependency import CompletionWindow, DependencyTracker
+from models.job import Job
+
+def test_ready_job_is_not_parked():
+    tracker = DependencyTracker(set(), threading.Lock())
+    assert tracker.add(Job(1, 0)) is True
+    assert tracker.blocked_count() == 0
+
+def test_complete_releases_dependents():
+    completed_jobs = set()
+    tracker = DependencyTracker(completed_jobs, threading.Lock())
+    job_2 = Job(2, 0, dependencies=[1])
+    job_3 = Job(3, 0, dependencies=[1, 2])
+
+    assert tracker.add(job_2) is False
+    assert tracker.add(job_3) is False
+    assert tracker.blocked_count() == 2
+
+    assert tracker.complete(1) == [job_2]
+    assert tracker.complete(2) == [job_3]
+    assert tracker.blocked_count() == 0
+    assert completed_jobs == {1, 2}
+
+def test_refresh_after_dependencies_rewritten():
+    tracker = DependencyTracker(set(), threading.Lock())
+    job = Job(1, 0, dependencies=[2])
+    assert tracker.add(job) is False
+
+    job.dependencies = []
+    assert tracker.refresh({1}) == [job]
+    assert tracker.complete(2) == []
+
+def test_completion_window_reclaims_completed_jobs():
+    window = CompletionWindow(retain=2)
+    for job_id in ("a", "b", "c"):
+        window.submitted(job_id)
+    assert "a" not in window
+
+    for job_id in ("a", "b", "c"):
+        window.add(job_id)
+    assert "a" in window
+    assert window.live == set()
+    assert list(window) == ["b", "c"]
+    assert len(window) == 3
+
+def test_completion_window_reclaims_failed_jobs():
+    window = CompletionWindow(retain=2)
+    tracker = DependencyTracker(window, threading.Lock())
+    for job_id in ("a", "b", "c", "d"):
+        window.submitted(job_id)
+    child = Job("b", 0, dependencies=["a"])
+    assert tracker.add(child) is False
+
+    assert tracker.fail("a") == [child]
+    tracker.fail("c")
+    assert window.live == {"d"}
+    assert list(window.failed) == ["b", "c"]
+    assert tracker.add(Job("e", 0, dependencies=["c"])) is False
+    assert list(window.failed) == ["c", "e"]
+    # Dependencies on failures that left the window count as met
+    assert tracker.add(Job("f", 0, dependencies=["a"])) is True
+    assert len(window) == 0
+
+def test_fail_cancels_transitive_dependents():
+    tracker = DependencyTracker(set(), threading.Lock())
+    job_2 = Job(2, 0, dependencies=[1])
+    job_3 = Job(3, 0, dependencies=[2, 4])
+    job_5 = Job(5, 0, dependencies=[4])
+    for job in (job_2, job_3, job_5):
+        assert tracker.add(job) is False
+
+    assert {job.job_id for job in tracker.fail(1)} == {2, 3}
+    assert job_3.state == "cancelled"
+    assert tracker.blocked_count() == 1
+    assert tracker.complete(4) == [job_5]
+
+    late = Job(6, 0, dependencies=[3])
+    assert tracker.add(late) is False
+    assert late.state == "cancelled"
+    assert tracker.blocked_count() == 0
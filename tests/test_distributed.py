@@ -0,0 +1,118 @@
+import multiprocessing
+import threading
+import time
+import pytest
+from multiprocessing.connection import Client
+from models.job import Job
+from scheduler.autoscaler import Autoscaler
+from scheduler.distributed import DistributedConsumer, parse_address, run_worker
+from scheduler.job_manager import JobManager
+from scheduler.queue import JobQueue
+
+def square(x):
+    return x * x
+
+def total(results):
+    return sum(results.values())
+
+def broken():
+    raise ValueError("broken")
+
+def wait_done(queue, timeout=30):
+    joiner = threading.Thread(target=queue.queue.join, daemon=True)
+    joiner.start()
+    joiner.join(timeout)
+    assert not joiner.is_alive(), "jobs did not finish"
+
+def start_coordinator(queue, num_workers, **kwargs):
+    consumer = DistributedConsumer(queue, num_workers=num_workers, completed_jobs=set(),
+                                   completed_jobs_lock=threading.Lock(), **kwargs)
+    threading.Thread(target=consumer.start, daemon=True).start()
+    return consumer
+
+def test_parse_address():
+    assert parse_address("10.0.0.1:7000") == ("10.0.0.1", 7000)
+    assert parse_address(":7000") == ("127.0.0.1", 7000)
+    assert parse_address("/tmp/scheduler.sock") == "/tmp/scheduler.sock"
+
+def test_workers_run_jobs_and_pass_results():
+    queue = JobQueue()
+    queue.put_many([
+        Job("a", 0, func=square, args=(3,)),
+        Job("b", 0, dependencies=["a"], func=total, pass_results=True),
+        Job("c", 0, func=broken),
+        Job("d", 0, dependencies=["c"]),
+    ])
+    consumer = start_coordinator(queue, num_workers=2, chunk_size=2)
+    wait_done(queue)
+
+    assert consumer.completed_jobs == {"a", "b"}
+    assert consumer.results.values["b"] == 9
+    assert consumer.failures["c"] == "ValueError: broken"
+    assert consumer.failures["d"].startswith("cancelled")
+    assert sum(worker["completed"] for worker in consumer.metrics()["workers"].values()) == 3
+    consumer.shutdown()
+    assert consumer.metrics()["workers"] == {}
+    assert all(process.exitcode == 0 for process in consumer.processes)
+
+def test_job_that_cannot_be_sent_fails():
+    queue = JobQueue()
+    queue.put_many([Job("local", 0, func=lambda: 1), Job("ok", 0, func=square, args=(2,))])
+    consumer = start_coordinator(queue, num_workers=1)
+    wait_done(queue)
+    consumer.shutdown()
+    assert consumer.completed_jobs == {"ok"}
+    assert "Can't pickle" in consumer.failures["local"]
+
+def test_leases_of_silent_worker_are_requeued():
+    queue = JobQueue()
+    queue.put_many([Job(i, 0) for i in range(3)])
+    consumer = start_coordinator(queue, num_workers=0, chunk_size=3, heartbeat_interval=0.05, heartbeat_timeout=0.3)
+
+    # A worker that leases every job and then hangs without sending heartbeats
+    connection = Client(consumer.address, authkey=consumer.authkey)
+    connection.send(("hello", "hung"))
+    connection.recv()
+    leased = []
+    while not leased:
+        connection.send(("lease", []))
+        _, leased, _ = connection.recv()
+    assert len(leased) == 3
+
+    worker = multiprocessing.Process(target=run_worker, args=(consumer.address, consumer.authkey), daemon=True)
+    worker.start()
+    wait_done(queue)
+    assert consumer.completed_jobs == {0, 1, 2}
+    assert consumer.metrics()["requeued"] == 3
+
+    # The outcomes the hung worker reports late are ignored
+    connection.send(("lease", [(job.job_id, "RuntimeError: late", None, 0.0) for job in leased]))
+    connection.recv()
+    assert consumer.metrics()["stale_reports"] == 3
+    assert consumer.failures == {}
+    connection.close()
+    consumer.shutdown()
+    worker.join(5)
+    assert worker.exitcode == 0
+
+def test_job_manager_with_distributed_workers():
+    manager = JobManager(num_producers=2, num_consumers=2, jobs_per_producer=25, queue_size=10,
+                         dependency_chance=0.3, backend="distributed", chunk_size=4, seed=5, time_scale=0)
+    start = time.perf_counter()
+    manager.start()
+    assert time.perf_counter() - start < 30
+    assert len(manager.get_completed_jobs()) == 50
+    assert manager.stats()["jobs"]["jobs_completed"] == 50
+
+def test_job_manager_rejects_autoscaling_with_distributed_workers():
+    with pytest.raises(ValueError):
+        JobManager(num_producers=1, num_consumers=2, jobs_per_producer=1, queue_size=5, dependency_chance=0,
+                   backend="distributed", max_consumers=4)
+
+def test_distributed_pool_cannot_be_resized():
+    consumer = start_coordinator(JobQueue(), num_workers=0)
+    with pytest.raises(NotImplementedError):
+        consumer.resize(2)
+    with pytest.raises(ValueError):
+        Autoscaler(consumer, min_workers=1, max_workers=1)
+    consumer.shutdown()
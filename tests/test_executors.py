@@ -0,0 +1,47 @@
+import pickle
+import threading
+from scheduler.consumer import Consumer
+from scheduler.executors import create_backend
+from scheduler.queue import JobQueue
+from models.job import Job
+
+def square(x):
+    return x * x
+
+def fail():
+    raise RuntimeError("boom")
+
+def test_job_pickles():
+    job = Job(1, 0, dependencies=[0], func=square, args=(3,))
+    copy = pickle.loads(pickle.dumps(job))
+    assert copy.job_id == 1
+    assert copy.dependencies == [0]
+    assert copy.func is square
+    copy.execute()
+    assert copy.is_completed is True
+
+def test_hybrid_backend_routes_callables():
+    backend = create_backend("hybrid", 1)
+    try:
+        assert backend.is_remote(Job(1, 0, func=square, args=(2,))) is True
+        assert backend.is_remote(Job(2, 0)) is False
+        assert backend.run_chunk([Job(3, 0, func=square, args=(2,)), Job(4, 0, func=fail)]) == [
+            (None, 4), ("RuntimeError: boom", None)
+        ]
+    finally:
+        backend.shutdown()
+
+def test_process_backend_releases_dependents():
+    queue = JobQueue()
+    completed_jobs = set()
+    queue.put(Job(2, 0, dependencies=[1], func=square, args=(2,)))
+    queue.put(Job(1, 0, func=square, args=(1,)))
+    queue.put(Job(3, 0, dependencies=[1], func=square, args=(3,)))
+
+    consumer = Consumer(queue, num_workers=2, completed_jobs=completed_jobs,
+                        completed_jobs_lock=threading.Lock(), backend="processes", chunk_size=4)
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.queue.join()
+    consumer.shutdown()
+
+    assert completed_jobs == {1, 2, 3}
@@ -0,0 +1,75 @@
+import threading
+import time
+import pytest
+from scheduler.consumer import Consumer
+from scheduler.fairshare import FairShareQueue, parse_tenant_values
+from scheduler.queue import JobQueue
+from models.job import Job
+
+def jobs_of(tenant, n):
+    return [Job(f"{tenant}-{i}", 0, tenant=tenant) for i in range(n)]
+
+def test_parse_tenant_values():
+    assert parse_tenant_values("Producer-0=2, Producer-1=0.5") == {"Producer-0": 2, "Producer-1": 0.5}
+    assert parse_tenant_values(None) == {}
+    with pytest.raises(ValueError):
+        parse_tenant_values("a")
+    with pytest.raises(ValueError):
+        parse_tenant_values("a=0")
+
+def test_weighted_share_between_backlogged_tenants():
+    queue = FairShareQueue(0, weights={"big": 3})
+    for job in jobs_of("big", 100) + jobs_of("small", 100):
+        queue.put(job)
+    tenants = [job.tenant for job in queue.get_many(40)]
+    assert tenants.count("big") == 30
+    assert tenants.count("small") == 10
+    assert queue.qsize() == 160
+
+def test_idle_tenant_cannot_save_credit():
+    queue = FairShareQueue(0)
+    for job in jobs_of("a", 20):
+        queue.put(job)
+    assert len(queue.get_many(10)) == 10
+    for job in jobs_of("b", 20):
+        queue.put(job)
+    tenants = [job.tenant for job in queue.get_many(6)]
+    assert tenants.count("a") == 3 and tenants.count("b") == 3
+
+def test_in_flight_cap_and_rate_limit():
+    queue = FairShareQueue(0, max_in_flight={"a": 1}, rates={"b": 10})
+    for job in jobs_of("a", 3) + jobs_of("b", 30):
+        queue.put(job)
+    jobs = queue.get_many(100, block=False)
+    assert [job.tenant for job in jobs].count("a") == 1
+    assert [job.tenant for job in jobs].count("b") == 10
+    assert queue.get_many(1, block=False) == []
+
+    # Finishing the job of "a" lets its next one through; "b" gets a token every 0.1s
+    queue.release([job for job in jobs if job.tenant == "a"])
+    assert queue.get(timeout=0).tenant == "a"
+    assert queue.get(timeout=0.5).tenant == "b"
+    metrics = queue.metrics()
+    assert metrics["a"]["in_flight"] == 1 and metrics["a"]["state"] == "capped"
+    assert metrics["b"]["served"] == 11 and metrics["b"]["throttled"] >= 1
+
+def test_consumer_shares_workers_between_tenants():
+    queue = JobQueue(fair_share=True, tenant_max_in_flight={"noisy": 1})
+    completed_jobs = set()
+    noisy = [Job(f"noisy-{i}", 0.005, tenant="noisy") for i in range(50)]
+    # A job parked on a later job of the same tenant does not hold its only slot
+    noisy.insert(0, Job("noisy-parked", 0, dependencies=["noisy-49"], tenant="noisy"))
+    queue.put_many(noisy)
+    quiet = [Job(f"quiet-{i}", 0.005, tenant="quiet") for i in range(5)]
+    queue.put_many(quiet)
+
+    consumer = Consumer(queue, num_workers=2, completed_jobs=completed_jobs, completed_jobs_lock=threading.Lock())
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.queue.join()
+    consumer.shutdown()
+
+    assert len(completed_jobs) == 56
+    # The quiet tenant did not wait behind the noisy one's backlog
+    assert max(job.finished_at for job in quiet) < min(job.finished_at for job in noisy[-10:])
+    tenants = queue.metrics()["tenants"]
+    assert tenants["noisy"]["in_flight"] == 0 and tenants["quiet"]["served"] == 5
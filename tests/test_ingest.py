@@ -0,0 +1,60 @@
+import io
+from scheduler.ingest import StreamProducer, parse_job, run_command
+from scheduler.job_manager import JobManager
+from scheduler.queue import JobQueue
+
+MANIFEST = """{"id": "b", "duration": 0, "dependencies": ["a"]}
+{"id": "a", "duration": 0}
+
+not json
+{"id": "a", "duration": 0}
+{"id": "c", "dependencies": ["b", "missing"], "priority": 2}
+"""
+
+def test_parse_job_reads_manifest_keys():
+    job = parse_job({"id": "x", "duration": 2, "dependencies": ["y"], "priority": 3, "command": "true"}, 1)
+    assert (job.job_id, job.execution_time, job.dependencies, job.priority) == ("x", 2, ["y"], 3)
+    assert job.func is run_command and job.args == ("true",)
+    assert parse_job({}, 7).job_id == "line-7"
+
+def test_stream_producer_skips_bad_lines_and_tracks_missing_dependencies():
+    queue = JobQueue(maxsize=10)
+    producer = StreamProducer(queue, io.StringIO(MANIFEST), batch_size=2)
+    producer.start()
+    producer.join()
+
+    assert [job.job_id for job in queue.get_batch(10)] == ["b", "a", "c"]
+    assert producer.job_count == 3
+    assert producer.missing == {"missing"}
+
+def test_stream_producer_without_tracking_keeps_no_ids():
+    queue = JobQueue(maxsize=10)
+    producer = StreamProducer(queue, io.StringIO(MANIFEST), track_missing=False)
+    producer.start()
+    producer.join()
+
+    # The duplicate job is not detected either
+    assert producer.job_count == 4
+    assert producer.seen == set()
+    assert producer.missing == set()
+
+def test_job_manager_runs_streamed_manifest(tmp_path):
+    path = tmp_path / "manifest.jsonl"
+    path.write_text(MANIFEST + '{"id": "d", "dependencies": ["e"]}\n{"id": "e", "dependencies": ["d"]}\n')
+    job_manager = JobManager(num_producers=0, num_consumers=2, jobs_per_producer=0, queue_size=2,
+                             dependency_chance=0, source=str(path))
+    job_manager.start()
+
+    assert job_manager.get_completed_jobs() == ["a", "b", "c", "d", "e"]
+
+def test_job_manager_rejects_streamed_cycles(tmp_path):
+    path = tmp_path / "manifest.jsonl"
+    path.write_text('{"id": "a", "dependencies": ["b"]}\n{"id": "b", "dependencies": ["a"]}\n'
+                    '{"id": "c", "dependencies": ["b"]}\n{"id": "d"}\n')
+    job_manager = JobManager(num_producers=0, num_consumers=2, jobs_per_producer=0, queue_size=10,
+                             dependency_chance=0, source=str(path), cycle_check="reject")
+    job_manager.start()
+
+    assert job_manager.producers[0].rejected == {"b"}
+    assert job_manager.get_completed_jobs() == ["d"]
+    assert sorted(job_manager.get_failed_jobs()) == ["a", "b", "c"]
@@ -1,4 +1,5 @@
-from models.job import Job
+import pytest
+from models.job import Job, JobTimeoutError
 
 def test_job_creation():
     job_0 = Job(job_id=0, execution_time=2)
@@ -22,3 +23,9 @@ def test_execute():
     job.execute()
     assert job.is_completed is True
 
+
+def test_execute_times_out():
+    job = Job(job_id=1, execution_time=5, timeout=0.01)
+    with pytest.raises(JobTimeoutError):
+        job.execute()
+    assert job.is_completed is False
@@ -0,0 +1,37 @@
+from models.job import Job
+from models.job_table import JobTable
+
+def test_job_table_interns_ids():
+    table = JobTable()
+    row_1 = table.add("Job-1", 2)
+    # Forward reference: Job-3 is interned before it is added
+    row_2 = table.add("Job-2", 1, dependencies=["Job-1", "Job-3"], priority=4)
+    row_3 = table.add("Job-3", 5)
+
+    assert (row_1, row_2) == (0, 1)
+    assert row_3 == table.rows["Job-3"]
+    assert list(table.dependencies(row_2)) == [row_1, row_3]
+    assert len(table) == 3
+    assert "Job-3" in table
+    assert "Job-4" not in table
+
+def test_job_table_can_execute():
+    table = JobTable()
+    table.add(0, 1)
+    row = table.add(1, 1, dependencies=[0])
+
+    assert table.can_execute(row) is False
+    table.mark_complete(table.rows[0])
+    assert table.can_execute(row) is True
+
+def test_job_table_round_trip():
+    table = JobTable()
+    table.add_job(Job(0, 2))
+    row = table.add_job(Job(1, 3, dependencies=[0], priority=2))
+
+    job = table.job(row)
+    assert job.job_id == 1
+    assert job.execution_time == 3
+    assert job.dependencies == [0]
+    assert job.priority == 2
+    assert job.is_completed is False
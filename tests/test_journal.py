@@ -0,0 +1,68 @@
+from models.job import Job
+from scheduler.ingest import run_command
+from scheduler.job_manager import JobManager
+from scheduler.journal import Journal, job_from_record, job_to_record
+
+def test_job_record_round_trip():
+    job = Job(job_id="a", execution_time=2, dependencies=["b"], priority=1, func=run_command, args=("true",))
+    rebuilt = job_from_record(job_to_record(job))
+    assert (rebuilt.job_id, rebuilt.dependencies, rebuilt.priority) == ("a", ["b"], 1)
+    assert rebuilt.func is run_command and rebuilt.args == ("true",)
+
+def test_journal_recovers_after_crash(tmp_path):
+    path = str(tmp_path / "journal.log")
+    journal = Journal(path, sync="always")
+    assert len(journal.submit([Job("a", 0), Job("b", 0, ["a"]), Job("c", 0)])) == 3
+    journal.complete("a")
+    journal.file.close()
+    with open(path, "a") as f:
+        f.write('{"op": "compl')  # torn record of the crash
+
+    recovered = Journal(path, sync="group")
+    assert recovered.completed == {"a"}
+    assert [job.job_id for job in recovered.pending_jobs()] == ["b", "c"]
+    # Recovered jobs are accepted once, known jobs are skipped afterwards
+    assert [job.job_id for job in recovered.submit([Job("b", 0), Job("a", 0), Job("d", 0)])] == ["b", "d"]
+    assert recovered.submit([Job("b", 0)]) == []
+    recovered.close()
+
+def test_journal_snapshots_and_truncates_log(tmp_path):
+    path = str(tmp_path / "journal.log")
+    journal = Journal(path, sync="group", snapshot_every=4)
+    for i in range(10):
+        journal.submit([Job(i, 0)])
+        journal.complete(i)
+    journal.close()
+
+    assert journal.metrics()["snapshots"] > 1
+    with open(path) as f:
+        assert len(f.readlines()) < 4
+    assert Journal(path).completed == set(range(10))
+
+def test_job_manager_resumes_from_journal(tmp_path):
+    path = str(tmp_path / "journal.log")
+    journal = Journal(path, sync="none")
+    journal.submit([Job("x", 0), Job("y", 0, ["x"])])
+    journal.complete("x")
+    journal.close()
+
+    job_manager = JobManager(num_producers=0, num_consumers=1, jobs_per_producer=0, queue_size=5,
+                             dependency_chance=0, journal_path=path)
+    job_manager.start()
+
+    assert job_manager.get_completed_jobs() == ["x", "y"]
+    assert job_manager.stats()["journal"]["pending"] == 0
+
+def test_job_manager_skips_regenerated_jobs(tmp_path):
+    path = str(tmp_path / "journal.log")
+    journal = Journal(path, sync="none")
+    journal.submit([Job("Producer-0-Job-0", 0), Job("Producer-0-Job-1", 0)])
+    journal.complete("Producer-0-Job-1")
+    journal.close()
+
+    job_manager = JobManager(num_producers=1, num_consumers=1, jobs_per_producer=3, queue_size=5,
+                             dependency_chance=0, time_scale=0, journal_path=path)
+    job_manager.start()
+
+    assert sorted(job.job_id for job in job_manager.all_jobs) == ["Producer-0-Job-0", "Producer-0-Job-2"]
+    assert job_manager.get_completed_jobs() == ["Producer-0-Job-0", "Producer-0-Job-1", "Producer-0-Job-2"]
@@ -0,0 +1,49 @@
+import io
+import json
+import logging
+from utils.logger import JsonFormatter, RateLimitFilter, configure_logging, get_logger, shutdown_logging
+
+def make_record(msg, *args):
+    return logging.LogRecord("test", logging.WARNING, __file__, 1, msg, args, None)
+
+def test_json_formatter():
+    line = JsonFormatter().format(make_record("Job %s skipped", 7))
+    entry = json.loads(line)
+    assert entry["message"] == "Job 7 skipped"
+    assert entry["level"] == "WARNING"
+
+def test_rate_limit_filter():
+    rate_limit = RateLimitFilter(burst=2, interval=60)
+    allowed = [rate_limit.filter(make_record("Job %s skipped", i)) for i in range(5)]
+    assert allowed == [True, True, False, False, False]
+    # Other templates have their own budget
+    assert rate_limit.filter(make_record("Job %s completed", 1)) is True
+
+    rate_limit.interval = 0
+    record = make_record("Job %s skipped", 9)
+    assert rate_limit.filter(record) is True
+    assert record.getMessage() == "Job 9 skipped (3 similar messages suppressed)"
+
+def test_async_logging_writes_on_listener():
+    stream = io.StringIO()
+    configure_logging(mode="async", fmt="json", stream=stream)
+    try:
+        get_logger("test").warning("Job %s skipped", 3)
+    finally:
+        shutdown_logging()
+        configure_logging()
+
+    assert json.loads(stream.getvalue())["message"] == "Job 3 skipped"
+
+def test_async_logging_snapshots_mutable_args():
+    stream = io.StringIO()
+    configure_logging(mode="async", fmt="json", stream=stream)
+    try:
+        unmet = [1, 2]
+        get_logger("test").warning("Job 3 waiting on dependencies: %s", unmet)
+        unmet.clear()
+    finally:
+        shutdown_logging()
+        configure_logging()
+
+    assert json.loads(stream.getvalue())["message"] == "Job 3 waiting on dependencies: [1, 2]"
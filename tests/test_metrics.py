@@ -0,0 +1,56 @@
+import json
+from models.job import Job
+from scheduler.job_manager import JobManager
+from scheduler.metrics import Histogram, JobStats, to_prometheus, write_stats
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.05, 0.5, 2.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 1, "+Inf": 1}
+    assert snapshot["p50"] == 0.1
+    assert snapshot["p99"] == 2.0
+
+def test_job_stats_aggregates_recorded_jobs():
+    stats = JobStats(num_workers=1)
+    job = Job(job_id=1, execution_time=0)
+    job.submitted_at, job.ready_at, job.started_at, job.finished_at = 1.0, 1.5, 2.0, 4.0
+    stats.record(job)
+    stats.record_failure(Job(job_id=2, execution_time=0))
+
+    snapshot = stats.snapshot()
+    assert snapshot["jobs_completed"] == 1
+    assert snapshot["jobs_failed"] == 1
+    assert snapshot["worker_busy_seconds"] == 2.0
+    assert snapshot["latency"]["dependency_wait"]["sum"] == 0.5
+    assert snapshot["latency"]["queue_wait"]["sum"] == 0.5
+    assert snapshot["latency"]["turnaround"]["sum"] == 3.0
+
+def test_job_manager_stats_and_export(tmp_path):
+    path = tmp_path / "stats.prom"
+    job_manager = JobManager(num_producers=1, num_consumers=2, jobs_per_producer=5, queue_size=5,
+                             dependency_chance=0.5, seed=3, time_scale=0, stats_path=str(path),
+                             stats_format="prometheus")
+    job_manager.start()
+
+    stats = job_manager.stats()
+    assert stats["jobs"]["jobs_completed"] == 5
+    assert stats["jobs"]["latency"]["turnaround"]["count"] == 5
+    assert stats["consumer"]["in_flight"] == 0
+
+    exported = path.read_text()
+    assert "scheduler_jobs_completed_total 5" in exported
+    assert 'scheduler_job_queue_wait_seconds_bucket{le="+Inf"} 5' in exported
+
+def test_write_stats_json(tmp_path):
+    path = tmp_path / "stats.json"
+    stats = {"jobs": JobStats(num_workers=1).snapshot(), "queue": {}, "consumer": {}}
+    write_stats(stats, str(path), "json")
+
+    assert json.loads(path.read_text())["jobs"]["jobs_completed"] == 0
+    assert "scheduler_jobs_failed_total 0" in to_prometheus(
+        {"jobs": stats["jobs"], "queue": {"size": 0, "put_wait_seconds": 0.0},
+         "consumer": {"in_flight": 0, "ready": 0, "blocked_on_dependencies": 0}})
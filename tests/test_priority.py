@@ -0,0 +1,45 @@
+from scheduler.priority import CriticalPathRanker, PriorityJobQueue
+from models.job import Job
+
+def test_rank_propagates_to_dependencies():
+    ranker = CriticalPathRanker()
+    ranker.observe(Job(1, 2))
+    ranker.observe(Job(2, 1))
+    changed = ranker.observe(Job(3, 5, dependencies=[1]))
+
+    assert changed == {1, 3}
+    assert ranker.get(Job(1, 2)) == 7
+    assert ranker.get(Job(2, 1)) == 1
+
+def test_edges_to_later_dependencies_are_linked():
+    ranker = CriticalPathRanker()
+    ranker.observe(Job(2, 5, dependencies=[1]))
+    assert ranker.observe(Job(1, 2)) == {1}
+    assert ranker.get(Job(1, 2)) == 7
+    assert ranker.observe(Job(3, 4, dependencies=[2])) == {1, 2, 3}
+    assert ranker.get(Job(1, 2)) == 11
+
+    ranker.forget(3)
+    ranker.observe(Job(4, 1, dependencies=[5]))
+    ranker.forget(4)
+    assert ranker.pending == {}
+
+def test_forget_stops_propagation():
+    ranker = CriticalPathRanker()
+    ranker.observe(Job(1, 2))
+    ranker.forget(1)
+    assert ranker.observe(Job(2, 3, dependencies=[1])) == {2}
+
+def test_priority_queue_reprioritize():
+    ranks = {1: 1, 2: 2}
+    queue = PriorityJobQueue(0, key=lambda job: (-ranks[job.job_id],))
+    queue.put(Job(1, 0))
+    queue.put(Job(2, 0))
+
+    ranks[1] = 3
+    queue.reprioritize({1})
+
+    assert queue.qsize() == 2
+    assert queue.get().job_id == 1
+    assert queue.get().job_id == 2
+    assert queue.empty()
@@ -15,3 +15,31 @@ def test_producer_generates_jobs():
         job = queue.queue.get()
         assert job.job_id.startswith("Producer-1-Job-")
         assert isinstance(job.execution_time, int)
+
+def test_producer_submits_in_batches():
+    queue = JobQueue(maxsize=10)
+    producer = Producer(queue, job_count=3, producer_id=2, batch_size=2)
+    producer.start()
+    producer.join()
+
+    assert queue.queue.qsize() == 3
+    assert [job.job_id for job in queue.get_batch(3)] == [f"Producer-2-Job-{i}" for i in range(3)]
+
+def test_producer_with_seed_is_reproducible():
+    graphs = []
+    for _ in range(2):
+        queue = JobQueue(maxsize=20)
+        producer = Producer(queue, job_count=10, producer_id=3, dependency_chance=0.5, seed=42, time_scale=0)
+        producer.start()
+        producer.join()
+        graphs.append([(job.job_id, job.execution_time, job.dependencies) for job in queue.get_batch(10)])
+
+    assert graphs[0] == graphs[1]
+
+def test_producer_time_scale_scales_execution_time():
+    queue = JobQueue(maxsize=10)
+    producer = Producer(queue, job_count=3, producer_id=4, seed=1, time_scale=0)
+    producer.start()
+    producer.join()
+
+    assert all(job.execution_time == 0 for job in queue.get_batch(3))
@@ -1,4 +1,7 @@
+import threading
+import pytest
 from scheduler.queue import JobQueue
+from scheduler.deadlock import DependencyCycleError
 from models.job import Job
 
 def test_job_queue_operations():
@@ -21,3 +24,70 @@ def test_job_queue_operations():
     # Verify queue is empty
     assert queue.queue.empty()
 
+
+def test_job_queue_priority_policy():
+    queue = JobQueue(maxsize=3, policy="priority")
+    queue.put(Job(1, 1, priority=0))
+    queue.put(Job(2, 1, priority=5))
+    queue.put(Job(3, 1, priority=0))
+
+    assert [queue.get().job_id for _ in range(3)] == [2, 1, 3]
+
+def test_job_queue_critical_path_policy():
+    queue = JobQueue(policy="critical-path")
+    queue.put(Job(1, 1))
+    queue.put(Job(2, 2))
+    # Job 1 now heads a path of length 1 + 4 and overtakes job 2
+    queue.put(Job(3, 4, dependencies=[1]))
+
+    assert queue.get().job_id == 1
+
+def test_job_queue_cycle_check():
+    queue = JobQueue(cycle_check="reject")
+    queue.put(Job(1, 1, dependencies=[2]))
+    with pytest.raises(DependencyCycleError):
+        queue.put(Job(2, 1, dependencies=[1]))
+    assert queue.queue.qsize() == 1
+
+    queue = JobQueue(cycle_check="drop")
+    queue.put(Job(1, 1, dependencies=[2]))
+    job = Job(2, 1, dependencies=[1, 3])
+    queue.put(job)
+    assert job.dependencies == [3]
+
+def test_job_queue_batch_operations():
+    queue = JobQueue(maxsize=10)
+    queue.put_many([Job(i, 0) for i in range(5)])
+    assert queue.queue.qsize() == 5
+
+    batch = queue.get_batch(3)
+    assert [job.job_id for job in batch] == [0, 1, 2]
+    assert [job.job_id for job in queue.get_batch(10)] == [3, 4]
+    assert queue.get_batch(10, timeout=0.01) == []
+
+    queue.task_done(5)
+    queue.queue.join()  # Returns immediately once every job is accounted for
+
+    with pytest.raises(ValueError):
+        queue.task_done(1)
+
+def test_job_queue_put_many_blocks_when_full():
+    queue = JobQueue(maxsize=2)
+    consumed = []
+
+    def consume():
+        while len(consumed) < 5:
+            consumed.extend(queue.get_batch(2))
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    queue.put_many([Job(i, 0) for i in range(5)])
+    consumer.join(timeout=5)
+
+    assert [job.job_id for job in consumed] == [0, 1, 2, 3, 4]
+
+def test_job_queue_put_many_rejects_cycles():
+    queue = JobQueue(cycle_check="reject")
+    rejected = queue.put_many([Job(1, 0, dependencies=[2]), Job(2, 0, dependencies=[1]), Job(3, 0)])
+    assert [job.job_id for job in rejected] == [2]
+    assert queue.queue.qsize() == 2
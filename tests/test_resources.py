@@ -0,0 +1,85 @@
+import threading
+import time
+import pytest
+from scheduler.consumer import Consumer
+from scheduler.queue import JobQueue
+from scheduler.resources import ResourcePool, parse_resources
+from models.job import Job
+
+def test_parse_resources():
+    assert parse_resources("cpu=4, memory=8192,db-connections=0.5") == {"cpu": 4, "memory": 8192, "db-connections": 0.5}
+    assert parse_resources({"gpu": 1}) == {"gpu": 1.0}
+    assert parse_resources(None) == {}
+    with pytest.raises(ValueError):
+        parse_resources("cpu")
+    with pytest.raises(ValueError):
+        parse_resources("cpu=-1")
+
+def test_backfill_does_not_delay_waiting_job():
+    pool = ResourcePool({"cpu": 4})
+    pool.submit(Job("running", 10, resources={"cpu": 3}))
+    assert pool.select().job_id == "running"
+
+    # "large" waits for "running" (expected to finish in 10s); "long" would delay it, "short" would not
+    pool.submit(Job("large", 1, resources={"cpu": 4}))
+    pool.submit(Job("long", 60, resources={"cpu": 1}))
+    pool.submit(Job("short", 1, resources={"cpu": 1}))
+    assert pool.select().job_id == "short"
+    assert pool.select() is None
+    assert pool.metrics()["backfilled"] == 1
+
+def test_backfill_picks_best_fit():
+    pool = ResourcePool({"cpu": 4, "memory": 1000})
+    pool.submit(Job("running", 10, resources={"cpu": 2}))
+    pool.select()
+    pool.submit(Job("large", 1, resources={"cpu": 4}))
+    pool.submit(Job("small", 1, resources={"cpu": 1}))
+    pool.submit(Job("snug", 1, resources={"cpu": 2, "memory": 800}))
+    assert pool.select().job_id == "snug"
+
+def test_pool_releases_and_measures_utilization():
+    pool = ResourcePool({"db": 2})
+    job = Job(1, 0, resources={"db": 2})
+    assert pool.check(job) is None
+    assert "capacity" in pool.check(Job(2, 0, resources={"db": 3}))
+    assert "unknown" in pool.check(Job(3, 0, resources={"gpu": 1}))
+
+    pool.submit(job)
+    pool.submit(Job(4, 0, resources={"db": 1}))
+    assert pool.select() is job
+    time.sleep(0.05)
+    pool.release(job)
+    time.sleep(0.05)
+    metrics = pool.metrics()["resources"]["db"]
+    assert metrics["peak"] == 2 and metrics["in_use"] == 0
+    assert 0.3 < metrics["utilization"] < 0.7
+    assert pool.select().job_id == 4
+
+def test_consumer_never_exceeds_capacity():
+    queue = JobQueue(maxsize=20)
+    completed_jobs = set()
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def query():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    queue.put_many([Job(i, 0.02, func=query, resources={"db": 1}) for i in range(8)])
+    queue.put(Job("oversized", 0, resources={"db": 3}))
+    queue.put(Job("dependent", 0, dependencies=["oversized"]))
+    consumer = Consumer(queue, num_workers=4, completed_jobs=completed_jobs, completed_jobs_lock=threading.Lock(),
+                        resources={"db": 2})
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.queue.join()
+    consumer.shutdown()
+
+    assert completed_jobs == set(range(8))
+    assert peak[0] == 2
+    assert "ResourceError" in consumer.failures["oversized"]
+    assert "cancelled" in consumer.failures["dependent"]
+    assert consumer.resource_metrics()["resources"]["db"]["peak"] == 2
@@ -0,0 +1,93 @@
+import array
+import threading
+import time
+import pytest
+from multiprocessing import shared_memory
+from scheduler.consumer import Consumer
+from scheduler.deadlock import DeadlockHandler
+from scheduler.queue import JobQueue
+from scheduler.results import ResultStore, SharedResult, attach, detach, to_shared
+from models.job import Job
+
+def make_buffer(n):
+    return array.array("d", range(n))
+
+def total(results):
+    return sum(sum(value) for value in results.values())
+
+def check_total(results):
+    if results[3] != sum(range(10_000)) + sum(range(10)):
+        raise ValueError(results)
+
+def test_shared_result_round_trip():
+    value = make_buffer(10_000)
+    handle = to_shared(value)
+    assert isinstance(handle, SharedResult)
+    assert to_shared(b"small") == b"small"
+    assert to_shared(42) == 42
+
+    segment, view = attach(handle)
+    try:
+        assert view.format == "d" and view.shape == (10_000,)
+        assert view.readonly
+        assert view.tolist() == value.tolist()
+    finally:
+        detach(segment, view)
+        segment.unlink()
+
+def test_store_frees_results_after_last_dependent():
+    store = ResultStore(shared=True)
+    store.retain([1])
+    store.retain([1])
+    store.put(1, make_buffer(10_000))
+    store.put(2, "unused")
+    assert store.metrics() == {"held": 2, "shared": 1, "freed": 0}
+
+    store.seal()
+    assert store.metrics()["held"] == 1
+
+    name = store.values[1].name
+    assert sum(store.inputs(Job(3, 0, dependencies=[1]))[1]) == sum(range(10_000))
+    store.release([1])
+    store.release([1])
+    assert store.metrics() == {"held": 0, "shared": 0, "freed": 2}
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+@pytest.mark.parametrize("backend", ["threads", "processes"])
+def test_dependents_receive_results(backend):
+    queue = JobQueue(results=ResultStore(shared=backend != "threads"))
+    completed_jobs = set()
+    queue.put(Job(1, 0, func=make_buffer, args=(10_000,)))
+    queue.put(Job(2, 0, func=make_buffer, args=(10,)))
+    queue.put(Job(3, 0, dependencies=[1, 2], func=total, pass_results=True))
+    queue.put(Job(4, 0, dependencies=[3], func=check_total, pass_results=True))
+
+    consumer = Consumer(queue, num_workers=2, completed_jobs=completed_jobs,
+                        completed_jobs_lock=threading.Lock(), backend=backend)
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.queue.join()
+    consumer.shutdown()
+
+    assert completed_jobs == {1, 2, 3, 4}
+    queue.results.seal()
+    assert queue.results.metrics()["held"] == 0
+
+def test_references_of_broken_cycle_edges_are_released():
+    queue = JobQueue()
+    jobs = [Job(1, 0, dependencies=[2], func=make_buffer, args=(10,)),
+            Job(2, 0, dependencies=[1], func=make_buffer, args=(10,))]
+    queue.put_many(jobs)
+    consumer = Consumer(queue, num_workers=2, completed_jobs=set(), completed_jobs_lock=threading.Lock())
+    threading.Thread(target=consumer.start, daemon=True).start()
+    while consumer.tracker.blocked_count() < 2:
+        time.sleep(0.001)
+
+    queue.results.seal()
+    removed = DeadlockHandler.break_cycles(jobs)
+    consumer.release({job_id for _, job_id in removed})
+    queue.queue.join()
+    consumer.shutdown()
+
+    assert queue.results.refs == {}
+    assert queue.results.metrics()["held"] == 0
@@ -30,3 +30,40 @@ def test_scheduler():
 
     assert len(completed_jobs) == len(set(completed_jobs))
 
+
+def test_job_manager_service_mode():
+    job_manager = JobManager(num_producers=2, num_consumers=2, jobs_per_producer=50, queue_size=5,
+                             dependency_chance=0.5, seed=4, time_scale=0, service=True,
+                             retain_completed=10, dependency_window=5)
+    server = threading.Thread(target=job_manager.serve)
+    server.start()
+    job_manager.submit(Job(job_id="extra", execution_time=0))
+    job_manager.submit(Job(job_id="extra-dependent", execution_time=0, dependencies=["extra"]))
+    job_manager.stop()
+    server.join(timeout=10)
+
+    assert not server.is_alive()
+    assert len(job_manager.completed_jobs) == 102
+    assert len(job_manager.get_completed_jobs()) == 10
+    assert job_manager.completed_jobs.live == set()
+    assert job_manager.all_jobs == []
+
+def broken():
+    raise ValueError("broken")
+
+def test_service_mode_reclaims_failed_jobs():
+    job_manager = JobManager(num_producers=0, num_consumers=2, jobs_per_producer=0, queue_size=5,
+                             dependency_chance=0, time_scale=0, service=True, retain_completed=3)
+    server = threading.Thread(target=job_manager.serve)
+    server.start()
+    for i in range(5):
+        job_manager.submit(Job(job_id=f"broken-{i}", execution_time=0, func=broken))
+        job_manager.submit(Job(job_id=f"dependent-{i}", execution_time=0, dependencies=[f"broken-{i}"]))
+    job_manager.stop()
+    server.join(timeout=10)
+
+    assert not server.is_alive()
+    assert job_manager.completed_jobs.live == set()
+    assert len(job_manager.completed_jobs.failed) == 3
+    assert len(job_manager.get_failed_jobs()) == 3
+    assert job_manager.stats()["jobs"]["jobs_failed"] == 5
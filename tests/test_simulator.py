@@ -0,0 +1,61 @@
+import io
+import json
+from models.job import Job
+from scheduler.job_manager import JobManager
+from scheduler.simulator import Simulator, format_table, summarize
+
+def simulator_of(jobs, **kwargs):
+    return Simulator([[(0.0, job) for job in jobs]], **kwargs)
+
+def test_independent_jobs_share_workers():
+    result = simulator_of([Job(i, 1.0) for i in range(4)]).run(2)
+    assert result["makespan"] == 2.0
+    assert result["jobs"] == 4 and result["unfinished"] == 0
+    assert result["utilization"] == 1.0
+    # The dispatcher only takes a job off the queue for a free worker, so the wait counts before "ready"
+    assert result["latency"]["dependency_wait"]["max"] == 1.0
+    assert result["latency"]["turnaround"]["max"] == 2.0
+
+def test_chain_runs_sequentially():
+    jobs = [Job(0, 1.0), Job(1, 2.0, [0]), Job(2, 0.5, [1])]
+    results = simulator_of(jobs).sweep([1, 4])
+    assert [result["makespan"] for result in results] == [3.5, 3.5]
+    assert results[1]["utilization"] == 3.5 / (4 * 3.5)
+
+def test_bounded_queue_blocks_producer():
+    jobs = [Job(i, 1.0) for i in range(6)]
+    unbounded, bounded = simulator_of(jobs).sweep([1], [0, 2])
+    assert unbounded["makespan"] == bounded["makespan"] == 6.0
+    assert unbounded["put_wait_seconds"] == 0
+    assert bounded["put_wait_seconds"] > 0
+
+def test_generator_matches_job_manager():
+    manager = JobManager(num_producers=2, num_consumers=1, jobs_per_producer=20,
+                         queue_size=0, dependency_chance=0.5, seed=3)
+    for producer in manager.producers:
+        producer.sleep = lambda seconds: None
+        producer.produce()
+    expected = {job.job_id: job.execution_time for producer in manager.producers for job in producer.generated_jobs}
+    simulator = Simulator.from_generator(2, 20, 0.5, seed=3)
+    simulated = {job.job_id: job.execution_time for entries in simulator.producers for _, job in entries}
+    assert simulated == expected
+
+    result = simulator.run(2)
+    assert result["jobs"] == 40 and result["unfinished"] == 0
+
+def test_manifest_with_cycle_and_missing_dependency_completes():
+    manifest = io.StringIO("\n".join(json.dumps(record) for record in [
+        {"id": "a", "duration": 1, "dependencies": ["c"]},
+        {"id": "b", "duration": 1, "dependencies": ["a"]},
+        {"id": "c", "duration": 1, "dependencies": ["b"]},
+        {"id": "d", "duration": 2, "dependencies": ["missing"]},
+    ]))
+    result = Simulator.from_manifest(manifest).run(2)
+    assert result["jobs"] == 4 and result["unfinished"] == 0
+    assert result["makespan"] == 3.0
+    assert "workers" in format_table([result])
+
+def test_summarize():
+    assert summarize([]) == {"count": 0, "mean": 0.0, "max": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+    summary = summarize([float(i) for i in range(100)])
+    assert summary["p50"] == 50.0 and summary["p99"] == 99.0 and summary["max"] == 99.0
@@ -0,0 +1,71 @@
+import threading
+import time
+import pytest
+from scheduler.autoscaler import Autoscaler
+from scheduler.job_manager import JobManager
+from scheduler.queue import JobQueue
+from scheduler.stealing import WorkStealingConsumer
+from models.job import Job
+
+def square(x):
+    return x * x
+
+def run(jobs, num_workers, **kwargs):
+    queue = JobQueue(maxsize=5)
+    completed_jobs = set()
+    consumer = WorkStealingConsumer(queue, num_workers=num_workers, completed_jobs=completed_jobs,
+                                    completed_jobs_lock=threading.Lock(), **kwargs)
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.put_many(jobs)
+    queue.queue.join()
+    metrics = consumer.metrics()
+    consumer.shutdown()
+    return completed_jobs, metrics
+
+def test_idle_workers_steal_released_dependents():
+    # The root holds its worker until every dependent is parked, then releases them all onto its deque
+    gate = threading.Event()
+    jobs = [Job("root", 0, func=gate.wait, args=(10,))] + [Job(i, 0.01, dependencies=["root"]) for i in range(20)]
+    queue = JobQueue(maxsize=5)
+    completed_jobs = set()
+    consumer = WorkStealingConsumer(queue, num_workers=4, completed_jobs=completed_jobs,
+                                    completed_jobs_lock=threading.Lock())
+    threading.Thread(target=consumer.start, daemon=True).start()
+    queue.put_many(jobs)
+    while consumer.tracker.blocked_count() < 20:
+        time.sleep(0.001)
+    gate.set()
+    queue.queue.join()
+    metrics = consumer.metrics()
+    consumer.shutdown()
+
+    assert completed_jobs == {"root", *range(20)}
+    assert sum(metrics["stolen"]) > 0
+    assert sum(metrics["taken"]) == 21
+    assert metrics["ready"] == 0
+
+def test_work_stealing_chains_and_chunks():
+    jobs = [Job(f"{c}-{i}", 0, dependencies=[f"{c}-{i - 1}"] if i else [], func=square, args=(i,))
+            for c in range(3) for i in range(10)]
+    completed_jobs, _ = run(jobs, num_workers=2, backend="hybrid", chunk_size=4)
+    assert len(completed_jobs) == 30
+
+def test_job_manager_work_stealing():
+    job_manager = JobManager(num_producers=2, num_consumers=3, jobs_per_producer=20, queue_size=5,
+                             dependency_chance=0.5, seed=3, time_scale=0, work_stealing=True)
+    job_manager.start()
+    assert len(job_manager.get_completed_jobs()) == 40
+
+def test_job_manager_rejects_autoscaling_with_work_stealing():
+    with pytest.raises(ValueError):
+        JobManager(num_producers=1, num_consumers=2, jobs_per_producer=1, queue_size=5, dependency_chance=0,
+                   work_stealing=True, min_consumers=1)
+
+def test_work_stealing_pool_cannot_be_resized():
+    consumer = WorkStealingConsumer(JobQueue(), num_workers=2, completed_jobs=set(),
+                                    completed_jobs_lock=threading.Lock(), max_workers=4)
+    with pytest.raises(NotImplementedError):
+        consumer.resize(4)
+    with pytest.raises(ValueError):
+        Autoscaler(consumer, min_workers=1, max_workers=4)
+    consumer.shutdown()
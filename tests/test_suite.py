@@ -0,0 +1,34 @@
+from benchmarks.suite import METRICS, SWEEP_KEYS, compare, percentile
+
+def make_result(**metrics):
+    result = dict(zip(SWEEP_KEYS, (1, 2, 100, 10, 0.0)))
+    result.update({metric: 1.0 for metric in METRICS})
+    result.update(metrics)
+    return result
+
+def test_percentile_edge_cases():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([3.0], 0.0) == 3.0
+    assert percentile([3.0], 1.0) == 3.0
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 0.5) == 51.0
+    assert percentile(values, 0.99) == 100.0
+    assert percentile(values, 1.0) == 100.0
+
+def test_compare_within_tolerance():
+    baseline = {"results": [make_result()]}
+    assert compare([make_result(jobs_per_second=0.95, makespan=1.05)], baseline, tolerance=0.1) == []
+
+def test_compare_reports_regressions():
+    baseline = {"results": [make_result(latency_p99=0.0)]}
+    results = [make_result(jobs_per_second=0.8, makespan=1.2, peak_memory_bytes=0.5, latency_p99=5.0)]
+    regressions = compare(results, baseline, tolerance=0.1)
+
+    # Improvements and metrics without a baseline value are not regressions
+    assert len(regressions) == 2
+    assert "jobs_per_second 1 -> 0.8 (-20.0%)" in regressions[0]
+    assert "makespan 1 -> 1.2 (+20.0%)" in regressions[1]
+
+def test_compare_skips_configurations_missing_from_baseline():
+    baseline = {"results": [make_result(consumers=4)]}
+    assert compare([make_result(jobs_per_second=0.1)], baseline, tolerance=0.1) == []
@@ -0,0 +1,33 @@
+from models.job import Job
+from utils.tracing import Tracer, disable_tracing, enable_tracing, trace_span, tracing_enabled
+
+def test_trace_span_is_noop_when_disabled():
+    disable_tracing()
+    with trace_span("noop"):
+        pass
+    assert not tracing_enabled()
+
+def test_tracer_records_spans_and_dependency_flows():
+    tracer = enable_tracing()
+    try:
+        Job(job_id="a", execution_time=0).execute()
+        Job(job_id="b", execution_time=0, dependencies=["a"]).execute()
+    finally:
+        disable_tracing()
+
+    events = tracer.events()
+    spans = [event for event in events if event["ph"] == "X"]
+    assert [span["args"]["job_id"] for span in spans] == ["a", "b"]
+    flows = {event["ph"]: event for event in events if event.get("cat") == "dependency"}
+    assert flows["s"]["id"] == flows["f"]["id"]
+    assert flows["s"]["ts"] <= flows["f"]["ts"]
+    assert any(event["ph"] == "M" for event in events)
+
+def test_tracer_buffer_is_bounded(tmp_path):
+    tracer = Tracer(buffer_size=2)
+    for i in range(5):
+        with tracer.span("step", "test", {"i": i}):
+            pass
+
+    tracer.write(str(tmp_path / "trace.json"))
+    assert [event["args"]["i"] for event in tracer.events() if event["ph"] == "X"] == [3, 4]
@@ -1,13 +1,24 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import threading
+import time
+
+FORMAT = "%(asctime)s [%(levelname)s] %(threadName)s: %(message)s"
+MUTABLE_ARGS = (set, list, dict)
 
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(threadName)s: %(message)s",
+    format=FORMAT,
     handlers=[
         logging.StreamHandler(),
     ],
 )
 
+_listener = None
+
 def get_logger(name):
     """
     Get a logger instance with a specific name.
@@ -25,3 +36,126 @@ def set_log_level(level):
     """
     logging.getLogger().setLevel(level.upper())
 
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats each record as one JSON object per line.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "thread": record.threadName,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most `burst` records per message template every `interval` seconds.
+
+    Records are grouped by their unformatted message, so this only works for lazily formatted
+    calls such as `logger.warning("Job %s ...", job_id)`. The number of dropped records is
+    appended to the next record that gets through.
+    """
+
+    def __init__(self, burst: int = 10, interval: float = 1.0) -> None:
+        """
+        Initialize the filter.
+
+        Args:
+            - burst: Maximum number of records per template and interval.
+            - interval: Length of the rate-limiting window in seconds.
+        """
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.windows = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self.lock:
+            window = self.windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self.windows[key] = [now, 1, 0]
+            elif window[1] < self.burst:
+                window[1] += 1
+                return True
+            else:
+                window[2] += 1
+                return False
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+            record.args = None
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    A QueueHandler that hands records to the listener thread unformatted,
+    so message formatting happens off the calling thread.
+
+    Arguments that are sets, lists or dicts are copied first: the caller may change them
+    before the listener formats the message.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if isinstance(record.args, tuple) and any(isinstance(arg, MUTABLE_ARGS) for arg in record.args):
+            record.args = tuple(arg.copy() if isinstance(arg, MUTABLE_ARGS) else arg for arg in record.args)
+        return record
+
+
+def configure_logging(mode: str = "sync", fmt: str = "text", rate_limit: int = 0, stream=None) -> None:
+    """
+    Configure the handlers of the root logger.
+
+    Args:
+        - mode: "sync" writes records in the calling thread; "async" hands them to a
+            background thread (QueueHandler/QueueListener) and formats them there.
+        - fmt: "text" for the human-readable format, "json" for JSON lines.
+        - rate_limit: Maximum number of records per message template per second, 0 for no limit.
+        - stream: Stream to write to (default: stderr).
+    """
+    global _listener
+    shutdown_logging()
+
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(FORMAT))
+
+    if mode == "async":
+        records = queue.SimpleQueue()
+        root_handler = DeferredQueueHandler(records)
+        _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        root_handler = handler
+
+    if rate_limit:
+        root_handler.addFilter(RateLimitFilter(burst=rate_limit))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(root_handler)
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the background logging thread, if any, after it wrote every pending record.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,175 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+_tracer = None
+_disabled = nullcontext()
+
+
+class Tracer:
+    """
+    Buffers trace spans in memory and writes them as Chrome trace-event JSON.
+
+    Every thread appends completed spans to its own bounded deque, so recording takes no lock
+    and a long run keeps only the most recent `buffer_size` spans per thread. Events are only
+    converted to JSON by `write`. The file loads in chrome://tracing and in the Perfetto UI.
+    """
+
+    def __init__(self, buffer_size: int = 100_000) -> None:
+        """
+        Initialize the tracer.
+
+        Args:
+            - buffer_size: Maximum number of spans kept per thread; older spans are dropped.
+        """
+        self.buffer_size = buffer_size
+        self.origin = time.perf_counter_ns()
+        self.local = threading.local()
+        self.buffers = []
+        self.lock = threading.Lock()
+
+    def _buffer(self) -> deque:
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is None:
+            thread = threading.current_thread()
+            buffer = self.local.buffer = deque(maxlen=self.buffer_size)
+            with self.lock:
+                self.buffers.append((thread.ident, thread.name, buffer))
+        return buffer
+
+    def span(self, name: str, cat: str, args: dict | None) -> "_Span":
+        """
+        Create a context manager recording a complete ("X") event around its body.
+
+        Args:
+            - name: Name of the span.
+            - cat: Category of the span.
+            - args: Values shown with the span in the viewer.
+
+        Returns:
+            - The context manager.
+        """
+        return _Span(self, name, cat, args)
+
+    def events(self) -> list[dict]:
+        """
+        Convert the buffered spans into trace events.
+        A flow arrow is added from the end of every executed job to the start of each job depending on it.
+
+        Returns:
+            - List of trace-event dictionaries.
+        """
+        pid = os.getpid()
+        events = []
+        executions = {}
+        with self.lock:
+            buffers = list(self.buffers)
+
+        for tid, thread_name, buffer in buffers:
+            events.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+            for name, cat, start, end, args in list(buffer):
+                event = {"ph": "X", "name": name, "cat": cat, "ts": self._micros(start),
+                         "dur": self._micros(end) - self._micros(start), "pid": pid, "tid": tid}
+                if args:
+                    event["args"] = args
+                    if cat == "job" and "job_id" in args:
+                        executions[args["job_id"]] = event
+                events.append(event)
+
+        flow_id = 0
+        for event in list(executions.values()):
+            for dep_id in event["args"].get("dependencies", ()):
+                dep = executions.get(dep_id)
+                if dep is None:
+                    continue
+                flow_id += 1
+                events.append({"ph": "s", "name": "dependency", "cat": "dependency", "id": flow_id, "pid": pid,
+                               "tid": dep["tid"], "ts": dep["ts"] + max(dep["dur"] - 1, 0)})
+                events.append({"ph": "f", "bp": "e", "name": "dependency", "cat": "dependency", "id": flow_id,
+                               "pid": pid, "tid": event["tid"], "ts": event["ts"]})
+        return events
+
+    def write(self, path: str) -> None:
+        """
+        Write the trace to a Chrome trace-event JSON file.
+
+        Args:
+            - path: Destination file.
+        """
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, f, default=str)
+
+    def _micros(self, ns: int) -> int:
+        return (ns - self.origin) // 1000
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, args: dict | None) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.tracer._buffer().append((self.name, self.cat, self.start, time.perf_counter_ns(), self.args))
+
+
+def enable_tracing(buffer_size: int = 100_000) -> Tracer:
+    """
+    Start recording trace spans.
+
+    Args:
+        - buffer_size: Maximum number of spans kept per thread.
+
+    Returns:
+        - The active tracer.
+    """
+    global _tracer
+    _tracer = Tracer(buffer_size)
+    return _tracer
+
+
+def disable_tracing() -> Tracer | None:
+    """
+    Stop recording trace spans.
+
+    Returns:
+        - The tracer that was active, if any, so its spans can still be written.
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def trace_span(name: str, cat: str = "scheduler", args: dict | None = None):
+    """
+    Record a span around a block of code if tracing is enabled; otherwise a shared no-op context.
+
+    Args:
+        - name: Name of the span.
+        - cat: Category of the span. Spans of category "job" with a "job_id" and "dependencies"
+            in `args` are linked by dependency arrows.
+        - args: Values shown with the span in the viewer.
+
+    Returns:
+        - A context manager.
+    """
+    if _tracer is None:
+        return _disabled
+    return _tracer.span(name, cat, args)
+
+
+def tracing_enabled() -> bool:
+    """
+    Check whether trace spans are being recorded, e.g. before building costly span arguments.
+    """
+    return _tracer is not None